@@ -0,0 +1,354 @@
+import io
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import platform
+import argparse
+import datetime
+import tempfile
+import subprocess
+import tracemalloc
+import contextlib
+import numpy as np
+import pandas as pd
+from .synthetic import SyntheticMarket
+from .data import DataLoader
+from .store import PriceStore
+from .jit import HAVE_NUMBA
+from .indicator_cache import default_cache
+from .channels import ChannelIndex
+from .ma.indicators import IndicatorManager as MAIndicators
+from .ma.strategy import MovingAverageStrategy
+from .ma.optimizer import Optimizer as MAOptimizer
+from .turtle_trading.indicators import IndicatorManager as TurtleIndicators
+from .turtle_trading.strategy import TurtleStrategy
+from .turtle_trading.optimizer import Optimizer as TurtleOptimizer
+from .high_low_price.indicators import IndicatorManager as HighLowIndicators
+from .high_low_price.strategy import HighLowStrategy
+from .high_low_price.optimizer import Optimizer as HighLowOptimizer
+from .buy_sell_next_day.indicators import IndicatorManager as BuySellIndicators
+from .buy_sell_next_day.strategy import BuySellNextDayStrategy
+from .buy_sell_next_day.optimizer import Optimizer as BuySellOptimizer
+from .strategy_on_rsi.indicators import IndicatorManager as RSIIndicators
+from .strategy_on_rsi.strategy import RSIStrategy
+from .strategy_on_rsi.optimizer import Optimizer as RSIOptimizer
+
+class Benchmark:
+    """
+    Timing and peak-memory suite on seeded synthetic bars (see SyntheticMarket).
+    Times loading (CSV, column cache, price store and multi-symbol universes), every
+    IndicatorManager method, every strategy's generate_signals and every Optimizer.optimize
+    on a small fixed grid, at several series lengths and symbol counts, and writes the results
+    with the commit and environment to a JSON file so runs can be compared across commits.
+    Run with: python -m back_testing.benchmark [--quick] [--compare OLD NEW]
+    """
+
+    BAR_SIZES = (1_000, 100_000, 1_000_000, 10_000_000)
+    SYMBOL_COUNTS = (1, 10, 100, 1_000)
+    QUICK_BAR_SIZES = (1_000, 100_000)
+    QUICK_SYMBOL_COUNTS = (1, 10)
+    # Bars per symbol in the universe cases (ten years of daily bars)
+    UNIVERSE_BARS = 2_520
+    # Longest series written to CSV and swept by the optimizers (they scale with the grid)
+    MAX_CSV_BARS = 1_000_000
+    MAX_OPTIMIZE_BARS = 1_000_000
+    PACKAGES = ('ma', 'turtle_trading', 'high_low_price', 'buy_sell_next_day', 'strategy_on_rsi')
+    DEFAULT_DIR = os.path.join("data", "benchmarks")
+
+    def __init__(self, bar_sizes=None, symbol_counts=None, seed=0, repeat=1, memory=True):
+        """
+        repeat: timed runs per case (the fastest is kept); memory: add one traced run per case
+        for the peak memory (tracemalloc sees NumPy and pandas allocations).
+        """
+        self.bar_sizes = tuple(self.BAR_SIZES if bar_sizes is None else bar_sizes)
+        self.symbol_counts = tuple(self.SYMBOL_COUNTS if symbol_counts is None else symbol_counts)
+        self.market = SyntheticMarket(seed=seed)
+        self.seed = seed
+        self.repeat = max(1, int(repeat))
+        self.memory = memory
+        self.results = []
+        self._warm = set()
+
+    def run(self):
+        """Runs every case and returns the list of result records."""
+        self.results = []
+        work_dir = tempfile.mkdtemp(prefix='back_testing_bench_')
+        try:
+            for n in self.bar_sizes:
+                df = self.market.bars(n)
+                print(f"\n--- {n} bars ---")
+                self._load_cases(df, n, work_dir)
+                for pkg in self.PACKAGES:
+                    self._package_cases(pkg, df, n)
+                del df
+                gc.collect()
+            for n_symbols in self.symbol_counts:
+                print(f"\n--- {n_symbols} symbols x {self.UNIVERSE_BARS} bars ---")
+                self._universe_cases(n_symbols, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return self.results
+
+    def measure(self, name, func, bars, symbols=1, warmup=None):
+        """
+        Times func() (best of repeat, output silenced) and records its peak memory.
+        warmup: a cheap call run once per case name first, so JIT compilation is not timed.
+        """
+        if warmup is not None and name not in self._warm:
+            self._call(warmup)
+            self._warm.add(name)
+
+        seconds = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            self._call(func)
+            seconds.append(time.perf_counter() - start)
+
+        peak = None
+        if self.memory:
+            tracemalloc.start()
+            try:
+                self._call(func)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        record = {'name': name, 'bars': bars, 'symbols': symbols, 'seconds': min(seconds),
+                  'peak_mb': None if peak is None else peak / 1e6}
+        self.results.append(record)
+        memory = '' if peak is None else f", peak {record['peak_mb']:.1f} MB"
+        print(f"{name} [{bars} bars x {symbols}]: {record['seconds']:.4f}s{memory}")
+        return record
+
+    @staticmethod
+    def _call(func):
+        """Calls func with a cold indicator cache and its progress output silenced."""
+        default_cache.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+
+    def _load_cases(self, df, n, work_dir):
+        """DataLoader from a CSV, from its column cache and from the price store."""
+        csv_path = os.path.join(work_dir, f'bars_{n}.csv')
+        store_root = os.path.join(work_dir, f'store_{n}')
+        PriceStore(store_root).write('SYN', df)
+        defaults = DataLoader.DEFAULT_CSV, DataLoader.STORE_ROOT
+        try:
+            DataLoader.STORE_ROOT = store_root
+            self.measure('load.price_store', lambda: self._load(n), n)
+            if n <= self.MAX_CSV_BARS:
+                SyntheticMarket.to_csv(df, csv_path)
+                DataLoader.DEFAULT_CSV = csv_path
+                DataLoader.STORE_ROOT = os.path.join(work_dir, 'no_store')
+                self.measure('load.csv', lambda: self._load(n, use_cache=False), n)
+                self._call(lambda: self._load(n, use_cache=True))
+                self.measure('load.column_cache', lambda: self._load(n, use_cache=True), n)
+        finally:
+            DataLoader.DEFAULT_CSV, DataLoader.STORE_ROOT = defaults
+
+    @staticmethod
+    def _load(n, **kwargs):
+        """load_local_csv('SYN'), failing rather than timing the empty frame it returns on errors."""
+        df = DataLoader.load_local_csv('SYN', **kwargs)
+        if len(df) != n:
+            raise RuntimeError(f"load_local_csv returned {len(df)} of {n} bars for SYN")
+        return df
+
+    def _package_cases(self, pkg, df, n):
+        """Each IndicatorManager method, generate_signals and (up to MAX_OPTIMIZE_BARS) optimize."""
+        small = df.iloc[:1_000]
+        for method, func, inputs in self.indicator_cases(pkg):
+            data, data_small = (df, small) if inputs is None else (inputs(df), inputs(small))
+            self.measure(f'indicators.{pkg}.{method}', lambda: func(data), n, warmup=lambda: func(data_small))
+            del data
+
+        signals = self.signal_case(pkg)
+        prepared, prepared_small = self.prepare(pkg, df), self.prepare(pkg, small)
+        self.measure(f'signals.{pkg}.generate_signals', lambda: signals(prepared), n,
+                     warmup=lambda: signals(prepared_small))
+        del prepared
+
+        if n <= self.MAX_OPTIMIZE_BARS:
+            optimize = self.optimize_case(pkg)
+            self.measure(f'optimize.{pkg}', lambda: optimize(df), n, warmup=lambda: optimize(small))
+
+    def _universe_cases(self, n_symbols, work_dir):
+        """load_universe and every strategy's generate_signals over n_symbols symbols."""
+        frames = self.market.universe(n_symbols, self.UNIVERSE_BARS)
+        store_root = os.path.join(work_dir, f'universe_{n_symbols}')
+        PriceStore(store_root).write_many(frames)
+        default_root = DataLoader.STORE_ROOT
+        try:
+            DataLoader.STORE_ROOT = store_root
+            self.measure('universe.load', lambda: DataLoader.load_universe(), self.UNIVERSE_BARS, n_symbols)
+        finally:
+            DataLoader.STORE_ROOT = default_root
+
+        for pkg in self.PACKAGES:
+            signals = self.signal_case(pkg)
+            prepared = [self.prepare(pkg, df) for df in frames.values()]
+            self.measure(f'universe.{pkg}.generate_signals', lambda: [signals(df) for df in prepared],
+                         self.UNIVERSE_BARS, n_symbols, warmup=lambda: signals(prepared[0]))
+
+    @staticmethod
+    def indicator_cases(pkg):
+        """
+        [(method name, func(df), inputs)] for the IndicatorManager of a package; inputs (untimed,
+        None for the raw bars) builds the columns a method reads from other indicators.
+        """
+        if pkg == 'ma':
+            windows = range(5, 205, 5)
+            return [('calculate_sma', lambda df: MAIndicators.calculate_sma(df, 20), None),
+                    ('apply_mas', lambda df: MAIndicators.apply_mas(df, 20, 40, 80), None),
+                    ('calculate_sma_bank', lambda df: MAIndicators.calculate_sma_bank(df, windows), None)]
+        if pkg == 'turtle_trading':
+            manager = TurtleIndicators()
+            return [('calculate_atr', lambda df: manager.calculate_atr(df), None),
+                    ('calculate_atr_bank', lambda df: manager.calculate_atr_bank(df, (10, 20, 30)), None),
+                    ('calculate_channels', lambda df: manager.calculate_channels(df, 20, 20), None),
+                    ('ChannelIndex', lambda df: ChannelIndex(df, max_window=60), None)]
+        if pkg == 'high_low_price':
+            manager = HighLowIndicators()
+            return [('calculate_channels', lambda df: manager.calculate_channels(df, 20, 20), None),
+                    ('ChannelIndex', lambda df: ChannelIndex(df, max_window=60), None)]
+        if pkg == 'buy_sell_next_day':
+            manager = BuySellIndicators()
+            return [('calculate_returns', lambda df: manager.calculate_returns(df), None),
+                    ('calculate_down_days', lambda df: manager.calculate_down_days(df), manager.calculate_returns)]
+        manager = RSIIndicators()
+        return [('calculate_rsi', lambda df: manager.calculate_rsi(df, 14), None),
+                ('calculate_rsi_bank', lambda df: manager.calculate_rsi_bank(df, (7, 14, 21)), None)]
+
+    @staticmethod
+    def prepare(pkg, df):
+        """The indicator frame each strategy's generate_signals expects (as in the mains)."""
+        if pkg == 'ma':
+            return MAIndicators.apply_mas(DataLoader.generate_returns(df), 20, 40, 80)
+        if pkg == 'turtle_trading':
+            manager = TurtleIndicators()
+            data = manager.calculate_channels(manager.calculate_atr(df), 20, 20)
+            return data.dropna(subset=['ATR', 'ndays_high', 'ndays_low'])
+        if pkg == 'high_low_price':
+            return HighLowIndicators().calculate_channels(df, 20, 20)
+        if pkg == 'buy_sell_next_day':
+            manager = BuySellIndicators()
+            return manager.calculate_down_days(manager.calculate_returns(df))
+        return RSIIndicators().calculate_rsi(df, 14)
+
+    @staticmethod
+    def signal_case(pkg):
+        """func(prepared frame) running the package's generate_signals with the mains' defaults."""
+        if pkg == 'ma':
+            return MovingAverageStrategy().generate_signals
+        if pkg == 'turtle_trading':
+            return TurtleStrategy().generate_signals
+        if pkg == 'high_low_price':
+            return HighLowStrategy().generate_signals
+        if pkg == 'buy_sell_next_day':
+            return BuySellNextDayStrategy().generate_signals
+        return RSIStrategy().generate_signals
+
+    @staticmethod
+    def optimize_case(pkg):
+        """func(df) running the package's Optimizer.optimize on a small fixed grid in this process."""
+        if pkg == 'ma':
+            return lambda df: MAOptimizer(df).optimize(range(10, 40, 10), range(40, 100, 20), range(100, 190, 30))
+        if pkg == 'turtle_trading':
+            return lambda df: TurtleOptimizer(df).optimize((10, 20, 30), (1, 2), (2, 3))
+        if pkg == 'high_low_price':
+            return lambda df: HighLowOptimizer(df).optimize((10, 20, 30), (10, 20, 30))
+        if pkg == 'buy_sell_next_day':
+            return lambda df: BuySellOptimizer(df).optimize((2, 3, 4, 5))
+        return lambda df: RSIOptimizer(df).optimize((25, 30, 35), (0.03, 0.05), (0.02, 0.03))
+
+    def report(self):
+        """The results with the commit and environment they were measured in."""
+        return {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': self.commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'numba': HAVE_NUMBA,
+            'seed': self.seed,
+            'repeat': self.repeat,
+            'results': self.results,
+        }
+
+    def save(self, path=None):
+        """Writes report() as JSON (default: data/benchmarks/<time>-<commit>.json) and returns the path."""
+        report = self.report()
+        if path is None:
+            stamp = report['created'].replace(':', '').replace('-', '')
+            path = os.path.join(self.DEFAULT_DIR, f"{stamp}-{report['commit'] or 'nogit'}.json")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=1)
+        print(f"\nBenchmark results written to: {path}")
+        return path
+
+    @staticmethod
+    def commit():
+        """Short hash of the checked-out commit ('+' when the tree has changes), or None outside git."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True,
+                                    text=True, check=True).stdout.strip()
+            dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                                   capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return commit + ('+' if dirty else '')
+
+    @staticmethod
+    def compare(old_path, new_path):
+        """Prints the time and peak memory of the cases two result files share, with new/old ratios."""
+        with open(old_path) as f:
+            old = json.load(f)
+        with open(new_path) as f:
+            new = json.load(f)
+        old_results = {(r['name'], r['bars'], r['symbols']): r for r in old['results']}
+        print(f"Comparing {old['commit']} ({old_path}) with {new['commit']} ({new_path})")
+        rows = []
+        for r in new['results']:
+            base = old_results.get((r['name'], r['bars'], r['symbols']))
+            if base is None:
+                continue
+            ratio = r['seconds'] / base['seconds'] if base['seconds'] else float('nan')
+            mem_ratio = r['peak_mb'] / base['peak_mb'] if r['peak_mb'] and base['peak_mb'] else float('nan')
+            rows.append((r['name'], r['bars'], r['symbols'], base['seconds'], r['seconds'], ratio, mem_ratio))
+            print(f"{r['name']} [{r['bars']} bars x {r['symbols']}]: {base['seconds']:.4f}s -> "
+                  f"{r['seconds']:.4f}s (x{ratio:.2f} time, x{mem_ratio:.2f} memory)")
+        return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the back_testing package on synthetic data.")
+    parser.add_argument('--quick', action='store_true', help="small sizes only (1k and 100k bars, 1 and 10 symbols)")
+    parser.add_argument('--bars', type=int, nargs='+', help="series lengths to run")
+    parser.add_argument('--symbols', type=int, nargs='+', help="universe sizes to run")
+    parser.add_argument('--repeat', type=int, default=1, help="timed runs per case (best is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak-memory runs")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="result file (default: data/benchmarks/<time>-<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        Benchmark.compare(*args.compare)
+        return 0
+
+    bar_sizes = args.bars or (Benchmark.QUICK_BAR_SIZES if args.quick else None)
+    symbol_counts = args.symbols or (Benchmark.QUICK_SYMBOL_COUNTS if args.quick else None)
+    bench = Benchmark(bar_sizes, symbol_counts, seed=args.seed, repeat=args.repeat, memory=not args.no_memory)
+    bench.run()
+    bench.save(args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import quantstats as qs
+from ..downsample import Downsample
 
 class Backtester:
     """Backtesting engine for the Buy/Sell Next Day strategy."""
@@ -17,13 +16,21 @@ class Backtester:
         
         return bnh, s_returns
 
-    def plot_results(self, data, symbol):
-        """Plots the cumulative returns comparison."""
+    def plot_results(self, data, symbol, downsample=True):
+        """
+        Plots the cumulative returns comparison.
+        downsample: draw about as many points as the figure has pixels.
+        """
+        import matplotlib.pyplot as plt
         # For plotting, convert log returns to cumulative growth
         bnh_cum = data['cc_returns'].cumsum()
         s_cum = data['strategy_returns'].cumsum()
         
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
+        if downsample:
+            width = Downsample.pixels(fig)
+            bnh_cum = Downsample.curve(bnh_cum, width)
+            s_cum = Downsample.curve(s_cum, width)
         plt.plot(bnh_cum, label='Buy and hold returns')
         plt.plot(s_cum, label='Strategy Returns')
         plt.ylabel('Cumulative Log Returns')
@@ -34,6 +41,7 @@ class Backtester:
 
     def generate_report(self, returns, benchmark=None):
         """Generates a performance report using quantstats."""
+        import quantstats as qs
         # quantstats expects simple returns for many metrics, 
         # but can work with log returns if they are daily.
         # We'll pass the strategy returns series.
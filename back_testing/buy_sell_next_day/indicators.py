@@ -1,5 +1,7 @@
 import pandas as pd
 import numpy as np
+from ..compact import CompactMode
+from ..indicator_cache import default_cache
 
 class IndicatorManager:
     """Calculates indicators for the Buy and Sell Next Day strategy."""
@@ -18,7 +20,7 @@ class IndicatorManager:
         if open_col not in data.columns or close_col not in data.columns:
              raise KeyError(f"Required columns not found. Available: {list(data.columns)}")
         
-        # Create log returns as per the procedural code
+        # Create log returns as per the procedural code (cheaper than a cache lookup)
         data['oo_returns'] = np.log(data[open_col] / data[open_col].shift(1))
         data['cc_returns'] = np.log(data[close_col] / data[close_col].shift(1))
         data['oc_returns'] = np.log(data[close_col] / data[open_col])
@@ -28,12 +30,16 @@ class IndicatorManager:
     def calculate_down_days(self, df):
         """Identifies consecutive down days based on Close-Close returns."""
         data = df.copy()
-        # Mark days with negative close-to-close returns
-        data['is_down'] = np.where(data['cc_returns'] < 0, 1, 0)
+        def compute():
+            # Mark days with negative close-to-close returns
+            is_down = CompactMode.as_state(data, pd.Series(np.where(data['cc_returns'] < 0, 1, 0), index=data.index))
+            
+            # Consecutive count: reset when 'is_down' is 0
+            # A simple way to compute consecutive count:
+            group = (is_down == 0).cumsum()
+            return is_down, is_down.groupby(group).cumsum()
         
-        # Consecutive count: reset when 'is_down' is 0
-        # A simple way to compute consecutive count:
-        group = (data['is_down'] == 0).cumsum()
-        data['consecutive_down'] = data.groupby(group)['is_down'].cumsum()
+        data['is_down'], data['consecutive_down'] = default_cache.compute(
+            'down_days', (), [df['cc_returns']], compute)
         
         return data
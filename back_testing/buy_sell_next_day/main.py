@@ -1,14 +1,15 @@
 from back_testing.data import DataLoader
-import back_testing.data
-import importlib
-importlib.reload(back_testing.data)
 from back_testing.buy_sell_next_day.indicators import IndicatorManager
 from back_testing.buy_sell_next_day.strategy import BuySellNextDayStrategy
 from back_testing.buy_sell_next_day.backtester import Backtester
 import numpy as np
 
-def run_backtest(symbol='TSLA', start_date='2010-01-01', end_date='2020-03-31', down_days=3, exit_type='next_day_open'):
-    """Orchestrates the backtesting workflow for Buy and Sell Next Day."""
+def run_backtest(symbol='TSLA', start_date='2010-01-01', end_date='2020-03-31', down_days=3, exit_type='next_day_open',
+                 headless=False):
+    """
+    Orchestrates the backtesting workflow for Buy and Sell Next Day.
+    headless: skip the quantstats report and the chart (for batch jobs and workers).
+    """
     
     # Initialize components
     loader = DataLoader()
@@ -44,13 +45,16 @@ def run_backtest(symbol='TSLA', start_date='2010-01-01', end_date='2020-03-31',
     print(f'Total Buy and Hold (Log) returns: {np.round(bnh, 2)}')
     print(f'Total Strategy (Log) returns: {np.round(s_returns, 2)}')
     
-    # Step 6: Generate Full Report using quantstats
-    # Strategy returns needs to be passed to quantstats
-    backtester.generate_report(data['strategy_returns'], benchmark=data['cc_returns'])
+    if not headless:
+        # Step 6: Generate Full Report using quantstats
+        # Strategy returns needs to be passed to quantstats
+        backtester.generate_report(data['strategy_returns'], benchmark=data['cc_returns'])
 
-    # Step 7: Plot results
-    print(f"Displaying chart for {symbol}...")
-    backtester.plot_results(data, symbol)
+        # Step 7: Plot results
+        print(f"Displaying chart for {symbol}...")
+        backtester.plot_results(data, symbol)
+    
+    return data
 
 if __name__ == "__main__":
     # Example execution with the parameters from the user's procedural code
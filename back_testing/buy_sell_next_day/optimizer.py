@@ -3,6 +3,21 @@ from .indicators import IndicatorManager
 from .strategy import BuySellNextDayStrategy
 from .backtester import Backtester
 import numpy as np
+from ..indicator_cache import default_cache
+from ..sweep import SweepRunner
+from ..walk_forward import WalkForward
+from ..metrics import Metrics
+
+def _evaluate_chunk(data, combos):
+    """Sweep task: evaluates one chunk of the grid (runs in a worker process)."""
+    return Optimizer(data).evaluate(combos)
+
+def _growth_chunk(data, combos, edges=None):
+    """Walk-forward task: per-bar log growth (or its sums between edges) for one chunk."""
+    keys, growth = Optimizer(data).bar_growth(combos)
+    if edges is not None:
+        growth = WalkForward.window_sums(growth, edges)
+    return list(zip(keys, growth))
 
 class Optimizer:
     """Optimizes parameters for the Buy and Sell Next Day strategy."""
@@ -11,35 +26,73 @@ class Optimizer:
         self.data = data
         self.indicator_manager = IndicatorManager()
         self.strategy = BuySellNextDayStrategy()
+        self.hits = 0
+        self.evaluated = 0
+        self.resumed = 0
         self.backtester = Backtester()
 
-    def optimize(self, down_days_range, exit_types=['next_day_open', 'same_day_close']):
-        """Finds the best parameters (consecutive down days and exit type)."""
-        results = {}
+    def optimize(self, down_days_range, exit_types=['next_day_open', 'same_day_close'], workers=1, chunk_size=None,
+                 search=None, store=None, checkpoint=None, metric=None):
+        """
+        Finds the best parameters (consecutive down days and exit type).
+        workers, chunk_size, search, store, checkpoint: see SweepRunner.optimize.
+        metric: rank on one of Metrics.NAMES instead of the total log return.
+        """
+        combos = [(down_days, exit_type) for down_days in down_days_range for exit_type in exit_types]
+        
+        runner = SweepRunner(workers, chunk_size)
+        scope = store.scope('buy_sell_next_day', __file__, self.data) if store is not None else None
+        results = runner.optimize(_evaluate_chunk, self.data, combos, search, scope, checkpoint, metric)
+        self.hits, self.evaluated, self.resumed = runner.hits, runner.evaluated, runner.resumed
+        print(f"Indicator cache: {default_cache.stats()}")
+        
+        # Result Summary
+        max_ret, opt_values = runner.best(results, metric, label='Log Return')
+        return (max_ret, opt_values) if opt_values else (None, None)
+
+    def walk_forward(self, down_days_range, walk_forward, exit_types=['next_day_open', 'same_day_close'],
+                     workers=1, chunk_size=None):
+        """
+        Walk-forward optimization over the same grid as optimize (see WalkForward).
+        Returns the per-fold table and the stitched out-of-sample equity.
+        """
+        combos = [(down_days, exit_type) for down_days in down_days_range for exit_type in exit_types]
+        return walk_forward.run(_growth_chunk, self.data, combos, SweepRunner(workers, chunk_size))
+
+    def evaluate(self, combos):
+        """
+        Returns [(key, total log return, metrics)] for a list of (down_days, exit_type) pairs.
+        metrics holds Metrics.NAMES computed on the log returns, plus both total log returns.
+        """
+        periods_per_year = Metrics.periods_per_year(self.data.index)
+        results = []
+        for key, df in self._runs(combos):
+            bnh, s_returns = self.backtester.calculate_metrics(df)
+            metrics = Metrics.compute(df['strategy_returns'], 'log', periods_per_year)
+            metrics.update({'strategy_returns': s_returns, 'bnh': bnh})
+            results.append((key, s_returns, metrics))
+        return results
+
+    def bar_growth(self, combos):
+        """Keys and (combos x bars) log growth (the strategy's log returns)."""
+        growth = np.zeros((len(combos), len(self.data)))
+        keys = []
+        for k, (key, df) in enumerate(self._runs(combos)):
+            keys.append(key)
+            growth[k] = WalkForward.aligned(self.data.index, df['strategy_returns'])
+        return keys, growth
+
+    def _runs(self, combos):
+        """Yields (key, strategy frame) for each (down_days, exit_type) pair."""
+        if not combos:
+            return
         
         # Pre-calculate returns and down day data once
         df_base = self.indicator_manager.calculate_returns(self.data)
         df_base = self.indicator_manager.calculate_down_days(df_base)
         
-        # Optimize over ranges
-        for down_days in down_days_range:
-            for exit_type in exit_types:
-                key = f'down_days{down_days}_exit_{exit_type}'
-                
-                df = self.strategy.generate_signals(df_base, down_days=down_days)
-                df = self.strategy.calculate_strategy_returns(df, exit_type=exit_type)
-                
-                bnh, s_returns = self.backtester.calculate_metrics(df)
-                
-                results[key] = s_returns
-                print(f"Checking: {key} -> Total Log Return: {np.round(s_returns, 4)}")
-        
-        # Result Summary
-        if results:
-            max_ret = max(results.values())
-            opt_values = [key for key, value in results.items() if value == max_ret]
-            print(f"Optimization Finished.")
-            print(f"The max strategy returns (log) are {np.round(max_ret, 4)} for parameters {opt_values}.")
-            return max_ret, opt_values
-        else:
-            return None, None
+        for down_days, exit_type in combos:
+            key = f'down_days{down_days}_exit_{exit_type}'
+            
+            df = self.strategy.generate_signals(df_base, down_days=down_days)
+            yield key, self.strategy.calculate_strategy_returns(df, exit_type=exit_type)
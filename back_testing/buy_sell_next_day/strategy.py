@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from ..compact import CompactMode
 
 class BuySellNextDayStrategy:
     """Strategy: Buy if stock closes down consecutively for N days."""
@@ -10,10 +11,10 @@ class BuySellNextDayStrategy:
         
         # Signal is 1 if we had at least 'down_days' consecutive down closes
         # This signal is 'known' at the end of the day.
-        df['raw_signal'] = np.where(df['consecutive_down'] >= down_days, 1, 0)
+        df['raw_signal'] = CompactMode.as_state(df, pd.Series(np.where(df['consecutive_down'] >= down_days, 1, 0), index=df.index))
         
         # Shift by 1: we buy at the OPEN of the NEXT day
-        df['signal'] = df['raw_signal'].shift(1)
+        df['signal'] = CompactMode.as_float(df, df['raw_signal'].shift(1))
         
         return df
 
@@ -34,5 +35,6 @@ class BuySellNextDayStrategy:
             df['strategy_returns'] = df['signal'] * df['oc_returns']
         else:
             raise ValueError("exit_type must be 'next_day_open' or 'same_day_close'")
-            
+        
+        df['strategy_returns'] = CompactMode.as_float(df, df['strategy_returns'])
         return df
@@ -0,0 +1,85 @@
+import numpy as np
+
+class RangeExtremaIndex:
+    """
+    Sparse table over one series that answers the rolling max (or min) for any window
+    in O(1) per bar. Level k holds the extreme of every block of 2**k values; a window of
+    length N is covered by two overlapping blocks of the largest 2**k <= N.
+    Memory is n * (floor(log2(max_window)) + 1) float64 values, so max_window bounds it.
+    """
+
+    def __init__(self, values, kind='max', max_window=None):
+        if kind not in ('max', 'min'):
+            raise ValueError("kind must be 'max' or 'min'")
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        self.n = len(values)
+        self.kind = kind
+        self._op = np.maximum if kind == 'max' else np.minimum
+        self.max_window = max(1, self.n if max_window is None else int(max_window))
+
+        # np.maximum/np.minimum propagate NaN, matching rolling(N).max() with min_periods=N
+        self.levels = [values]
+        size = 1
+        while size * 2 <= min(self.max_window, self.n):
+            prev = self.levels[-1]
+            self.levels.append(self._op(prev[:-size], prev[size:]))
+            size *= 2
+
+    @property
+    def nbytes(self):
+        """Bytes held by the table."""
+        return sum(level.nbytes for level in self.levels)
+
+    def rolling(self, window):
+        """Extreme over the last 'window' values at each bar (NaN for the first window-1 bars)."""
+        window = int(window)
+        if window < 1:
+            raise ValueError(f"Window must be positive, got {window}")
+        if window > self.max_window:
+            raise ValueError(f"Window {window} exceeds the index's max_window {self.max_window}")
+        out = np.full(self.n, np.nan)
+        if window > self.n:
+            return out
+        k = window.bit_length() - 1
+        block = 1 << k
+        level = self.levels[k]
+        # Block starting at i-window+1 and block ending at i
+        out[window - 1:] = self._op(level[:self.n - window + 1], level[window - block:self.n - block + 1])
+        return out
+
+    def lagged(self, window):
+        """Extreme over the 'window' bars before each bar (rolling(window) shifted by 1)."""
+        out = np.full(self.n, np.nan)
+        out[1:] = self.rolling(window)[:-1]
+        return out
+
+class ChannelIndex:
+    """
+    Range-max over High and range-min over Low, built once and shared by every channel length,
+    so channels for any N up to max_window cost O(1) per bar. Memory grows with
+    log2(max_window) (see nbytes).
+    """
+
+    def __init__(self, df, max_window=None):
+        high_col = 'High' if 'High' in df.columns else 'high'
+        low_col = 'Low' if 'Low' in df.columns else 'low'
+        if high_col not in df.columns or low_col not in df.columns:
+            raise KeyError(f"Required High/Low columns not found. Available: {list(df.columns)}")
+        self.index = df.index
+        self.high = RangeExtremaIndex(df[high_col].to_numpy(), kind='max', max_window=max_window)
+        self.low = RangeExtremaIndex(df[low_col].to_numpy(), kind='min', max_window=max_window)
+
+    @property
+    def nbytes(self):
+        """Bytes held by both tables."""
+        return self.high.nbytes + self.low.nbytes
+
+    def serves(self, df, ndays_high, ndays_low):
+        """True if the index was built over the same rows as df and covers both windows."""
+        if max(ndays_high, ndays_low) > self.high.max_window:
+            return False
+        return len(df) == len(self.index) and df.index.equals(self.index)
+
+    def channels(self, ndays_high, ndays_low):
+        """Lagged N-day high and low arrays, as used by the channel indicators."""
+        return self.high.lagged(ndays_high), self.low.lagged(ndays_low)
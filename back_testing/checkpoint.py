@@ -0,0 +1,77 @@
+import os
+import time
+import pickle
+
+class Checkpoint:
+    """
+    Append-only file of a sweep's finished results, so an interrupted sweep (crash,
+    Ctrl-C, a worker killed for memory) resumes where it stopped instead of starting over.
+    The first record identifies the sweep (evaluator, code, data, grid and arguments); each
+    later record holds the results finished since the previous write, in grid order.
+    Writes happen at most every 'interval' seconds (and when the sweep stops), append only
+    the new results and are fsynced; a record torn by a crash mid-write is dropped on load,
+    so earlier records are never lost.
+    """
+
+    def __init__(self, path, interval=30.0):
+        self.path = path
+        self.interval = interval
+        self._pending = []
+        self._last = time.monotonic()
+
+    def open(self, identity):
+        """Returns the results saved for this sweep (a prefix of its grid) and prepares to append."""
+        items, header, good = [], None, 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                try:
+                    header = pickle.load(f)
+                    good = f.tell()
+                    while True:
+                        items.extend(pickle.load(f))
+                        good = f.tell()
+                except Exception:
+                    # End of file, or a record torn by a crash mid-write
+                    pass
+
+        if header == identity:
+            with open(self.path, 'r+b') as f:
+                f.truncate(good)
+        else:
+            if header is not None:
+                print(f"Checkpoint {self.path} belongs to a different sweep, starting a new one")
+            items = []
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump(identity, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+        self._pending = []
+        self._last = time.monotonic()
+        return items
+
+    def add(self, items):
+        """Queues finished results and writes them once 'interval' seconds have passed."""
+        self._pending.extend(items)
+        if time.monotonic() - self._last >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Appends the queued results as one record."""
+        if self._pending:
+            with open(self.path, 'ab') as f:
+                pickle.dump(self._pending, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending = []
+        self._last = time.monotonic()
+
+    def remove(self):
+        """Deletes the checkpoint once the sweep has finished."""
+        self._pending = []
+        if os.path.exists(self.path):
+            os.remove(self.path)
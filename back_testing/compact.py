@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+class CompactMode:
+    """
+    Opt-in low-memory dtypes for OHLCV frames and everything derived from them.
+
+    A frame is compact when its close column is float32. In that mode:
+    - prices, indicators and returns are float32 (half of float64),
+    - integer columns such as Volume use the smallest integer type that fits,
+    - position/state columns are int8 and text signal columns are categoricals.
+    The DatetimeIndex is kept: it already is a plain int64 epoch array underneath and
+    the strategies, plots and reports rely on it.
+
+    Tolerance: float32 keeps ~7 significant digits, so prices and indicators carry a
+    relative error of about 1e-7. Signals only differ from float64 runs on bars where
+    the price and an indicator (or a TP/SL level) agree to that precision, and compounded
+    strategy returns typically stay within 1e-4 relative of the float64 result.
+    """
+
+    FLOAT_DTYPE = np.float32
+    STATE_DTYPE = np.int8
+
+    @staticmethod
+    def apply(df):
+        """Returns a copy of df with compact dtypes."""
+        data = df.copy()
+        for col in data.columns:
+            values = data[col]
+            if pd.api.types.is_float_dtype(values):
+                data[col] = values.astype(CompactMode.FLOAT_DTYPE)
+            elif pd.api.types.is_bool_dtype(values):
+                continue
+            elif pd.api.types.is_integer_dtype(values):
+                kind = 'unsigned' if len(values) and values.min() >= 0 else 'integer'
+                data[col] = pd.to_numeric(values, downcast=kind)
+            elif values.dtype == object:
+                data[col] = values.astype('category')
+        return data
+
+    @staticmethod
+    def is_active(df):
+        """True if df was loaded (or derived) in compact mode."""
+        close_col = 'Close' if 'Close' in df.columns else 'close'
+        return close_col in df.columns and df[close_col].dtype == CompactMode.FLOAT_DTYPE
+
+    @staticmethod
+    def float_dtype(df):
+        """The dtype new float columns derived from df should use."""
+        return CompactMode.FLOAT_DTYPE if CompactMode.is_active(df) else np.float64
+
+    @staticmethod
+    def as_float(df, values):
+        """Casts a derived series to the frame's float dtype (no-op in the default mode)."""
+        dtype = CompactMode.float_dtype(df)
+        return values if values.dtype == dtype else values.astype(dtype)
+
+    @staticmethod
+    def as_state(df, values):
+        """Casts a position/state series to int8 in compact mode; unchanged otherwise."""
+        if CompactMode.is_active(df):
+            return values.astype(CompactMode.STATE_DTYPE)
+        return values
+
+    @staticmethod
+    def as_label(df, values):
+        """Stores a text signal series as a categorical in compact mode; unchanged otherwise."""
+        if CompactMode.is_active(df):
+            return values.astype('category')
+        return values
@@ -1,75 +1,232 @@
 import pandas as pd
 import numpy as np
 import os
+from .store import ColumnStore, PriceStore
+from .compact import CompactMode
+from .shared_data import DataPlane
 
 class DataLoader:
     """Handles downloading and initial processing of stock data."""
     
+    DEFAULT_CSV = os.path.join("data", "historical_data13081.csv")
+    STORE_ROOT = os.path.join("data", "store")
+    
     @staticmethod
-    def load_local_csv(ticker='MSFT', start=None, end=None):
-        """Reads data from a local CSV file instead of downloading."""
+    def load_local_csv(ticker='MSFT', start=None, end=None, use_cache=True, compact=False):
+        """
+        Reads data from a local CSV file instead of downloading.
+        If the ticker has been ingested into the price store (see ingest_csv) only that
+        symbol's partition is read; otherwise the default CSV is used.
+        use_cache: Keep a cleaned binary copy of the CSV in a '<name>.cache' folder next to it
+        and reuse it until the CSV's mtime or size changes.
+        compact: Return float32 prices and the smallest integer volume type (see CompactMode).
+        """
         print(f"\n--- Data Loading for: {ticker} ---")
         print(f"Requested Range: {start} to {end}")
         
-        file_path = os.path.join("data", "historical_data13081.csv")
+        file_path = DataLoader.DEFAULT_CSV
         try:
-            # Read CSV - we'll handle the index and date parsing explicitly for robustness
-            df = pd.read_csv(file_path)
-            
-            # Find the date column (usually 'timestamp' or column index 1)
-            # In your CSV, column 0 is an empty index, column 1 is 'timestamp'
-            if 'timestamp' in df.columns:
-                date_col = 'timestamp'
-            elif 'date' in df.columns:
-                date_col = 'date'
+            source = DataLoader._select_source(ticker, file_path, use_cache)
+            if source is not None:
+                # Log available range before filtering
+                first, last = source.time_range()
+                print(f"File availability: {first.date()} to {last.date()}")
+                
+                # Read only the requested window (binary search on the stored index)
+                df = source.read(start=start or None, end=end or None)
             else:
-                # Fallback to the second column
-                date_col = df.columns[1]
-            
-            print(f"Setting index to: {date_col}")
-            df[date_col] = pd.to_datetime(df[date_col])
-            df.set_index(date_col, inplace=True)
-            
-            # Remove redundant numeric index column if it exists as a column (e.g. 'Unnamed: 0')
-            for col in ['Unnamed: 0', 'unnamed: 0']:
-                if col in df.columns:
-                    df.drop(columns=[col], inplace=True)
-            
-            # FORCE CHRONOLOGICAL ORDER (Earliest to Latest)
-            df.sort_index(ascending=True, inplace=True)
-            
-            # Clean column names (strip spaces and lowercase for matching)
-            df.columns = [c.strip().lower() for c in df.columns]
-            
-            print(f"Columns after cleaning: {list(df.columns)}")
-            
-            # Standardize OHLC column names
-            rename_dict = {
-                'open': 'Open',
-                'high': 'High',
-                'low': 'Low',
-                'close': 'Close',
-                'volume': 'Volume'
-            }
-            df.rename(columns=rename_dict, inplace=True)
-            print(f"Columns after rename: {list(df.columns)}")
-            
-            # Log available range before filtering
-            print(f"File availability: {df.index.min().date()} to {df.index.max().date()}")
-            
-            # Filter by date range
-            if start:
-                df = df[df.index >= pd.to_datetime(start)]
-            if end:
-                df = df[df.index <= pd.to_datetime(end)]
+                df = DataLoader._parse_and_cache(file_path, use_cache)
+                print(f"File availability: {df.index.min().date()} to {df.index.max().date()}")
+                df = DataLoader.slice_range(df, start, end)
 
             print(f"Final loaded range: {df.index.min().date()} to {df.index.max().date()}")
             print(f"Total rows loaded: {len(df)}")
+            if compact:
+                df = CompactMode.apply(df)
             return df
         except Exception as e:
             print(f"Error loading data from CSV: {e}")
             return pd.DataFrame()
 
+    @staticmethod
+    def load_universe(symbols=None, start=None, end=None, compact=False):
+        """
+        Loads many symbols from the price store in one go as a {symbol: DataFrame} dict.
+        The manifest is read once and every partition is memory-mapped, so no CSV is parsed.
+        """
+        store = PriceStore(DataLoader.STORE_ROOT)
+        frames = store.load_many(symbols, start=start, end=end, mmap=True)
+        if compact:
+            frames = {s: CompactMode.apply(df) for s, df in frames.items()}
+        print(f"Loaded {len(frames)} symbols from price store: {store.root}")
+        return frames
+
+    @staticmethod
+    def publish_universe(symbols=None, start=None, end=None, compact=False, backend='shm', directory=None):
+        """
+        Loads symbols like load_universe and publishes them to a shared DataPlane.
+        Pass plane.handle to worker processes and read with DataPlane.attach(handle).frame(symbol)
+        instead of sending each worker a pickled DataFrame. Close the plane (or use it in a
+        'with' block) when the run ends to free the segment.
+        """
+        frames = DataLoader.load_universe(symbols, start=start, end=end, compact=compact)
+        plane = DataPlane.publish(frames, backend=backend, directory=directory)
+        print(f"Published {len(plane)} symbols ({plane.nbytes / 1e6:.1f} MB) to shared {backend} segment: {plane.handle['name']}")
+        return plane
+
+    @staticmethod
+    def ingest_csv(file_path, symbol=None, symbol_col='symbol'):
+        """
+        Parses a CSV once and writes it to the price store.
+        Either pass the symbol for a single-instrument file, or let the rows be split
+        by the symbol column of a long-format file holding many instruments.
+        """
+        df = DataLoader._read_csv(file_path)
+        store = PriceStore(DataLoader.STORE_ROOT)
+        
+        if symbol is not None:
+            frames = {symbol: df}
+        elif symbol_col in df.columns:
+            frames = {str(s): part.drop(columns=[symbol_col]) for s, part in df.groupby(symbol_col, sort=False)}
+        else:
+            raise ValueError(f"Pass a symbol or provide a '{symbol_col}' column. Available: {list(df.columns)}")
+        
+        store.write_many(frames)
+        print(f"Ingested {len(frames)} symbols into price store: {store.root}")
+        return sorted(frames)
+
+    @staticmethod
+    def slice_range(df, start=None, end=None):
+        """
+        Returns the rows with start <= index <= end of a chronologically sorted frame.
+        Bounds are found by binary search and the result is a positional slice, not a masked copy.
+        """
+        lo = df.index.searchsorted(pd.to_datetime(start), side='left') if start else 0
+        hi = df.index.searchsorted(pd.to_datetime(end), side='right') if end else len(df)
+        return df.iloc[lo:max(lo, hi)]
+
+    @staticmethod
+    def _select_source(ticker, file_path, use_cache=True):
+        """Returns the ColumnStore to read from, or None when the CSV has to be parsed."""
+        store = PriceStore(DataLoader.STORE_ROOT)
+        if ticker in store:
+            print(f"Loading {ticker} from price store: {store.root}")
+            return store.symbol_store(ticker)
+        
+        print(f"Warning: {ticker} not in price store, falling back to {file_path}")
+        cache = ColumnStore(os.path.splitext(file_path)[0] + '.cache')
+        if use_cache and cache.is_fresh(file_path):
+            print(f"Loading cached columns from: {cache.path}")
+            return cache
+        return None
+
+    @staticmethod
+    def _parse_and_cache(file_path, use_cache=True):
+        """Parses the CSV and, if enabled, writes the cleaned frame to the column cache."""
+        df = DataLoader._read_csv(file_path)
+        if use_cache:
+            store = ColumnStore(os.path.splitext(file_path)[0] + '.cache')
+            try:
+                store.write(df, source_path=file_path)
+                print(f"Cached cleaned columns to: {store.path}")
+            except OSError as e:
+                print(f"Warning: could not write column cache: {e}")
+        return df
+
+    @staticmethod
+    def _read_csv(file_path):
+        """Parses the CSV and applies the index, ordering and column name cleaning."""
+        # Read CSV - we'll handle the index and date parsing explicitly for robustness
+        df = pd.read_csv(file_path)
+        return DataLoader._clean_frame(df)
+
+    @staticmethod
+    def _clean_frame(df, verbose=True):
+        """Sets the datetime index, sorts chronologically and standardizes the column names."""
+        # Find the date column (usually 'timestamp' or column index 1)
+        # In your CSV, column 0 is an empty index, column 1 is 'timestamp'
+        if 'timestamp' in df.columns:
+            date_col = 'timestamp'
+        elif 'date' in df.columns:
+            date_col = 'date'
+        else:
+            # Fallback to the second column
+            date_col = df.columns[1]
+        
+        if verbose:
+            print(f"Setting index to: {date_col}")
+        df[date_col] = pd.to_datetime(df[date_col])
+        df.set_index(date_col, inplace=True)
+        
+        # Remove redundant numeric index column if it exists as a column (e.g. 'Unnamed: 0')
+        for col in ['Unnamed: 0', 'unnamed: 0']:
+            if col in df.columns:
+                df.drop(columns=[col], inplace=True)
+        
+        # FORCE CHRONOLOGICAL ORDER (Earliest to Latest)
+        df.sort_index(ascending=True, inplace=True)
+        
+        # Clean column names (strip spaces and lowercase for matching)
+        df.columns = [c.strip().lower() for c in df.columns]
+        
+        if verbose:
+            print(f"Columns after cleaning: {list(df.columns)}")
+        
+        # Standardize OHLC column names
+        rename_dict = {
+            'open': 'Open',
+            'high': 'High',
+            'low': 'Low',
+            'close': 'Close',
+            'volume': 'Volume'
+        }
+        df.rename(columns=rename_dict, inplace=True)
+        if verbose:
+            print(f"Columns after rename: {list(df.columns)}")
+        return df
+
+    @staticmethod
+    def iter_chunks(symbol='MSFT', start=None, end=None, chunk_rows=100_000, overlap=250, compact=False):
+        """
+        Yields cleaned, chronologically ordered OHLCV chunks of at most chunk_rows new rows.
+        Every chunk after the first is prefixed with up to 'overlap' rows from the previous one
+        so rolling indicators (e.g. an 80-bar LMA or 20-day channels) are exact across the
+        boundary; the number of prefixed rows is in chunk.attrs['warmup'] (see drop_warmup).
+        EWM-based indicators (RSI, ATR) only converge within the overlap, so use a few
+        multiples of their period.
+        If the CSV has not been cached yet it is converted to the column cache chunk by chunk,
+        so the full file never has to fit in memory.
+        """
+        file_path = DataLoader.DEFAULT_CSV
+        source = DataLoader._select_source(symbol, file_path)
+        if source is None:
+            source = DataLoader._stream_to_cache(file_path, chunk_rows)
+        
+        lo, hi = source.locate(start or None, end or None)
+        for pos in range(lo, hi, chunk_rows):
+            first = max(lo, pos - overlap)
+            chunk = source.read_rows(first, min(pos + chunk_rows, hi))
+            if compact:
+                chunk = CompactMode.apply(chunk)
+            chunk.attrs['warmup'] = pos - first
+            yield chunk
+
+    @staticmethod
+    def drop_warmup(df, warmup=None):
+        """Removes the overlap rows that iter_chunks repeated from the previous chunk."""
+        warmup = df.attrs.get('warmup', 0) if warmup is None else warmup
+        return df.iloc[warmup:]
+
+    @staticmethod
+    def _stream_to_cache(file_path, chunk_rows=100_000):
+        """Builds the column cache from the CSV in chunks of chunk_rows without loading it whole."""
+        cache = ColumnStore(os.path.splitext(file_path)[0] + '.cache')
+        print(f"Streaming {file_path} into column cache: {cache.path}")
+        with pd.read_csv(file_path, chunksize=chunk_rows) as reader:
+            cache.write_chunks((DataLoader._clean_frame(chunk, verbose=False) for chunk in reader),
+                               source_path=file_path)
+        return cache
+
     @staticmethod
     def generate_returns(df):
         """Calculates percentage returns for the 'Close' column."""
@@ -77,5 +234,6 @@ class DataLoader:
             return df
         df = df.copy()
         if 'Close' in df.columns:
+            # Not cached: pct_change is cheaper than hashing the column for a lookup
             df['p_returns'] = df['Close'].pct_change()
         return df
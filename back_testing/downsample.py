@@ -0,0 +1,125 @@
+import math
+import numpy as np
+import pandas as pd
+from .jit import njit, kernel_args
+
+@njit(cache=True)
+def _lttb_kernel(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of n_out points keeping the visual shape of (x, y)."""
+    n = len(x)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket (the last bucket's is the final point)
+        lo = int(math.floor((i + 1) * every)) + 1
+        hi = min(int(math.floor((i + 2) * every)) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(lo, hi):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= hi - lo
+        avg_y /= hi - lo
+
+        # Point of this bucket forming the largest triangle with the previous pick and that average
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        best = -1.0
+        pick = start
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best:
+                best = area
+                pick = j
+        out[i + 1] = pick
+        a = pick
+    return out
+
+@njit(cache=True)
+def _minmax_kernel(y, n_buckets):
+    """First, min, max and last index of each of n_buckets equal buckets (sorted, may repeat)."""
+    n = len(y)
+    out = np.empty(4 * n_buckets, dtype=np.int64)
+    for b in range(n_buckets):
+        lo = b * n // n_buckets
+        hi = (b + 1) * n // n_buckets
+        lo_k = lo
+        hi_k = lo
+        for j in range(lo + 1, hi):
+            if y[j] < y[lo_k]:
+                lo_k = j
+            if y[j] > y[hi_k]:
+                hi_k = j
+        out[4 * b] = lo
+        out[4 * b + 1] = min(lo_k, hi_k)
+        out[4 * b + 2] = max(lo_k, hi_k)
+        out[4 * b + 3] = hi - 1
+    return out
+
+class Downsample:
+    """
+    Reduces long series to about as many points as the chart has pixels, so plots of
+    millions of bars render quickly and with little memory.
+    curve: continuous series (equity, prices, indicators), reduced with LTTB or min/max
+        bucketing, both of which keep peaks and troughs.
+    steps: piecewise-constant series (positions, signals), reduced to the bars around each
+        change, which draws exactly the same line as the full series (see steps for the
+        pixel columns holding several changes).
+    Series no longer than the target are returned unchanged.
+    """
+
+    METHODS = ('lttb', 'minmax')
+
+    @staticmethod
+    def pixels(fig):
+        """Width of a matplotlib figure in pixels."""
+        return int(fig.get_figwidth() * fig.dpi)
+
+    @staticmethod
+    def curve(series, width, method='lttb'):
+        """series reduced to about 2 points per pixel of width (NaN bars are dropped)."""
+        if method not in Downsample.METHODS:
+            raise ValueError(f"method must be one of {list(Downsample.METHODS)}, got {method!r}")
+        series = series.dropna()
+        n_out = max(3, 2 * int(width))
+        if len(series) <= n_out:
+            return series
+
+        if method == 'lttb':
+            x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+            x, y = kernel_args(x, series.to_numpy())
+            keep = _lttb_kernel(x, y, n_out)
+        else:
+            # 4 points per bucket, and at least one bucket for the narrowest figures
+            y, = kernel_args(series.to_numpy())
+            keep = np.unique(_minmax_kernel(y, max(1, n_out // 4)))
+        return series.iloc[np.asarray(keep)]
+
+    @staticmethod
+    def steps(series, width=None):
+        """
+        series reduced to its first and last bars and the bars on both sides of every change.
+        width: with more changes than the figure has pixels, pixel columns holding several
+        changes keep only their first, lowest, highest and last bars (the same pixels).
+        """
+        values = series.to_numpy()
+        n = len(values)
+        if n <= 2:
+            return series
+
+        # Consecutive NaN bars count as unchanged
+        after, before = values[1:], values[:-1]
+        changed = np.flatnonzero((after != before) & ~(pd.isna(after) & pd.isna(before))) + 1
+        keep = np.unique(np.concatenate(([0, n - 1], changed - 1, changed)))
+
+        n_buckets = int(width) if width else 0
+        if n_buckets and len(keep) > 4 * n_buckets and n > 4 * n_buckets:
+            y, = kernel_args(values)
+            bucket_points = np.asarray(_minmax_kernel(y, n_buckets)).reshape(n_buckets, 4)
+            bucket = keep * n_buckets // n
+            dense = np.bincount(bucket, minlength=n_buckets) > 4
+            keep = np.unique(np.concatenate((keep[~dense[bucket]], bucket_points[dense].ravel())))
+        return series.iloc[keep]
@@ -1,13 +1,16 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import quantstats as qs
+from ..downsample import Downsample
 
 class Backtester:
     """Performance analysis for High/Low strategy."""
 
-    def plot_results(self, data, symbol):
-        """Plots cumulative returns and signal state."""
+    def plot_results(self, data, symbol, downsample=True):
+        """
+        Plots cumulative returns and signal state.
+        downsample: draw about as many points as the figure has pixels (signal changes stay exact).
+        """
+        import matplotlib.pyplot as plt
         # Ensure DatetimeIndex for plotting
         if not isinstance(data.index, pd.DatetimeIndex):
             data.index = pd.to_datetime(data.index)
@@ -19,14 +22,20 @@ class Backtester:
         data['bh_cum_ret'] = (1 + data[close_col].pct_change()).cumprod()
         
         fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(15, 10))
+        strat_cum_ret, bh_cum_ret, signal = data['strat_cum_ret'], data['bh_cum_ret'], data['signal']
+        if downsample:
+            width = Downsample.pixels(fig)
+            strat_cum_ret = Downsample.curve(strat_cum_ret, width)
+            bh_cum_ret = Downsample.curve(bh_cum_ret, width)
+            signal = Downsample.steps(signal, width)
         
-        ax1.plot(data.index, data['strat_cum_ret'], label='Strategy returns')
-        ax1.plot(data.index, data['bh_cum_ret'], label='Buy and Hold Returns')
+        ax1.plot(strat_cum_ret.index, strat_cum_ret, label='Strategy returns')
+        ax1.plot(bh_cum_ret.index, bh_cum_ret, label='Buy and Hold Returns')
         ax1.set_ylabel('Cumulative Returns')
         ax1.set_title(f'High/Low Price Strategy - {symbol}')
         ax1.legend()
         
-        ax2.plot(data.index, data['signal'], color='green')
+        ax2.plot(signal.index, signal, color='green')
         ax2.set_ylabel('Signal (0 or 1)')
         ax2.set_xlabel('Date')
         
@@ -35,6 +44,7 @@ class Backtester:
 
     def generate_report(self, returns, benchmark=None):
         """Generates performance report using quantstats."""
+        import quantstats as qs
         if not isinstance(returns.index, pd.DatetimeIndex):
             returns.index = pd.to_datetime(returns.index)
         
@@ -1,13 +1,16 @@
 import pandas as pd
+from ..compact import CompactMode
+from ..indicator_cache import default_cache
 
 class IndicatorManager:
     """Calculates indicators for the High/Low Price strategy: N-Day High and Low."""
 
-    def calculate_channels(self, df, ndays_high=20, ndays_low=20):
+    def calculate_channels(self, df, ndays_high=20, ndays_low=20, channel_index=None):
         """
         Calculates the moving highest high and lowest low.
         Supports both 'High/Low' and 'high/low' column names.
         Values are shifted by 1 to avoid look-ahead bias.
+        channel_index: optional ChannelIndex built over the same rows.
         """
         data = df.copy()
         
@@ -18,7 +21,19 @@ class IndicatorManager:
         if high_col not in data.columns or low_col not in data.columns:
             raise KeyError(f"Required High/Low columns not found. Available: {list(data.columns)}")
 
-        data['ndays_high'] = data[high_col].rolling(ndays_high).max().shift(1)
-        data['ndays_low'] = data[low_col].rolling(ndays_low).min().shift(1)
+        use_index = channel_index is not None and channel_index.serves(data, ndays_high, ndays_low)
+        
+        def upper():
+            if use_index:
+                return CompactMode.as_float(data, pd.Series(channel_index.high.lagged(ndays_high), index=data.index))
+            return CompactMode.as_float(data, data[high_col].rolling(ndays_high).max().shift(1))
+        
+        def lower():
+            if use_index:
+                return CompactMode.as_float(data, pd.Series(channel_index.low.lagged(ndays_low), index=data.index))
+            return CompactMode.as_float(data, data[low_col].rolling(ndays_low).min().shift(1))
+        
+        data['ndays_high'] = default_cache.compute('ndays_high', (ndays_high,), [df[high_col]], upper)
+        data['ndays_low'] = default_cache.compute('ndays_low', (ndays_low,), [df[low_col]], lower)
         
         return data
@@ -3,15 +3,13 @@ from back_testing.high_low_price.indicators import IndicatorManager
 from back_testing.high_low_price.strategy import HighLowStrategy
 from back_testing.high_low_price.backtester import Backtester
 import numpy as np
-import importlib
-import back_testing.data
 
 def run_backtest(symbol='MSFT', start_date='2010-01-01', end_date='2022-12-31', 
-                 ndays_high=20, ndays_low=20):
-    """Orchestrates the High/Low Price strategy workflow."""
-    
-    # Reload modules for Jupyter iterative development
-    importlib.reload(back_testing.data)
+                 ndays_high=20, ndays_low=20, headless=False):
+    """
+    Orchestrates the High/Low Price strategy workflow.
+    headless: skip the charts and the quantstats report (for batch jobs and workers).
+    """
     
     # Initialize components
     loader = DataLoader()
@@ -35,6 +33,9 @@ def run_backtest(symbol='MSFT', start_date='2010-01-01', end_date='2022-12-31',
     # Step 2: Generate Signals
     data_backtested = strategy.generate_signals(data)
     
+    if headless:
+        return data_backtested
+    
     # Step 3: Visualizations
     backtester.plot_results(data_backtested, symbol)
     
@@ -43,6 +44,7 @@ def run_backtest(symbol='MSFT', start_date='2010-01-01', end_date='2022-12-31',
     benchmark = data_backtested[close_col].pct_change()
     
     backtester.generate_report(data_backtested['trade_ret'], benchmark=benchmark)
+    return data_backtested
 
 if __name__ == "__main__":
     run_backtest()
@@ -1,6 +1,23 @@
 from .strategy import HighLowStrategy
 from .indicators import IndicatorManager
 import numpy as np
+import pandas as pd
+from ..indicator_cache import default_cache
+from ..sweep import SweepRunner
+from ..walk_forward import WalkForward
+from ..metrics import Metrics
+from ..channels import ChannelIndex
+
+def _evaluate_chunk(data, combos):
+    """Sweep task: evaluates one chunk of the grid (runs in a worker process)."""
+    return Optimizer(data).evaluate(combos)
+
+def _growth_chunk(data, combos, edges=None):
+    """Walk-forward task: per-bar log growth (or its sums between edges) for one chunk."""
+    keys, growth = Optimizer(data).bar_growth(combos)
+    if edges is not None:
+        growth = WalkForward.window_sums(growth, edges)
+    return list(zip(keys, growth))
 
 class Optimizer:
     """Optimizes parameters for the High/Low Price strategy."""
@@ -9,30 +26,80 @@ class Optimizer:
         self.data = data
         self.indicator_manager = IndicatorManager()
         self.strategy = HighLowStrategy()
+        self.hits = 0
+        self.evaluated = 0
+        self.resumed = 0
+
+    def optimize(self, high_range, low_range, workers=1, chunk_size=None, search=None, store=None,
+                 checkpoint=None, metric=None):
+        """
+        Finds the best combination of entry and exit periods.
+        workers, chunk_size, search, store, checkpoint: see SweepRunner.optimize.
+        metric: rank on one of Metrics.NAMES instead of the cumulative return.
+        """
+        combos = [(h, l) for h in high_range for l in low_range]
+        
+        runner = SweepRunner(workers, chunk_size)
+        scope = store.scope('high_low_price', __file__, self.data) if store is not None else None
+        results = runner.optimize(_evaluate_chunk, self.data, combos, search, scope, checkpoint, metric)
+        self.hits, self.evaluated, self.resumed = runner.hits, runner.evaluated, runner.resumed
+        print(f"Indicator cache: {default_cache.stats()}")
+        
+        best, keys = runner.best(results, metric)
+        return (best, keys[0]) if keys else (None, None)
 
-    def optimize(self, high_range, low_range):
-        """Finds the best combination of entry and exit periods."""
-        results = {}
+    def walk_forward(self, high_range, low_range, walk_forward, workers=1, chunk_size=None):
+        """
+        Walk-forward optimization over the same grid as optimize (see WalkForward).
+        Returns the per-fold table and the stitched out-of-sample equity.
+        """
+        combos = [(h, l) for h in high_range for l in low_range]
+        return walk_forward.run(_growth_chunk, self.data, combos, SweepRunner(workers, chunk_size))
+
+    def evaluate(self, combos):
+        """
+        Returns [(key, cumulative return, metrics)] for a list of (high, low) period pairs.
+        metrics holds Metrics.NAMES computed on the per-bar marked-to-market growth, plus the trade count.
+        """
+        periods_per_year = Metrics.periods_per_year(self.data.index)
+        results = []
+        for key, df in self._runs(combos):
+            # Compute cumulative return
+            cum_return = (1 + df['trade_ret']).prod()
+            metrics = Metrics.compute(self._marked_growth(df), 'log', periods_per_year, positions=df['signal'])
+            metrics['trades'] = (df['trade_ret'] != 0).sum()
+            results.append((key, cum_return, metrics))
+        return results
+
+    def bar_growth(self, combos):
+        """Keys and (combos x bars) log growth, open positions marked to market on every bar."""
+        growth = np.zeros((len(combos), len(self.data)))
+        keys = []
+        for k, (key, df) in enumerate(self._runs(combos)):
+            keys.append(key)
+            growth[k] = WalkForward.aligned(self.data.index, self._marked_growth(df))
+        return keys, growth
+
+    @staticmethod
+    def _marked_growth(df):
+        """Per-bar log growth of a strategy frame (see Metrics.marked_growth)."""
+        close_col = 'Close' if 'Close' in df.columns else 'close'
+        return pd.Series(Metrics.marked_growth(df['signal'], df['trade_price'], df[close_col]), index=df.index)
+
+    def _runs(self, combos):
+        """Yields (key, strategy frame) for each (high, low) period pair."""
+        if not combos:
+            return
+        
+        # Range-max/min tables shared by every (h, l) pair
+        channel_index = ChannelIndex(self.data, max_window=max(max(h, l) for h, l in combos))
         
-        for h in high_range:
-            for l in low_range:
-                key = f"high{h}_low{l}"
-                
-                # Apply indicators for these periods
-                df_ind = self.indicator_manager.calculate_channels(self.data, ndays_high=h, ndays_low=l)
-                
-                # Run strategy
-                df = self.strategy.generate_signals(df_ind)
-                
-                # Compute cumulative return
-                total_ret = (1 + df['trade_ret']).prod()
-                results[key] = total_ret
-                print(f"Testing: {key} -> Return: {np.round(total_ret, 4)}")
-                
-        if results:
-            best_key = max(results, key=results.get)
-            print(f"Optimization Results:")
-            print(f"Best Parameters: {best_key}")
-            print(f"Best Return: {np.round(results[best_key], 4)}")
-            return results[best_key], best_key
-        return None, None
+        for h, l in combos:
+            key = f"high{h}_low{l}"
+            
+            # Apply indicators for these periods
+            df_ind = self.indicator_manager.calculate_channels(self.data, ndays_high=h, ndays_low=l,
+                                                               channel_index=channel_index)
+            
+            # Run strategy
+            yield key, self.strategy.generate_signals(df_ind)
@@ -1,50 +1,109 @@
 import pandas as pd
 import numpy as np
+from ..compact import CompactMode
+from ..jit import njit, kernel_args
+
+@njit(cache=True)
+def _breakout_kernel(close, ndays_high, ndays_low):
+    """Two-state latch over raw arrays. Returns signal, trade price and trade return."""
+    n = len(close)
+    signal = np.zeros(n)
+    trade_price = np.zeros(n)
+    trade_ret = np.zeros(n)
+
+    for i in range(1, n):
+        # Check if we have no position
+        if signal[i-1] == 0:
+            if close[i] > ndays_high[i]:
+                signal[i] = 1.0
+                trade_price[i] = ndays_high[i]
+            else:
+                trade_price[i] = close[i]
+
+        # Check if we have a long position
+        elif signal[i-1] == 1:
+            if close[i] < ndays_low[i]:
+                trade_price[i] = ndays_low[i]
+                # Trade return computed only on the day of exit
+                trade_ret[i] = (trade_price[i] / trade_price[i-1]) - 1
+            else:
+                signal[i] = 1.0
+                trade_price[i] = trade_price[i-1]
+
+    return signal, trade_price, trade_ret
 
 class HighLowStrategy:
     """Strategy: Long on 20-day high breakout, exit on 20-day low breach."""
 
-    def generate_signals(self, df):
+    def generate_signals(self, df, engine='vectorized'):
         """
         Generates buy and sell signals based on channel breakouts.
         data: DataFrame containing 'ndays_high', 'ndays_low' and price data.
+        engine: 'vectorized' (forward-filled entry/exit events) or 'kernel' (compiled loop).
+        Both give the same output.
         """
         data = df.copy()
         
         # Column mapping
         close_col = 'Close' if 'Close' in data.columns else 'close'
+        close, n_high, n_low = (data[c].to_numpy(dtype=np.float64) for c in [close_col, 'ndays_high', 'ndays_low'])
         
-        # Initializing columns
-        data['signal'] = 0.0
-        data['trade_price'] = 0.0
-        data['trade_ret'] = 0.0
-        
-        n = len(data)
-
-        # Iterative logic to match procedural code exactly
-        for i in range(1, n):
-            prev_signal = data['signal'].iloc[i-1]
-            curr_close = data[close_col].iloc[i]
-            n_high = data['ndays_high'].iloc[i]
-            n_low = data['ndays_low'].iloc[i]
-
-            # Check if we have no position
-            if prev_signal == 0:
-                if curr_close > n_high:
-                    data.iloc[i, data.columns.get_loc('signal')] = 1.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = n_high
-                else:
-                    data.iloc[i, data.columns.get_loc('trade_price')] = curr_close
-            
-            # Check if we have a long position
-            elif prev_signal == 1:
-                if curr_close < n_low:
-                    data.iloc[i, data.columns.get_loc('signal')] = 0.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = n_low
-                    # Trade return computed only on the day of exit
-                    data.iloc[i, data.columns.get_loc('trade_ret')] = (data.iloc[i]['trade_price'] / data.iloc[i-1]['trade_price']) - 1
-                else:
-                    data.iloc[i, data.columns.get_loc('signal')] = 1.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data.iloc[i-1]['trade_price']
+        if engine == 'vectorized':
+            signal, trade_price, trade_ret = self._vectorized(close, n_high, n_low)
+        elif engine == 'kernel':
+            signal, trade_price, trade_ret = _breakout_kernel(*kernel_args(close, n_high, n_low))
+        else:
+            raise ValueError("engine must be 'vectorized' or 'kernel'")
+        
+        data['signal'] = signal
+        data['trade_price'] = trade_price
+        data['trade_ret'] = trade_ret
 
+        # Compact mode: int8 state and float32 prices/returns
+        data['signal'] = CompactMode.as_state(data, data['signal'])
+        data['trade_price'] = CompactMode.as_float(data, data['trade_price'])
+        data['trade_ret'] = CompactMode.as_float(data, data['trade_ret'])
         return data
+
+    @staticmethod
+    def _vectorized(close, n_high, n_low):
+        """
+        Loop-free latch: the position on each bar is the last entry/exit event at or before it.
+        Entries and exits cannot fall on the same bar for valid OHLC data (the N-day low is never
+        above the N-day high); if the input breaks that, the compiled loop is used instead.
+        """
+        n = len(close)
+        entry = close > n_high
+        exit_ = close < n_low
+        if n:
+            # Bar 0 never trades, as in the loop
+            entry[0] = exit_[0] = False
+        if (entry & exit_).any():
+            return _breakout_kernel(*kernel_args(close, n_high, n_low))
+        
+        # Forward-fill the last event (1 = entry, 0 = exit); flat before the first one
+        has_event = entry | exit_
+        last_event = np.maximum.accumulate(np.where(has_event, np.arange(n), 0))
+        signal = np.where(has_event[last_event], entry[last_event], False).astype(np.float64)
+        prev_signal = np.concatenate(([0.0], signal[:-1]))
+        
+        entry_bar = (signal == 1) & (prev_signal == 0)
+        exit_bar = (signal == 0) & (prev_signal == 1)
+        hold_bar = (signal == 1) & (prev_signal == 1)
+        flat_bar = (signal == 0) & (prev_signal == 0)
+        flat_bar[:1] = False
+        
+        # Entry price carried forward through the holding bars
+        entry_idx = np.maximum.accumulate(np.where(entry_bar, np.arange(n), 0))
+        entry_price = n_high[entry_idx]
+        
+        trade_price = np.zeros(n)
+        trade_price[flat_bar] = close[flat_bar]
+        trade_price[entry_bar | hold_bar] = entry_price[entry_bar | hold_bar]
+        trade_price[exit_bar] = n_low[exit_bar]
+        
+        # Trade return computed only on the day of exit
+        trade_ret = np.zeros(n)
+        exit_idx = np.flatnonzero(exit_bar)
+        trade_ret[exit_idx] = (trade_price[exit_idx] / trade_price[exit_idx - 1]) - 1
+        return signal, trade_price, trade_ret
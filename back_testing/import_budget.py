@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import subprocess
+
+class ImportBudget:
+    """
+    Measures the cold import time of the package entry points, each in a fresh interpreter,
+    against a budget, and checks that no plotting, reporting or ML library is loaded before
+    a chart, report or model is actually requested.
+    Run with: python -m back_testing.import_budget
+    """
+
+    # Seconds allowed for a cold import of one entry point (pandas and numba take most of it)
+    BUDGET = 1.0
+    PACKAGES = ('ma', 'turtle_trading', 'high_low_price', 'buy_sell_next_day', 'strategy_on_rsi')
+    MODULES = tuple(f'back_testing.{pkg}.{mod}' for pkg in PACKAGES for mod in ('main', 'optimizer'))
+    # Libraries that must only be imported on demand
+    HEAVY = ('matplotlib', 'quantstats', 'seaborn', 'keras', 'tensorflow', 'sklearn', 'yfinance')
+
+    def __init__(self, budget=None, repeat=3):
+        self.budget = self.BUDGET if budget is None else budget
+        self.repeat = repeat
+        self.root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def measure(self, module):
+        """Best import time of module over 'repeat' fresh interpreters, and the heavy libraries it loaded."""
+        code = (
+            "import sys, time, json\n"
+            "t = time.perf_counter()\n"
+            f"import {module}\n"
+            "elapsed = time.perf_counter() - t\n"
+            f"print(json.dumps([elapsed, [m for m in {list(self.HEAVY)!r} if m in sys.modules]]))\n"
+        )
+        best, heavy = float('inf'), []
+        for _ in range(self.repeat):
+            out = subprocess.run([sys.executable, '-c', code], cwd=self.root, capture_output=True,
+                                 text=True, check=True)
+            elapsed, heavy = json.loads(out.stdout.strip().splitlines()[-1])
+            best = min(best, elapsed)
+        return best, heavy
+
+    def check(self, modules=None):
+        """Prints the import time of each module and returns True when all are within budget."""
+        ok = True
+        for module in modules or self.MODULES:
+            elapsed, heavy = self.measure(module)
+            passed = elapsed <= self.budget and not heavy
+            ok = ok and passed
+            note = f", loads {', '.join(heavy)}" if heavy else ''
+            print(f"{'OK  ' if passed else 'FAIL'} {module}: {elapsed:.3f}s (budget {self.budget}s){note}")
+        return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if ImportBudget().check() else 1)
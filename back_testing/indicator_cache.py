@@ -0,0 +1,153 @@
+import hashlib
+import weakref
+import contextlib
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+class IndicatorCache:
+    """
+    LRU cache of indicator results shared by the IndicatorManager classes.
+    Entries are keyed by a fingerprint of the input columns (values and index), the
+    indicator name and its parameters, and evicted least-recently-used first once the
+    cached results exceed max_bytes. Hit/miss/eviction counters are kept in stats().
+    The hash of an array that cannot change under the cache (read-only buffers such as
+    DataPlane views and memory-mapped stores, or any buffer inside a frozen() block) is
+    computed once, so repeated lookups on a loaded frame cost a dictionary access rather
+    than a pass over the data. Cached results are shared between callers and must not be
+    modified in place. Use it for indicators that cost noticeably more than hashing their
+    inputs once.
+    """
+
+    # {id(root array): (weakref to it, {(address, shape, strides, dtype): digest})}
+    _digests = {}
+    # Depth of nested frozen() blocks
+    _frozen = 0
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(*inputs):
+        """
+        Content hash of the given Series/arrays, including dtypes and the (shared) index.
+        Hashes of read-only buffers, and of any buffer inside frozen(), are memoized on the
+        array owning the buffer (held by a weakref, so the entry goes with the data).
+        """
+        h = hashlib.blake2b(digest_size=16)
+        seen_indexes = set()
+        for item in inputs:
+            if isinstance(item, pd.Series):
+                index = item.index
+                if id(index) not in seen_indexes:
+                    seen_indexes.add(id(index))
+                    h.update(IndicatorCache._digest(index.values if isinstance(index, pd.DatetimeIndex)
+                                                    else index.to_numpy()))
+                item = item.to_numpy()
+            h.update(IndicatorCache._digest(np.asarray(item)))
+        return h.hexdigest()
+
+    @staticmethod
+    @contextlib.contextmanager
+    def frozen():
+        """
+        Block in which no input is modified in place (e.g. a sweep over loaded data), so the
+        hash of every buffer can be memoized; those hashes are dropped when the outermost
+        block exits.
+        """
+        IndicatorCache._frozen += 1
+        try:
+            yield
+        finally:
+            IndicatorCache._frozen -= 1
+            if not IndicatorCache._frozen:
+                memo = IndicatorCache._digests
+                for key in [k for k, (ref, _) in memo.items() if ref() is None or ref().flags.writeable]:
+                    del memo[key]
+
+    @staticmethod
+    def _digest(values):
+        """Hash of one array, memoized per buffer when it cannot change (see fingerprint)."""
+        # Views (e.g. a column of a DataFrame block) share the array at the root of their base chain
+        root = values
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        memoize = values.dtype != object and (IndicatorCache._frozen or not root.flags.writeable)
+        
+        memo = IndicatorCache._digests
+        view = (values.__array_interface__['data'][0], values.shape, values.strides, values.dtype.str)
+        entry = memo.get(id(root)) if memoize else None
+        if entry is not None and entry[0]() is root and view in entry[1]:
+            return entry[1][view]
+        
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{values.dtype.str}{values.shape}".encode())
+        if values.dtype == object:
+            h.update(repr(values.tolist()).encode())
+        else:
+            h.update(np.ascontiguousarray(values).view(np.uint8).data)
+        digest = h.digest()
+        
+        if memoize:
+            if entry is None or entry[0]() is not root:
+                key = id(root)
+                entry = memo[key] = (weakref.ref(root, lambda _, key=key: memo.pop(key, None)), {})
+            entry[1][view] = digest
+        return digest
+
+    @staticmethod
+    def _sizeof(value):
+        if isinstance(value, (tuple, list)):
+            return sum(IndicatorCache._sizeof(v) for v in value)
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=False))
+        if hasattr(value, 'nbytes'):
+            return int(value.nbytes)
+        return 64
+
+    def compute(self, name, params, inputs, func):
+        """Returns func() for (inputs, name, params), from the cache when it was computed before."""
+        key = (self.fingerprint(*inputs), name, tuple(params))
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+        self.misses += 1
+        value = func()
+        size = self._sizeof(value)
+        if size <= self.max_bytes:
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.nbytes -= old_size
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        """Counters and memory use, e.g. to report the savings of a sweep."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def clear(self):
+        """Drops all entries and resets the counters."""
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+# Process-wide cache used by every IndicatorManager
+default_cache = IndicatorCache()
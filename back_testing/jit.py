@@ -0,0 +1,24 @@
+import numpy as np
+
+# Numba is optional. Kernels decorated with njit are compiled when it is installed and
+# otherwise run as plain Python; kernel_args hands them Python lists in that case because
+# indexing a list is much cheaper than indexing a NumPy array from interpreted code.
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports both @njit and @njit(...))."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def kernel_args(*arrays, dtype=np.float64):
+    """Converts input columns to what the kernels iterate over fastest in the current mode."""
+    converted = [np.ascontiguousarray(a, dtype=dtype) for a in arrays]
+    if HAVE_NUMBA:
+        return converted
+    return [a.tolist() for a in converted]
@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 class Backtester:
     """Backtesting engine for the strategy."""
@@ -19,6 +18,12 @@ class Backtester:
 
     def plot_results(self, data, start=50, end=130):
         """Plots the signal, moving averages, and closing price."""
+        import matplotlib.pyplot as plt
         data[['signal', 'sma', 'mma', 'lma', 'Close']].iloc[start:end].plot(
             figsize=(10, 6), secondary_y='signal')
         plt.show()
+
+    def generate_report(self, returns, benchmark=None):
+        """Generates a full quantstats report for the daily strategy returns."""
+        import quantstats as qs
+        qs.reports.full(returns, benchmark=benchmark)
@@ -1,4 +1,47 @@
+import numpy as np
 import pandas as pd
+from ..compact import CompactMode
+from ..jit import njit, kernel_args
+from ..indicator_cache import default_cache
+
+@njit(cache=True)
+def _compensated_cumsum(x):
+    """Prefix sums carried as a (hi, lo) pair with Neumaier compensation."""
+    n = len(x)
+    hi = np.zeros(n + 1)
+    lo = np.zeros(n + 1)
+    s = 0.0
+    c = 0.0
+    for i in range(n):
+        t = s + x[i]
+        if abs(s) >= abs(x[i]):
+            c += (s - t) + x[i]
+        else:
+            c += (x[i] - t) + s
+        s = t
+        hi[i + 1] = s
+        lo[i + 1] = c
+    return hi, lo
+
+class MovingAverageBank:
+    """Simple moving averages for many windows stored as one contiguous (windows x bars) array."""
+
+    def __init__(self, windows, values):
+        self.windows = np.asarray(windows, dtype=np.int64)
+        self.values = values
+        self._rows = {int(w): i for i, w in enumerate(self.windows)}
+
+    def row(self, window):
+        """Row of self.values that holds the given window."""
+        return self._rows[int(window)]
+
+    def get(self, window):
+        """The moving average for one window (a view, not a copy)."""
+        return self.values[self.row(window)]
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
 
 class IndicatorManager:
     """Calculates various technical indicators for the strategy."""
@@ -6,7 +49,11 @@ class IndicatorManager:
     @staticmethod
     def calculate_sma(df, window):
         """Calculates a Simple Moving Average (SMA) for a given window."""
-        return df['Close'].rolling(window=window).mean()
+        close = df['Close']
+        sma = default_cache.compute('sma', (window,), [close],
+                                    lambda: CompactMode.as_float(df, close.rolling(window=window).mean()))
+        # The cached Series is shared with later callers, so each gets its own copy
+        return sma.copy()
     
     @classmethod
     def apply_mas(cls, df, sma_period, mma_period, lma_period):
@@ -16,3 +63,53 @@ class IndicatorManager:
         df['mma'] = cls.calculate_sma(df, mma_period)
         df['lma'] = cls.calculate_sma(df, lma_period)
         return df
+
+    @staticmethod
+    def calculate_sma_bank(df, windows, method='cumsum', compensated=False):
+        """
+        Calculates the SMA of 'Close' for every window in one go.
+        method='cumsum' builds a single prefix-sum buffer and derives each window by
+        differencing, so each extra window costs one O(n) subtraction instead of a rolling pass.
+        compensated=True carries the prefix sums with Neumaier compensation, for long series
+        where plain cumulative sums lose precision. method='rolling' uses pandas' rolling mean
+        per window and matches calculate_sma bit for bit.
+        Windows with a NaN close inside them are NaN, as with rolling(window).mean().
+        """
+        windows = sorted({int(w) for w in windows})
+        if windows and windows[0] < 1:
+            raise ValueError(f"Windows must be positive, got {windows[0]}")
+        return default_cache.compute('sma_bank', (tuple(windows), method, compensated), [df['Close']],
+                                     lambda: IndicatorManager._sma_bank(df, windows, method, compensated))
+
+    @staticmethod
+    def _sma_bank(df, windows, method, compensated):
+        close = df['Close'].to_numpy(dtype=np.float64)
+        n = len(close)
+        values = np.full((len(windows), n), np.nan, dtype=CompactMode.float_dtype(df))
+        
+        if method == 'rolling':
+            for k, w in enumerate(windows):
+                values[k] = IndicatorManager.calculate_sma(df, w).to_numpy()
+            return MovingAverageBank(windows, values)
+        if method != 'cumsum':
+            raise ValueError("method must be 'cumsum' or 'rolling'")
+        
+        # One prefix-sum pass (NaNs summed as 0 and counted separately)
+        is_nan = np.isnan(close)
+        x = np.where(is_nan, 0.0, close)
+        nan_count = np.concatenate(([0], np.cumsum(is_nan)))
+        if compensated:
+            hi, lo = (np.asarray(a) for a in _compensated_cumsum(*kernel_args(x)))
+        else:
+            hi, lo = np.concatenate(([0.0], np.cumsum(x))), None
+        
+        for k, w in enumerate(windows):
+            if w > n:
+                continue
+            sums = hi[w:] - hi[:-w]
+            if lo is not None:
+                sums += lo[w:] - lo[:-w]
+            sma = sums / w
+            sma[nan_count[w:] - nan_count[:-w] > 0] = np.nan
+            values[k, w - 1:] = sma
+        return MovingAverageBank(windows, values)
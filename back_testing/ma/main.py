@@ -3,14 +3,14 @@ from back_testing.ma.strategy import MovingAverageStrategy
 from back_testing.ma.backtester import Backtester
 from back_testing.ma.optimizer import Optimizer
 import numpy as np
-import importlib
-import back_testing.data
-importlib.reload(back_testing.data)
 from back_testing.data import DataLoader
-import quantstats as qs
 
-def run_backtest(symbol='NSEI', start_date='2001-01-01', end_date='2025-12-31', sma=20, mma=40, lma=80, optimize=False):
-    """Orchestrates the backtesting and optimization workflow."""
+def run_backtest(symbol='NSEI', start_date='2001-01-01', end_date='2025-12-31', sma=20, mma=40, lma=80, optimize=False,
+                 headless=False):
+    """
+    Orchestrates the backtesting and optimization workflow.
+    headless: skip the quantstats report and the chart (for batch jobs and workers).
+    """
     
     # Initialize components
     loader = DataLoader()
@@ -31,12 +31,13 @@ def run_backtest(symbol='NSEI', start_date='2001-01-01', end_date='2025-12-31',
     print(f'Buy and hold returns: {np.round(bnh, 2)}')
     print(f'Strategy returns: {np.round(s_returns, 2)}')
     
-    # Generate full report using daily returns series and benchmark
-    qs.reports.full(data_backtested['strategy_returns'], benchmark=data_backtested['p_returns'])
+    if not headless:
+        # Generate full report using daily returns series and benchmark
+        backtester.generate_report(data_backtested['strategy_returns'], benchmark=data_backtested['p_returns'])
 
-    # Plot results
-    print(f"\nDisplaying chart for {symbol}...")
-    backtester.plot_results(data_backtested)
+        # Plot results
+        print(f"\nDisplaying chart for {symbol}...")
+        backtester.plot_results(data_backtested)
     
     # Optimization
     if optimize:
@@ -48,6 +49,8 @@ def run_backtest(symbol='NSEI', start_date='2001-01-01', end_date='2025-12-31',
         
         optimizer = Optimizer(data)
         optimizer.optimize(sma_range, mma_range, lma_range)
+    
+    return data_backtested
 
 if __name__ == "__main__":
     run_backtest(symbol='NSEI', start_date='2001-01-01', end_date='2020-12-31', sma=20, mma=40, lma=80, optimize=True)
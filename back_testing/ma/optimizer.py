@@ -4,43 +4,140 @@ from ..data import DataLoader
 from .indicators import IndicatorManager
 from .strategy import MovingAverageStrategy
 from .backtester import Backtester
+from ..indicator_cache import default_cache
+from ..sweep import SweepRunner
+from ..walk_forward import WalkForward
+from ..metrics import Metrics, STATS
+
+def _evaluate_chunk(data, combos, ma_method='cumsum'):
+    """Sweep task: [(key, strategy return, metrics)] for one chunk of the grid (runs in a worker process)."""
+    results = Optimizer(data, ma_method=ma_method).evaluate(combos)
+    metrics = results[['strategy_returns', 'bnh'] + list(Metrics.NAMES)].to_dict('records')
+    return list(zip(results['key'], results['strategy_returns'], metrics))
+
+def _growth_chunk(data, combos, edges=None, ma_method='cumsum'):
+    """Walk-forward task: per-bar log growth (or its sums between edges) for one chunk."""
+    keys, growth = Optimizer(data, ma_method=ma_method).bar_growth(combos)
+    if edges is not None:
+        growth = WalkForward.window_sums(growth, edges)
+    return list(zip(keys, growth))
 
 class Optimizer:
     """Optimizes the moving average periods for the strategy."""
 
-    def __init__(self, data):
+    # Bound on the (combos x bars) bar returns materialised per batch without numba
+    MAX_BATCH_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, data, ma_method='cumsum'):
+        """
+        ma_method: how the moving-average bank is built ('cumsum', the default, derives all
+        windows from one prefix sum, with differences from the single-run strategy in the
+        last few bits; 'rolling' reproduces it exactly, for reference runs).
+        """
         self.data = data
+        self.ma_method = ma_method
         self.loader = DataLoader()
         self.indicator_manager = IndicatorManager()
         self.strategy = MovingAverageStrategy()
         self.backtester = Backtester()
+        self.results = None
+        self.hits = 0
+        self.evaluated = 0
+        self.resumed = 0
 
-    def optimize(self, sma_range, mma_range, lma_range):
-        """Finds the best moving average parameters for maximum strategy returns."""
-        ma_dict = {}
+    def optimize(self, sma_range, mma_range, lma_range, workers=1, chunk_size=None, search=None, store=None,
+                 checkpoint=None, metric=None):
+        """
+        Finds the best moving average parameters for maximum strategy returns.
+        All combinations are evaluated in one batch; the full table is kept in self.results.
+        workers, chunk_size, search, store, checkpoint: see SweepRunner.optimize (stored results
+        are also keyed on ma_method). With search, self.results holds the combinations it
+        evaluated on the full history.
+        metric: rank on one of Metrics.NAMES instead of the strategy return; self.results has a
+        column for each.
+        """
+        Metrics.check(metric)
+        combos = [(sma, mma, lma) for sma in sma_range for mma in mma_range for lma in lma_range]
+        print(f'\nChecking {len(combos)} combinations of SMA, MMA and LMA')
+        runner = SweepRunner(workers, chunk_size)
+        scope = store.scope(f'ma_{self.ma_method}', __file__, self.data) if store is not None else None
+        evaluated = [item for part in runner.sweep(_evaluate_chunk, self.data, combos, search, scope, checkpoint,
+                                                   metric, ma_method=self.ma_method) for item in part]
+        self.hits, self.evaluated, self.resumed = runner.hits, runner.evaluated, runner.resumed
+        df = self.loader.generate_returns(self.data)
+        metrics = {name: [m[name] for _, _, _, m in evaluated] for name in Metrics.NAMES}
+        self.results = self._table([c for c, _, _, _ in evaluated], df,
+                                   np.array([v for _, _, v, _ in evaluated], dtype=np.float64), metrics)
+        # to_numpy keeps np.float64 values, the type optimize returned before batching
+        ma_dict = dict(zip(self.results['key'], self.results['strategy_returns' if metric is None else metric].to_numpy()))
         
-        # Optimize the strategy
-        for sma in sma_range:
-            for mma in mma_range:
-                for lma in lma_range:
-                    key = f'sma{sma}_mma{mma}_lma{lma}'
-                    print(f'\nChecking for SMA: {sma}, MMA: {mma}, LMA: {lma}')
-                    
-                    df = self.data.copy()
-                    df = self.loader.generate_returns(df)
-                    df = self.indicator_manager.apply_mas(df, sma, mma, lma)
-                    df = self.strategy.generate_signals(df)
-                    bnh, s_returns = self.backtester.calculate_metrics(df)
-                    
-                    print(f'Buy and hold returns: {np.round(bnh, 2)}')
-                    print(f'Strategy returns: {np.round(s_returns, 2)}')
-                    ma_dict[key] = s_returns
+        print(f"Indicator cache: {default_cache.stats()}")
         
         # Result Summary
-        if ma_dict:
-            max_ret = max(ma_dict.values())
-            opt_values = [key for key, value in ma_dict.items() if value == max_ret]
-            print(f"The max strategy returns are {max_ret} for the values {opt_values}.")
-            return max_ret, opt_values
-        else:
-            return None, None
+        max_ret, opt_values = runner.best(ma_dict, metric)
+        return (max_ret, opt_values) if opt_values else (None, None)
+
+    def walk_forward(self, sma_range, mma_range, lma_range, walk_forward, workers=1, chunk_size=None):
+        """
+        Walk-forward optimization over the same grid as optimize (see WalkForward).
+        Returns the per-fold table and the stitched out-of-sample equity.
+        """
+        combos = [(sma, mma, lma) for sma in sma_range for mma in mma_range for lma in lma_range]
+        return walk_forward.run(_growth_chunk, self.data, combos, SweepRunner(workers, chunk_size),
+                                ma_method=self.ma_method)
+
+    def evaluate(self, combos):
+        """
+        Evaluates a list of (sma, mma, lma) triples together and returns a results table
+        with the strategy return and the Metrics.NAMES columns.
+        Returns and each distinct window's moving average are computed once into a
+        (windows x bars) bank that the batched state machine indexes into; the per-bar
+        returns are scored as each combination runs (see batch_stats), in batches bounded by
+        MAX_BATCH_BYTES when the per-bar returns have to be materialised (without numba).
+        """
+        df, (close, p_returns, bank, sma_idx, mma_idx, lma_idx) = self._batch_args(combos)
+        rows = max(1, self.MAX_BATCH_BYTES // (8 * max(len(df), 1)))
+        
+        s_returns, stats, held = [], [], []
+        for lo in range(0, len(combos), rows):
+            batch = self.strategy.batch_stats(close, p_returns, bank, sma_idx[lo:lo + rows],
+                                              mma_idx[lo:lo + rows], lma_idx[lo:lo + rows])
+            s_returns.append(batch[0])
+            stats.append(batch[1])
+            held.append(batch[2])
+        
+        s_returns = np.concatenate(s_returns) if s_returns else np.ones(0)
+        stats = np.concatenate(stats) if stats else np.empty((0, len(STATS)))
+        held = np.concatenate(held) if held else np.zeros(0)
+        metrics = Metrics.from_stats(stats, len(df), Metrics.periods_per_year(df.index), held)
+        return self._table(combos, df, s_returns, metrics)
+
+    def bar_growth(self, combos):
+        """Keys and (combos x bars) log growth of the strategy, from the same batch as evaluate."""
+        df, args = self._batch_args(combos)
+        growth = np.log1p(self.strategy.batch_bar_returns(*args))
+        return [f'sma{sma}_mma{mma}_lma{lma}' for sma, mma, lma in combos], growth
+
+    def _batch_args(self, combos):
+        """The returns frame and the batch_returns arguments (close, returns, MA bank, row indices)."""
+        df = self.loader.generate_returns(self.data)
+        windows = {w for combo in combos for w in combo}
+        bank = self.indicator_manager.calculate_sma_bank(df, windows, method=self.ma_method)
+        
+        sma_idx, mma_idx, lma_idx = ([bank.row(c[j]) for c in combos] for j in range(3))
+        return df, (df['Close'].to_numpy(), df['p_returns'].to_numpy(), bank.values, sma_idx, mma_idx, lma_idx)
+
+    @staticmethod
+    def _table(combos, df, s_returns, metrics):
+        """Results table for the given combinations, their strategy returns and {metric: values}."""
+        bnh = (df['p_returns'] + 1).cumprod().iloc[-1] if len(df) else 0.0
+        
+        return pd.DataFrame({
+            'key': [f'sma{sma}_mma{mma}_lma{lma}' for sma, mma, lma in combos],
+            'sma': [c[0] for c in combos],
+            'mma': [c[1] for c in combos],
+            'lma': [c[2] for c in combos],
+            'bnh': bnh,
+            'strategy_returns': s_returns,
+            **metrics,
+        })
@@ -1,5 +1,102 @@
 import numpy as np
 import pandas as pd
+from ..compact import CompactMode
+from ..jit import njit, kernel_args, HAVE_NUMBA
+from ..metrics import Metrics, STATS, _row_stats
+
+@njit(cache=True)
+def _signal_kernel(close, sma, mma, lma):
+    """Long/short/flat state machine over raw arrays; returns the signal as float64."""
+    n = len(close)
+    signal = np.zeros(n)
+    prev_signal = 0.0
+    for i in range(1, n):
+        s, m, l = sma[i], mma[i], lma[i]
+        # Flat while any MA is still NaN
+        if s != s or m != m or l != l:
+            prev_signal = 0.0
+            continue
+        
+        # Conditions per moving average
+        close_i = close[i]
+        cond_sma = close_i >= s
+        cond_mma = close_i >= m
+        cond_lma = close_i >= l
+        
+        # No current position
+        if prev_signal == 0.0:
+            if cond_sma and cond_mma and cond_lma:
+                prev_signal = 1.0   # Go long
+            elif not cond_sma and not cond_mma and not cond_lma:
+                prev_signal = -1.0  # Go short
+        
+        # Currently Long
+        elif prev_signal == 1.0:
+            if not cond_sma or not cond_mma or not cond_lma:
+                prev_signal = 0.0   # Exit long
+        
+        # Currently Short
+        elif prev_signal == -1.0:
+            if cond_sma or cond_mma or cond_lma:
+                prev_signal = 0.0   # Exit short
+        
+        signal[i] = prev_signal
+    return signal
+
+@njit(cache=True)
+def _batch_kernel(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx):
+    """Terminal compounded strategy return for every (sma, mma, lma) row-index triple."""
+    n_combos = len(sma_idx)
+    equity = np.ones(n_combos)
+    for k in range(n_combos):
+        signal = _signal_kernel(close, ma_bank[sma_idx[k]], ma_bank[mma_idx[k]], ma_bank[lma_idx[k]])
+        eq = 1.0
+        for i in range(1, len(close)):
+            r = p_returns[i] * signal[i-1]
+            if r == r:
+                eq *= (r + 1)
+        equity[k] = eq
+    return equity
+
+@njit(cache=True)
+def _batch_bar_kernel(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx):
+    """Per-bar strategy returns (0 where undefined) for every row-index triple: (combos x bars)."""
+    n_combos = len(sma_idx)
+    out = np.zeros((n_combos, len(close)))
+    for k in range(n_combos):
+        signal = _signal_kernel(close, ma_bank[sma_idx[k]], ma_bank[mma_idx[k]], ma_bank[lma_idx[k]])
+        for i in range(1, len(close)):
+            r = p_returns[i] * signal[i-1]
+            if r == r:
+                out[k, i] = r
+    return out
+
+@njit(cache=True)
+def _batch_stats_kernel(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx, rf, stats, held):
+    """
+    Terminal equity (as _batch_kernel), the Metrics STATS row and the bars with a position
+    of every combination, one bar row at a time.
+    """
+    n_combos = len(sma_idx)
+    equity = np.ones(n_combos)
+    row = np.zeros(len(close))
+    for k in range(n_combos):
+        signal = _signal_kernel(close, ma_bank[sma_idx[k]], ma_bank[mma_idx[k]], ma_bank[lma_idx[k]])
+        eq = 1.0
+        n_held = 0
+        for i in range(1, len(close)):
+            if signal[i-1] != 0.0:
+                n_held += 1
+            r = p_returns[i] * signal[i-1]
+            if r == r:
+                eq *= (r + 1)
+                row[i] = r
+            else:
+                row[i] = 0.0
+        equity[k] = eq
+        held[k] = n_held
+        _row_stats(row, False, rf, stats[k])
+    return equity
 
 class MovingAverageStrategy:
     """Strategy logic based on three moving averages (SMA, MMA, LMA)."""
@@ -7,50 +104,102 @@ class MovingAverageStrategy:
     def generate_signals(self, data):
         """Generates buy and sell signals based on conditions for 3 moving averages."""
         df = data.copy()
-        df['signal'] = np.nan
         
-        # Set the first day signal to zero
-        df.loc[df.index[0], 'signal'] = 0.0
-
-        # Loop through each day to compute the signal
-        for i in range(1, len(df)):
-            # Check if MAs have non-Nan values
-            if pd.isna(df['sma'].iloc[i]) or pd.isna(df['mma'].iloc[i]) or pd.isna(df['lma'].iloc[i]):
-                df.loc[df.index[i], 'signal'] = 0.0
-                continue
-            
-            # Conditions per moving average
-            close_i = df['Close'].iloc[i]
-            cond_sma = close_i >= df['sma'].iloc[i]
-            cond_mma = close_i >= df['mma'].iloc[i]
-            cond_lma = close_i >= df['lma'].iloc[i]
-            
-            prev_signal = df['signal'].iloc[i-1]
-            
-            # No current position
-            if pd.isna(prev_signal) or prev_signal == 0.0:
-                if cond_sma and cond_mma and cond_lma:
-                    df.loc[df.index[i], 'signal'] = 1.0  # Go long
-                elif not cond_sma and not cond_mma and not cond_lma:
-                    df.loc[df.index[i], 'signal'] = -1.0 # Go short
-                else:
-                    df.loc[df.index[i], 'signal'] = 0.0
-            
-            # Currently Long
-            elif prev_signal == 1.0:
-                if not cond_sma or not cond_mma or not cond_lma:
-                    df.loc[df.index[i], 'signal'] = 0.0  # Exit long
-                else:
-                    df.loc[df.index[i], 'signal'] = 1.0  # Hold long
-            
-            # Currently Short
-            elif prev_signal == -1.0:
-                if cond_sma or cond_mma or cond_lma:
-                    df.loc[df.index[i], 'signal'] = 0.0  # Exit short
-                else:
-                    df.loc[df.index[i], 'signal'] = -1.0 # Hold short
+        # Run the state machine once over the raw columns and write the signal back in one go
+        close, sma, mma, lma = kernel_args(df['Close'], df['sma'], df['mma'], df['lma'])
+        df['signal'] = np.asarray(_signal_kernel(close, sma, mma, lma))
         
         # Calculate strategy returns
-        df['strategy_returns'] = df['p_returns'] * df['signal'].shift(1)
+        df['strategy_returns'] = CompactMode.as_float(df, df['p_returns'] * df['signal'].shift(1))
+        df['signal'] = CompactMode.as_state(df, df['signal'])
         
         return df
+
+    def batch_returns(self, close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx):
+        """
+        Runs the state machine for many parameter combinations at once.
+        ma_bank: 2-D array (windows x bars) of moving averages; sma_idx/mma_idx/lma_idx hold,
+        per combination, the row of ma_bank to use. Returns the terminal value of
+        (strategy_returns + 1).cumprod() for each combination, matching generate_signals.
+        """
+        args = self._batch_args(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx)
+        if HAVE_NUMBA:
+            return _batch_kernel(*args)
+        
+        p_returns = args[1]
+        equity = np.ones(len(args[3]))
+        for i, positions in self._batch_steps(*args):
+            if p_returns[i] == p_returns[i]:
+                equity *= (p_returns[i] * positions + 1)
+        return equity
+
+    def batch_bar_returns(self, close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx):
+        """
+        Like batch_returns, but returns every bar's strategy return as a (combos x bars)
+        array (0 where generate_signals gives NaN), e.g. to score many windows of one run.
+        """
+        args = self._batch_args(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx)
+        if HAVE_NUMBA:
+            return _batch_bar_kernel(*args)
+        return self._batch_bars(*args)[0]
+
+    def batch_stats(self, close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx, rf=0.0):
+        """
+        Like batch_returns, plus the Metrics.stats row of each combination's bar returns
+        (rf: per-bar risk-free rate) and the number of bars it holds a position (the
+        previous bar's signal is non-zero). With numba the stats are accumulated while each
+        combination runs, without a (combos x bars) array. Returns (terminal values, stats, held).
+        """
+        args = self._batch_args(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx)
+        if HAVE_NUMBA:
+            stats = np.empty((len(args[3]), len(STATS)))
+            held = np.zeros(len(args[3]), dtype=np.int64)
+            return _batch_stats_kernel(*args, rf, stats, held), stats, held
+        
+        # A sequential product, so the terminal value equals batch_returns bit for bit
+        bars, held = self._batch_bars(*args)
+        equity = np.cumprod(bars + 1, axis=1)[:, -1] if bars.shape[1] else np.ones(len(bars))
+        return equity, Metrics.stats(bars, 'simple', rf), held
+
+    @staticmethod
+    def _batch_args(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx):
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        p_returns = np.ascontiguousarray(p_returns, dtype=np.float64)
+        ma_bank = np.ascontiguousarray(ma_bank, dtype=np.float64)
+        sma_idx, mma_idx, lma_idx = (np.asarray(a, dtype=np.int64) for a in (sma_idx, mma_idx, lma_idx))
+        return close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx
+
+    @staticmethod
+    def _batch_bars(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx):
+        """Without numba: (combos x bars) strategy returns (0 where undefined) and the bars with a position."""
+        out = np.zeros((len(sma_idx), len(close)))
+        held = np.zeros(len(sma_idx), dtype=np.int64)
+        for i, positions in MovingAverageStrategy._batch_steps(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx):
+            held += positions != 0.0
+            if p_returns[i] == p_returns[i]:
+                out[:, i] = p_returns[i] * positions
+        return out, held
+
+    @staticmethod
+    def _batch_steps(close, p_returns, ma_bank, sma_idx, mma_idx, lma_idx):
+        """
+        Without numba: steps through the bars once, vectorised across all combinations,
+        yielding (bar, positions of all combinations) for every bar after the first; bar i
+        holds the signal of bar i-1.
+        """
+        bank_t = np.ascontiguousarray(ma_bank.T)
+        prev_signal = np.zeros(len(sma_idx))
+        for i in range(1, len(close)):
+            yield i, prev_signal
+            
+            row = bank_t[i]
+            s, m, l = row[sma_idx], row[mma_idx], row[lma_idx]
+            cond_sma, cond_mma, cond_lma = close[i] >= s, close[i] >= m, close[i] >= l
+            all_above = cond_sma & cond_mma & cond_lma
+            all_below = ~cond_sma & ~cond_mma & ~cond_lma
+            
+            # Long is entered from flat and held while all above; short likewise below
+            signal = np.where(all_above & (prev_signal != -1.0), 1.0,
+                              np.where(all_below & (prev_signal != 1.0), -1.0, 0.0))
+            signal[np.isnan(s) | np.isnan(m) | np.isnan(l)] = 0.0
+            prev_signal = signal
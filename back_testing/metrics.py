@@ -0,0 +1,234 @@
+import math
+import numpy as np
+import pandas as pd
+from .jit import njit, HAVE_NUMBA
+
+# Columns of a Metrics.stats row
+STATS = ('growth', 'mean_excess', 'variance', 'downside', 'worst', 'longest', 'active', 'positive')
+
+@njit(cache=True)
+def _row_stats(r, is_log, rf, out):
+    """
+    One pass over a return row (NaN = flat), writing the STATS accumulators to out.
+    Kernels that generate returns call it on a reusable row buffer.
+    """
+    n = len(r)
+    log_scale = 0.0
+    equity = 1.0
+    peak = 1.0
+    worst = 1.0
+    last_peak = -1
+    longest = 0
+    sum_excess = 0.0
+    sum_sq = 0.0
+    down = 0.0
+    active = 0
+    positive = 0
+    for i in range(n):
+        x = r[i]
+        if x != x:
+            x = 0.0
+        if is_log:
+            s = math.expm1(x)
+            equity *= math.exp(x)
+        else:
+            s = x
+            equity *= 1.0 + x
+        e = s - rf
+        sum_excess += e
+        sum_sq += e * e
+        if e < 0.0:
+            down += e * e
+        if s != 0.0:
+            active += 1
+            if s > 0.0:
+                positive += 1
+
+        # Equity relative to its running peak (which starts at 1 before the first bar)
+        if equity >= peak:
+            peak = equity
+            last_peak = i
+            # Rescale so long compounding runs cannot overflow
+            if peak > 1e100:
+                log_scale += math.log(peak)
+                equity /= peak
+                peak = 1.0
+        elif equity / peak < worst:
+            worst = equity / peak
+        if i - last_peak > longest:
+            longest = i - last_peak
+
+    mean = sum_excess / n if n > 0 else np.nan
+    out[0] = log_scale + (math.log(equity) if equity > 0.0 else -np.inf)
+    out[1] = mean
+    out[2] = max(sum_sq - n * mean * mean, 0.0) / (n - 1) if n > 1 else np.nan
+    out[3] = down / n if n > 0 else np.nan
+    out[4] = math.log(worst) if worst > 0.0 else -np.inf
+    out[5] = longest
+    out[6] = active
+    out[7] = positive
+
+@njit(cache=True)
+def _stats_kernel(returns, is_log, rf):
+    """STATS for every row of a 2-D return array."""
+    out = np.empty((returns.shape[0], len(STATS)))
+    for k in range(returns.shape[0]):
+        _row_stats(returns[k], is_log, rf, out[k])
+    return out
+
+class Metrics:
+    """
+    Performance metrics for one return series or a (combos x bars) batch, computed in one
+    pass per row (a compiled kernel with numba, vectorised NumPy otherwise) for ranking
+    sweeps without quantstats.
+    kind states what the returns are, 'simple' (P1/P0 - 1) or 'log' (log(P1/P0)); the
+    other form is derived explicitly, never guessed. NaN returns count as flat bars.
+
+    total_return: compounded return over all bars
+    cagr: compounded annual growth rate (bars per year from periods_per_year)
+    sharpe / sortino: annualised mean excess simple return over its standard deviation /
+        downside deviation
+    max_drawdown: largest peak-to-trough loss of the equity curve (<= 0)
+    max_drawdown_duration: most bars spent below a previous equity peak
+    calmar: cagr / |max_drawdown|
+    hit_rate: share of bars with a non-zero return that were positive (the win rate for
+        strategies booking each trade on its exit bar)
+    exposure: share of bars with a position (non-zero positions, or non-zero returns
+        when no positions are given)
+    """
+
+    NAMES = ('total_return', 'cagr', 'sharpe', 'sortino', 'max_drawdown', 'max_drawdown_duration',
+             'calmar', 'hit_rate', 'exposure')
+    # Metrics where the smaller value ranks higher
+    LOWER_IS_BETTER = ('max_drawdown_duration',)
+
+    @staticmethod
+    def compute(returns, kind, periods_per_year=252, positions=None, risk_free=0.0):
+        """
+        Returns {name: value} for a 1-D series, or {name: array with one value per row}
+        for a 2-D (combos x bars) array. positions (same shape) only feeds 'exposure'.
+        risk_free: annual rate subtracted from the returns for sharpe and sortino.
+        """
+        r = np.asarray(returns, dtype=np.float64)
+        single = r.ndim == 1
+        r = np.atleast_2d(r)
+        stats = Metrics.stats(r, kind, risk_free / periods_per_year)
+        held = None
+        if positions is not None:
+            held = (np.nan_to_num(np.atleast_2d(np.asarray(positions, dtype=np.float64))) != 0).sum(axis=1)
+        out = Metrics.from_stats(stats, r.shape[1], periods_per_year, held)
+        if single:
+            return {name: float(values[0]) for name, values in out.items()}
+        return out
+
+    @staticmethod
+    def stats(returns, kind, rf=0.0):
+        """(rows x len(STATS)) accumulators of a 2-D return array; rf is the per-bar risk-free rate."""
+        if kind not in ('simple', 'log'):
+            raise ValueError(f"kind must be 'simple' or 'log', got {kind!r}")
+        r = np.ascontiguousarray(returns, dtype=np.float64)
+        if HAVE_NUMBA:
+            return _stats_kernel(r, kind == 'log', rf)
+        return Metrics._stats_numpy(r, kind == 'log', rf)
+
+    @staticmethod
+    def _stats_numpy(r, is_log, rf):
+        """Vectorised equivalent of _stats_kernel."""
+        n = r.shape[1]
+        r = np.where(np.isnan(r), 0.0, r)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if is_log:
+                simple, log = np.expm1(r), r
+            else:
+                simple, log = r, np.log1p(r)
+            excess = simple - rf
+
+            cum = np.cumsum(log, axis=1)
+            peak = np.maximum.accumulate(np.maximum(cum, 0.0), axis=1)
+            underwater = cum - peak
+            bars = np.arange(n)
+            last_peak = np.maximum.accumulate(np.where(underwater >= 0, bars, -1), axis=1)
+
+            out = np.empty((len(r), len(STATS)))
+            out[:, 0] = log.sum(axis=1)
+            out[:, 1] = excess.mean(axis=1) if n else np.nan
+            out[:, 2] = simple.var(axis=1, ddof=1) if n > 1 else np.nan
+            out[:, 3] = (np.minimum(excess, 0.0) ** 2).mean(axis=1) if n else np.nan
+            out[:, 4] = np.minimum(underwater.min(axis=1), 0.0) if n else 0.0
+            out[:, 5] = (bars - last_peak).max(axis=1) if n else 0.0
+            out[:, 6] = (simple != 0).sum(axis=1)
+            out[:, 7] = (simple > 0).sum(axis=1)
+        return out
+
+    @staticmethod
+    def from_stats(stats, n_bars, periods_per_year=252, held=None):
+        """{name: array} from STATS rows of n_bars bars; held: bars with a position per row."""
+        growth, mean, variance, downside, worst, longest, active, positive = stats.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cagr = np.expm1(growth * periods_per_year / n_bars) if n_bars else np.full(len(stats), np.nan)
+            std = np.sqrt(variance)
+            downside = np.sqrt(downside)
+            max_drawdown = np.expm1(worst)
+            return {
+                'total_return': np.expm1(growth),
+                'cagr': cagr,
+                'sharpe': np.where(std > 0, mean / std * np.sqrt(periods_per_year), np.nan),
+                'sortino': np.where(downside > 0, mean / downside * np.sqrt(periods_per_year), np.nan),
+                'max_drawdown': max_drawdown,
+                'max_drawdown_duration': longest.astype(np.float64),
+                'calmar': np.where(max_drawdown < 0, cagr / -max_drawdown, np.nan),
+                'hit_rate': np.where(active > 0, positive / active, np.nan),
+                'exposure': (active if held is None else np.asarray(held, dtype=np.float64)) / n_bars
+                            if n_bars else np.zeros(len(stats)),
+            }
+
+    @staticmethod
+    def marked_growth(position, trade_price, close):
+        """
+        Per-bar log growth of a one-unit position marked to market, for strategies that book
+        trades at their own entry/exit prices: a trade moves from its entry price to each close
+        and finally to its exit price, so its bars sum to log(1 + trade return) (longs earn
+        log(exit / entry), shorts log(entry / exit)) and open trades count on every bar.
+        position: side held at each bar's close (0 from the exit bar on, no reversal on one bar);
+        trade_price: the entry price on entry bars and the exit price on exit bars.
+        """
+        position, trade_price, close = (np.asarray(a, dtype=np.float64) for a in (position, trade_price, close))
+        prev = np.concatenate(([0.0], position[:-1]))
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        side = np.where(position != 0, position, prev)
+        # Held into the bar: from the previous close, else from the entry price
+        start = np.where(prev != 0, prev_close, trade_price)
+        # Still held at the close: to the close, else to the exit price
+        end = np.where(position != 0, close, trade_price)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(side != 0, side * np.log(end / start), 0.0)
+
+    @staticmethod
+    def summary(returns, kind, periods_per_year=None, positions=None, risk_free=0.0):
+        """The metrics of one return Series as a Series (bars per year from its index by default)."""
+        if periods_per_year is None:
+            periods_per_year = Metrics.periods_per_year(returns.index)
+        return pd.Series(Metrics.compute(returns, kind, periods_per_year, positions, risk_free))
+
+    @staticmethod
+    def periods_per_year(index, default=252):
+        """Bars per year of a DatetimeIndex, from its first and last timestamps."""
+        if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+            return default
+        years = (index[-1] - index[0]).total_seconds() / (365.25 * 86400)
+        return (len(index) - 1) / years if years > 0 else default
+
+    @staticmethod
+    def check(metric):
+        """Raises for an unknown metric name (None selects the optimizer's default objective)."""
+        if metric is not None and metric not in Metrics.NAMES:
+            raise ValueError(f"Unknown metric '{metric}'. Use one of {list(Metrics.NAMES)}")
+
+    @staticmethod
+    def score(metric, value):
+        """Ranking score of a metric value: higher is better and NaN ranks last (None: the value itself)."""
+        if metric is None:
+            return value
+        if value is None or np.isnan(value):
+            return -np.inf
+        return -value if metric in Metrics.LOWER_IS_BETTER else value
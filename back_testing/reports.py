@@ -0,0 +1,168 @@
+import os
+import re
+import json
+import hashlib
+import tempfile
+from collections import Counter
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from .indicator_cache import IndicatorCache
+
+def _use_agg():
+    """Pool initializer: selects the non-interactive backend before anything imports pyplot."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _render(name, returns, benchmark, path, fmt):
+    """Report task: renders one tear sheet to path (runs in a worker process)."""
+    import matplotlib.pyplot as plt
+    import quantstats as qs
+
+    # Render next to the target under a name of this task's own and rename, so an interrupted
+    # run never leaves a partial report
+    fd, partial = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.partial-', suffix='.' + fmt)
+    os.close(fd)
+    try:
+        if fmt == 'html':
+            qs.reports.html(returns, benchmark=benchmark, output=partial, title=name)
+        else:
+            qs.plots.snapshot(returns, title=name, savefig=partial, show=False)
+    except Exception:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    finally:
+        plt.close('all')
+    os.replace(partial, path)
+    return path
+
+class ReportBatch:
+    """
+    Writes quantstats tear sheets (HTML reports or PNG snapshots) for many
+    (name, returns, benchmark) triples to an output directory, rendered on a process pool
+    with the non-interactive Agg backend.
+    The content hash of each report's inputs (name, returns, benchmark, format and quantstats
+    version) is kept in a manifest in the output directory; reports whose hash is unchanged
+    and whose file still exists are skipped, so reruns only render what changed.
+    """
+
+    MANIFEST = 'reports.json'
+    FORMATS = ('html', 'png')
+
+    def __init__(self, output_dir, fmt='html', kind='simple', workers=None):
+        """
+        fmt: 'html' (full tear sheet) or 'png' (performance snapshot).
+        kind: 'simple' or 'log' returns; log returns are converted to simple ones for quantstats.
+        workers: number of processes (None uses every CPU).
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"fmt must be one of {list(self.FORMATS)}, got {fmt!r}")
+        if kind not in ('simple', 'log'):
+            raise ValueError(f"kind must be 'simple' or 'log', got {kind!r}")
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.kind = kind
+        self.workers = (os.cpu_count() or 1) if workers is None else max(1, int(workers))
+        self.rendered = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def run(self, reports, force=False):
+        """
+        Renders the (name, returns, benchmark) triples (benchmark may be None) and returns
+        {name: report path} for every report that is up to date. force: render all again.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        self.rendered = self.skipped = self.failed = 0
+
+        reports = list(reports)
+        # Names map to files through str(name)
+        counts = Counter(str(name) for name, _, _ in reports)
+        duplicates = sorted(name for name, n in counts.items() if n > 1)
+        if duplicates:
+            raise ValueError(f"Report names must be unique, got duplicates: {duplicates}")
+        
+        paths, todo = {}, []
+        for name, returns, benchmark in reports:
+            returns, benchmark = self._prepare(returns), self._prepare(benchmark)
+            path = os.path.join(self.output_dir, self.filename(name, self.fmt))
+            digest = self.content_hash(name, returns, benchmark, self.fmt)
+            if not force and manifest.get(os.path.basename(path)) == digest and os.path.exists(path):
+                paths[name] = path
+                self.skipped += 1
+            else:
+                todo.append((name, returns, benchmark, path, digest))
+
+        print(f"Reports: {len(todo)} to render, {self.skipped} unchanged")
+        if not todo:
+            return paths
+
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(todo)), initializer=_use_agg) as pool:
+                futures = {pool.submit(_render, name, returns, benchmark, path, self.fmt): (name, path, digest)
+                           for name, returns, benchmark, path, digest in todo}
+                for future in as_completed(futures):
+                    name, path, digest = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Report {name} failed: {e}")
+                        manifest.pop(os.path.basename(path), None)
+                        self.failed += 1
+                        continue
+                    manifest[os.path.basename(path)] = digest
+                    paths[name] = path
+                    self.rendered += 1
+        finally:
+            # Keep the reports finished so far even if the batch is interrupted
+            self._save_manifest(manifest)
+
+        print(f"Reports: {self.rendered} rendered, {self.skipped} unchanged, {self.failed} failed")
+        return paths
+
+    @staticmethod
+    def filename(name, fmt):
+        """
+        Report file name for a report name: characters unsafe in paths replaced, plus a short
+        hash of the name so distinct names (e.g. 'A/1' and 'A_1') never share a file.
+        """
+        digest = hashlib.blake2b(str(name).encode(), digest_size=4).hexdigest()
+        return re.sub(r'[^\w.-]+', '_', str(name)) + f"-{digest}.{fmt}"
+
+    @staticmethod
+    def content_hash(name, returns, benchmark, fmt):
+        """Hash of everything that determines a report's content (the name is its title)."""
+        try:
+            version = metadata.version('quantstats')
+        except metadata.PackageNotFoundError:
+            version = None
+        inputs = [returns] if benchmark is None else [returns, benchmark]
+        return f"{fmt}:{version}:{name}:{benchmark is not None}:{IndicatorCache.fingerprint(*inputs)}"
+
+    def _prepare(self, series):
+        """Simple returns with a DatetimeIndex, as quantstats expects."""
+        if series is None:
+            return None
+        series = pd.Series(series, dtype=np.float64)
+        if not isinstance(series.index, pd.DatetimeIndex):
+            series.index = pd.to_datetime(series.index)
+        return np.expm1(series) if self.kind == 'log' else series
+
+    def _load_manifest(self):
+        path = os.path.join(self.output_dir, self.MANIFEST)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except ValueError:
+            return {}
+
+    def _save_manifest(self, manifest):
+        path = os.path.join(self.output_dir, self.MANIFEST)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(path + '.tmp', path)
@@ -0,0 +1,149 @@
+import os
+import ast
+import json
+import time
+import sqlite3
+import hashlib
+import numpy as np
+from .indicator_cache import IndicatorCache
+
+class ResultStore:
+    """
+    SQLite table of evaluated parameter combinations, so reruns and extended grids only
+    evaluate what is missing. A row is keyed by the strategy, a hash of the code that
+    produced it, a fingerprint of the price data and the parameter tuple, and holds the
+    optimizer's objective value and its full metric vector (JSON).
+    """
+
+    DEFAULT_PATH = os.path.join("data", "results.sqlite")
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " strategy TEXT, code_version TEXT, data_fingerprint TEXT, params TEXT,"
+                " key TEXT, value REAL, metrics TEXT, created REAL,"
+                " PRIMARY KEY (strategy, code_version, data_fingerprint, params))")
+
+    @staticmethod
+    def code_version(source_file):
+        """
+        Hash of source_file and of the package modules it imports, directly or through
+        other package modules (edits elsewhere in the package keep stored results valid).
+        """
+        source_file = os.path.abspath(source_file)
+        top_dir = os.path.dirname(source_file)
+        while os.path.exists(os.path.join(os.path.dirname(top_dir), '__init__.py')):
+            top_dir = os.path.dirname(top_dir)
+        root_dir = os.path.dirname(top_dir)
+        
+        # Step 1: Follow the imports that resolve to files of the package
+        seen, todo = set(), [source_file]
+        while todo:
+            path = todo.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            todo.extend(ResultStore._local_imports(path, top_dir))
+        
+        # Step 2: Hash them in a stable order
+        h = hashlib.blake2b(digest_size=16)
+        for path in sorted(seen):
+            h.update(os.path.relpath(path, root_dir).encode())
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+    @staticmethod
+    def _local_imports(path, top_dir):
+        """Files under top_dir imported by the module at path (relative or absolute imports)."""
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+        # Dotted names, each resolved from a base directory
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names += [(os.path.dirname(top_dir), alias.name) for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    base = os.path.dirname(path)
+                    for _ in range(node.level - 1):
+                        base = os.path.dirname(base)
+                else:
+                    base = os.path.dirname(top_dir)
+                module = node.module or ''
+                names.append((base, module))
+                # from package import module
+                names += [(base, f"{module}.{alias.name}".lstrip('.')) for alias in node.names]
+        
+        found = []
+        for base, name in names:
+            target = os.path.join(base, *name.split('.')) if name else base
+            for candidate in (target + '.py', os.path.join(target, '__init__.py')):
+                if os.path.isfile(candidate) and os.path.commonpath([candidate, top_dir]) == top_dir:
+                    found.append(os.path.abspath(candidate))
+        return found
+
+    @staticmethod
+    def data_fingerprint(df):
+        """Content hash of a price frame (column names, dtypes, values and index)."""
+        names = IndicatorCache.fingerprint(np.array([str(c) for c in df.columns], dtype=object))
+        return names + IndicatorCache.fingerprint(*[df[c] for c in df.columns])
+
+    @staticmethod
+    def params_key(combo):
+        """Canonical text form of a parameter tuple."""
+        return json.dumps([v.item() if isinstance(v, np.generic) else v for v in combo])
+
+    def scope(self, strategy, source_file, data):
+        """
+        The part of the store for one strategy, the code of source_file's package (e.g. the
+        optimizer's __file__) and one data set (see StoreScope).
+        """
+        return StoreScope(self, strategy, self.code_version(source_file), self.data_fingerprint(data))
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+class StoreScope:
+    """Lookups and inserts for one (strategy, code version, data fingerprint)."""
+
+    def __init__(self, store, strategy, code_version, data_fingerprint):
+        self.store = store
+        self.strategy = strategy
+        self.code_version = code_version
+        self.data_fingerprint = data_fingerprint
+
+    def lookup(self, combos):
+        """{combo: (key, value, metrics)} for the combinations already in the store."""
+        rows = self.store._conn.execute(
+            "SELECT params, key, value, metrics FROM results"
+            " WHERE strategy = ? AND code_version = ? AND data_fingerprint = ?",
+            (self.strategy, self.code_version, self.data_fingerprint))
+        # Values come back as np.float64, as the optimizers return them
+        stored = {params: (key, np.float64(np.nan if value is None else value),
+                           {k: np.float64(v) for k, v in json.loads(metrics).items()})
+                  for params, key, value, metrics in rows}
+        found = {}
+        for combo in combos:
+            params = ResultStore.params_key(combo)
+            if params in stored:
+                found[combo] = stored[params]
+        return found
+
+    def save(self, items):
+        """Stores [(combo, key, value, metrics)] in one transaction."""
+        now = time.time()
+        rows = [(self.strategy, self.code_version, self.data_fingerprint, ResultStore.params_key(combo),
+                 key, float(value), json.dumps({k: float(v) for k, v in metrics.items()}), now)
+                for combo, key, value, metrics in items]
+        with self.store._conn:
+            self.store._conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
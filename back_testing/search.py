@@ -0,0 +1,236 @@
+import abc
+import math
+import numpy as np
+from .sweep import SweepRunner
+from .metrics import Metrics
+
+class SearchStrategy(abc.ABC):
+    """
+    Decides which combinations of a parameter grid an optimizer evaluates.
+    run() takes the optimizer's chunk evaluator, evaluate(data, combos, **kwargs) ->
+    [(key, value, metrics)] (higher value is better), and returns [(combo, key, value,
+    metrics)] for the combinations evaluated on the full history, in the order they were
+    evaluated. Every evaluation is recorded in self.history; self.cost counts them in
+    units of full-history evaluations. Full-history evaluations found in the result
+    store (if given) are counted in self.hits and cost nothing.
+    metric: rank on metrics[metric] (one of Metrics.NAMES, see Metrics.score) instead of
+    the value.
+    The seed makes a search reproducible.
+    """
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.history = []
+        self.cost = 0.0
+        self.hits = 0
+
+    def run(self, evaluate, data, combos, runner=None, store=None, metric=None, **kwargs):
+        Metrics.check(metric)
+        self.metric = metric
+        self.history = []
+        self.cost = 0.0
+        self.hits = 0
+        self._evaluate = evaluate
+        self._runner = runner or SweepRunner()
+        self._store = store
+        self._kwargs = kwargs
+        self.rng = np.random.default_rng(self.seed)
+        combos = list(combos)
+
+        if not combos:
+            return []
+        chosen = self.search(data, combos)
+
+        n_full = sum(1 for record in self.history if record['fraction'] == 1.0)
+        print(f"{type(self).__name__}: {len(self.history)} evaluations "
+              f"({n_full} on the full history, cost {self.cost:.1f} of {len(combos)} for the grid)")
+        return chosen
+
+    @abc.abstractmethod
+    def search(self, data, combos):
+        """Implemented by subclasses; returns [(combo, key, value, metrics)] evaluated on the full data."""
+
+    def evaluate(self, data, combos, indices, fraction=1.0):
+        """Evaluates combos[indices] on the trailing 'fraction' of data and returns their values."""
+        if not len(indices):
+            return []
+        chosen = [combos[i] for i in indices]
+        if fraction >= 1.0 and self._store is not None:
+            items = [item for part in self._runner.sweep(self._evaluate, data, chosen, store=self._store,
+                                                         **self._kwargs) for item in part]
+            hits = self._runner.hits
+        else:
+            rows = len(data) if fraction >= 1.0 else max(1, math.ceil(len(data) * fraction))
+            subset = data.iloc[len(data) - rows:]
+            items = [(combo,) + tuple(result) for combo, result in
+                     zip(chosen, self._runner.run(self._evaluate, subset, chosen, **self._kwargs))]
+            hits = 0
+
+        results = []
+        for combo, key, value, metrics in items:
+            value = float(value)
+            self.history.append({'combo': combo, 'key': key, 'fraction': fraction, 'value': value})
+            results.append((combo, key, value, metrics))
+        self.hits += hits
+        self.cost += fraction * (len(indices) - hits)
+        return results
+
+    def score(self, result):
+        """
+        Ranking score of an evaluated (combo, key, value, metrics): the value, or metrics[metric]
+        scored by Metrics.score. NaN (e.g. a window longer than the slice) ranks last.
+        """
+        _, _, value, metrics = result
+        score = Metrics.score(self.metric, value if self.metric is None else metrics[self.metric])
+        return -np.inf if np.isnan(score) else score
+
+class GridSearch(SearchStrategy):
+    """Evaluates every combination (what the optimizers do without a search strategy)."""
+
+    def search(self, data, combos):
+        return self.evaluate(data, combos, list(range(len(combos))))
+
+class RandomSearch(SearchStrategy):
+    """Evaluates n_iter combinations drawn without replacement."""
+
+    def __init__(self, n_iter=50, seed=0):
+        super().__init__(seed)
+        self.n_iter = n_iter
+
+    def search(self, data, combos):
+        n = min(self.n_iter, len(combos))
+        indices = np.sort(self.rng.choice(len(combos), size=n, replace=False))
+        return self.evaluate(data, combos, indices.tolist())
+
+class SuccessiveHalving(SearchStrategy):
+    """
+    Evaluates many candidates on a short recent slice of the history, keeps the best
+    1/eta of them for a slice eta times longer, and so on up to the full history.
+    n_candidates: start from a random sample of the grid (default: the whole grid).
+    min_fraction: the shortest slice, as a fraction of the history. It has to leave room
+    for the longest indicator window and then some, or those candidates score NaN (or on too
+    few trades) and are dropped.
+    Grids of fewer than eta**2 candidates are evaluated in full: one halving would save
+    little and risks dropping the optimum on a short slice.
+    """
+
+    def __init__(self, eta=2, min_fraction=0.25, n_candidates=None, seed=0):
+        super().__init__(seed)
+        if eta < 2:
+            raise ValueError(f"eta must be >= 2, got {eta}")
+        self.eta = eta
+        self.min_fraction = min_fraction
+        self.n_candidates = n_candidates
+
+    def search(self, data, combos):
+        if self.n_candidates is not None and self.n_candidates < len(combos):
+            candidates = np.sort(self.rng.choice(len(combos), size=self.n_candidates, replace=False)).tolist()
+        else:
+            candidates = list(range(len(combos)))
+
+        # Number of halvings, limited by the number of candidates and by the shortest slice
+        rungs = int(math.floor(math.log(len(candidates)) / math.log(self.eta) + 1e-9))
+        rungs = min(rungs, int(math.floor(math.log(1 / self.min_fraction) / math.log(self.eta) + 1e-9)))
+        if len(candidates) < self.eta ** 2:
+            rungs = 0
+
+        for rung in range(rungs):
+            fraction = float(self.eta) ** (rung - rungs)
+            results = self.evaluate(data, combos, candidates, fraction)
+            keep = max(1, len(candidates) // self.eta)
+            # Stable ranking: ties keep grid order
+            order = sorted(range(len(results)), key=lambda j: -self.score(results[j]))
+            candidates = sorted(candidates[j] for j in order[:keep])
+
+        return self.evaluate(data, combos, candidates)
+
+class TPESearch(SearchStrategy):
+    """
+    Tree-structured Parzen Estimator over the grid. After n_startup random combinations,
+    the evaluated ones are split into the best 'gamma' fraction and the rest, and a
+    per-parameter Parzen density is fitted to each group (over the value's position for
+    numeric parameters, per value otherwise). Each new combination is the one maximising
+    l(x)/g(x) among n_ei_candidates drawn from the density of the best group.
+    batch_size combinations are proposed per round (default: one per worker).
+    """
+
+    def __init__(self, n_iter=50, n_startup=10, gamma=0.25, n_ei_candidates=24, batch_size=None, seed=0):
+        super().__init__(seed)
+        self.n_iter = n_iter
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+        self.batch_size = batch_size
+
+    def search(self, data, combos):
+        n_iter = min(self.n_iter, len(combos))
+        batch_size = self.batch_size or self._runner.workers
+
+        # Position of every combination's value along each parameter
+        dims = []
+        for values in zip(*combos):
+            levels = list(dict.fromkeys(values))
+            numeric = all(isinstance(v, (int, float, np.number)) for v in levels)
+            if numeric:
+                levels = sorted(levels)
+            position = {v: k for k, v in enumerate(levels)}
+            dims.append((len(levels), numeric, np.array([position[v] for v in values])))
+
+        startup = min(self.n_startup, n_iter)
+        indices = np.sort(self.rng.choice(len(combos), size=startup, replace=False)).tolist()
+        results = self.evaluate(data, combos, indices)
+        evaluated = dict(zip(indices, (self.score(r) for r in results)))
+
+        while len(evaluated) < n_iter:
+            batch = []
+            for _ in range(min(batch_size, n_iter - len(evaluated))):
+                batch.append(self._propose(dims, evaluated, set(batch)))
+            results += self.evaluate(data, combos, batch)
+            evaluated.update(zip(batch, (self.score(r) for r in results[-len(batch):])))
+        return results
+
+    def _density(self, dims, members):
+        """Per-parameter Parzen weights over the value positions, from the given grid indices."""
+        densities = []
+        for n_levels, numeric, positions in dims:
+            weights = np.ones(n_levels)  # uniform prior
+            observed = positions[members]
+            if numeric:
+                bandwidth = max(1.0, n_levels / 10)
+                grid = np.arange(n_levels)
+                for p in observed:
+                    weights += np.exp(-0.5 * ((grid - p) / bandwidth) ** 2)
+            else:
+                np.add.at(weights, observed, 1.0)
+            densities.append(weights / weights.sum())
+        return densities
+
+    def _propose(self, dims, evaluated, pending):
+        """Next grid index to evaluate."""
+        done = np.array(list(evaluated))
+        scores = np.array([evaluated[i] for i in done])
+        n_good = max(1, int(math.ceil(self.gamma * len(done))))
+        order = np.argsort(-scores, kind='stable')
+        good = self._density(dims, done[order[:n_good]])
+        bad = self._density(dims, done[order[n_good:]])
+
+        # Draw candidates from l(x), snapped to combinations that exist in the grid
+        draws = np.stack([self.rng.choice(len(l), size=self.n_ei_candidates, p=l) for l in good], axis=1)
+        grid_positions = np.stack([positions for _, _, positions in dims], axis=1)
+        best, best_ratio = None, -np.inf
+        for draw in draws:
+            distance = np.abs(grid_positions - draw).sum(axis=1)
+            for i in np.argsort(distance, kind='stable'):
+                if i not in evaluated and i not in pending:
+                    break
+            else:
+                continue
+            position = grid_positions[i]
+            ratio = sum(np.log(l[p]) - np.log(g[p]) for l, g, p in zip(good, bad, position))
+            if ratio > best_ratio:
+                best, best_ratio = int(i), ratio
+
+        if best is None:
+            remaining = [i for i in range(len(grid_positions)) if i not in evaluated and i not in pending]
+            best = int(self.rng.choice(remaining))
+        return best
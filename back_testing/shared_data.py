@@ -0,0 +1,210 @@
+import os
+import mmap
+import uuid
+import tempfile
+import weakref
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+class _Segment:
+    """
+    One shared buffer: a multiprocessing.shared_memory block or a memory-mapped file.
+    NumPy views over it keep the mapping object alive but do not pin it, so closing it
+    would unmap pages they still point to. The segment therefore counts its live views
+    and closes the mapping only once it has been released and the last view is gone.
+    """
+
+    def __init__(self, backend, name, size=0, create=False):
+        self.backend = backend
+        self.name = name
+        self.owner = create
+        self._views = 0
+        self._released = False
+        if backend == 'shm':
+            self._shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+            self.name = self._shm.name
+            self.buf = self._shm.buf
+        elif backend == 'mmap':
+            if create:
+                with open(name, 'wb') as f:
+                    f.truncate(size)
+            with open(name, 'r+b' if create else 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if create else mmap.ACCESS_READ)
+            self.buf = self._mmap
+        else:
+            raise ValueError(f"Unknown backend '{backend}'. Use 'shm' or 'mmap'")
+
+    def view(self, shape, dtype, offset, writeable=False):
+        """A NumPy view of the buffer, counted until it is garbage collected."""
+        if self.buf is None:
+            raise ValueError("DataPlane is closed")
+        values = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.buf, offset=offset)
+        values.flags.writeable = writeable
+        self._views += 1
+        weakref.finalize(values, self._drop_view)
+        return values
+
+    def _drop_view(self):
+        self._views -= 1
+        if self._released and self._views == 0:
+            self._close()
+
+    def _close(self):
+        if self.backend == 'shm':
+            self._shm.close()
+        else:
+            self._mmap.close()
+
+    def release(self):
+        """Stops new views, deletes the segment for the owner and closes it once no view is left."""
+        if self._released:
+            return
+        self._released = True
+        if self.owner:
+            self.owner = False
+            try:
+                if self.backend == 'shm':
+                    self._shm.unlink()
+                else:
+                    os.remove(self.name)
+            except FileNotFoundError:
+                pass
+        # Existing views keep working; the last one to go closes the mapping
+        self.buf = None
+        if self._views == 0:
+            self._close()
+
+class DataPlane:
+    """
+    Read-only OHLCV data for many symbols in one shared segment, so worker processes
+    read the same physical pages instead of each receiving a pickled DataFrame.
+    The publishing process copies the frames in once (publish) and owns the segment;
+    workers attach with the small, picklable handle. Attaching maps the segment and
+    nothing else, whatever the number of symbols: arrays()/frame() build NumPy views or
+    DataFrames over the shared pages on demand, without copying.
+    backend='shm' uses multiprocessing.shared_memory, 'mmap' a memory-mapped file
+    (in 'directory', e.g. a local disk when /dev/shm is small). The owner removes the
+    segment on close(), when leaving the 'with' block, or at interpreter exit.
+    Only numeric, bool and datetime columns can be shared.
+    """
+
+    ALIGN = 64
+
+    def __init__(self, segment, handle):
+        self._segment = segment
+        self.handle = handle
+        self._finalizer = weakref.finalize(self, segment.release)
+
+    @classmethod
+    def publish(cls, frames, backend='shm', directory=None):
+        """Copies {symbol: DataFrame} into a new segment and returns the owning DataPlane."""
+        layouts, arrays, size = {}, [], 0
+        for symbol, df in frames.items():
+            index_info, index_values = cls._index_values(df.index)
+            layout = {'rows': len(df), 'attrs': dict(df.attrs), 'columns': []}
+
+            # Lay the arrays out back to back, each aligned to ALIGN bytes
+            for col, values in [(None, index_values)] + [(col, df[col].to_numpy()) for col in df.columns]:
+                if values.dtype.kind not in 'biufcmM':
+                    raise TypeError(f"Column '{col}' of {symbol} has dtype {values.dtype} and cannot be shared; "
+                                    f"only numeric, bool and datetime columns are supported")
+                values = np.ascontiguousarray(values)
+                arrays.append((values, size))
+                if col is None:
+                    layout['index'] = index_info + (values.dtype.str, size)
+                else:
+                    layout['columns'].append((col, values.dtype.str, size))
+                size += -(-values.nbytes // cls.ALIGN) * cls.ALIGN
+            layouts[symbol] = layout
+
+        if backend == 'mmap':
+            name = os.path.join(directory or tempfile.gettempdir(), f"dataplane_{uuid.uuid4().hex}.bin")
+        else:
+            name = None
+        segment = _Segment(backend, name, size=max(size, 1), create=True)
+        try:
+            for values, offset in arrays:
+                segment.view(values.shape, values.dtype, offset, writeable=True)[:] = values
+        except BaseException:
+            segment.release()
+            raise
+
+        handle = {'backend': backend, 'name': segment.name, 'nbytes': size, 'symbols': layouts}
+        return cls(segment, handle)
+
+    @classmethod
+    def attach(cls, handle):
+        """Maps a segment published by another process (constant time, no copies)."""
+        return cls(_Segment(handle['backend'], handle['name']), handle)
+
+    @staticmethod
+    def _index_values(index):
+        """The index as a plain array (tz-aware datetimes as naive UTC) and how to rebuild it."""
+        if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+            return (index.name, str(index.tz)), index.tz_convert('UTC').tz_localize(None).values
+        return (index.name, None), index.to_numpy()
+
+    @property
+    def owner(self):
+        return self._segment.owner
+
+    @property
+    def symbols(self):
+        return list(self.handle['symbols'])
+
+    @property
+    def nbytes(self):
+        return self.handle['nbytes']
+
+    def __contains__(self, symbol):
+        return symbol in self.handle['symbols']
+
+    def __len__(self):
+        return len(self.handle['symbols'])
+
+    def _view(self, rows, dtype, offset):
+        return self._segment.view((rows,), dtype, offset)
+
+    def arrays(self, symbol):
+        """Read-only NumPy views of a symbol's columns, plus its index under 'index'."""
+        layout = self.handle['symbols'][symbol]
+        rows = layout['rows']
+        out = {'index': self._view(rows, *layout['index'][2:])}
+        for col, dtype, offset in layout['columns']:
+            out[col] = self._view(rows, dtype, offset)
+        return out
+
+    def frame(self, symbol):
+        """
+        A symbol's data as a DataFrame of read-only views (no copy). A tz-aware index is
+        re-localized, which copies the index only.
+        """
+        layout = self.handle['symbols'][symbol]
+        name, tz = layout['index'][:2]
+        columns = self.arrays(symbol)
+        values = columns.pop('index')
+        if values.dtype.kind == 'M':
+            index = pd.DatetimeIndex(values, copy=False, name=name)
+            if tz is not None:
+                index = index.tz_localize('UTC').tz_convert(tz)
+        else:
+            index = pd.Index(values, copy=False, name=name)
+
+        df = pd.DataFrame(columns, index=index, copy=False)
+        df.attrs.update(layout['attrs'])
+        return df
+
+    def frames(self, symbols=None):
+        """{symbol: DataFrame} views for the given (default: all) symbols."""
+        return {s: self.frame(s) for s in (self.symbols if symbols is None else symbols)}
+
+    def close(self):
+        """Detaches from the segment; the owner also deletes it."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
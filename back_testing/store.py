@@ -0,0 +1,312 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+class ColumnStore:
+    """Stores a time-indexed DataFrame as one .npy file per column plus a JSON meta file."""
+
+    FORMAT_VERSION = 1
+    META_FILE = 'meta.json'
+    INDEX_FILE = 'index.npy'
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def source_signature(source_path):
+        """Returns the mtime/size pair used to detect a changed source file."""
+        stat = os.stat(source_path)
+        return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def read_meta(self):
+        """Returns the stored meta dict, or None if nothing has been written yet."""
+        meta_path = os.path.join(self.path, self.META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, source_path):
+        """True if the store was written from the current version of source_path."""
+        meta = self.read_meta()
+        if meta is None or meta.get('version') != self.FORMAT_VERSION:
+            return False
+        return meta.get('source') == self.source_signature(source_path)
+
+    def write(self, df, source_path=None):
+        """Writes the frame column by column. The meta file is written last and marks the store valid."""
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, self.META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        # Timestamps are stored naive (UTC for tz-aware indexes) with the zone kept in meta
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else None
+        if tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        np.save(os.path.join(self.path, self.INDEX_FILE), index.values)
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            file_name = f'col_{i:03d}.npy'
+            values = df[col].to_numpy()
+            np.save(os.path.join(self.path, file_name), values, allow_pickle=values.dtype == object)
+            columns.append({'name': col, 'file': file_name, 'dtype': str(values.dtype)})
+
+        meta = {
+            'version': self.FORMAT_VERSION,
+            'index_name': df.index.name,
+            'tz': tz,
+            'rows': len(df),
+            'columns': columns,
+            'source': self.source_signature(source_path) if source_path else None,
+        }
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _index_array(self):
+        return np.load(os.path.join(self.path, self.INDEX_FILE), mmap_mode='r')
+
+    def _to_index(self, values, tz):
+        index = pd.DatetimeIndex(values)
+        if tz is not None:
+            index = index.tz_localize('UTC').tz_convert(tz)
+        return index
+
+    def _to_stored_time(self, ts, tz):
+        """Converts a start/end bound to the naive (UTC) datetime64 used in index.npy."""
+        ts = pd.Timestamp(ts)
+        if tz is not None:
+            ts = ts.tz_localize(tz) if ts.tzinfo is None else ts
+            ts = ts.tz_convert('UTC').tz_localize(None)
+        return ts.to_datetime64()
+
+    def time_range(self):
+        """Returns the first and last timestamp without loading the columns."""
+        meta = self.read_meta()
+        index = self._index_array()
+        if len(index) == 0:
+            return pd.NaT, pd.NaT
+        bounds = self._to_index(np.asarray(index[[0, -1]]), meta['tz'])
+        return bounds[0], bounds[1]
+
+    def locate(self, start=None, end=None):
+        """
+        Returns the (lo, hi) row positions covering start <= t <= end.
+        The index is memory-mapped and binary searched, so only a few pages are touched.
+        """
+        meta = self.read_meta()
+        index = self._index_array()
+        lo = 0 if start is None else int(np.searchsorted(index, self._to_stored_time(start, meta['tz']), side='left'))
+        hi = len(index) if end is None else int(np.searchsorted(index, self._to_stored_time(end, meta['tz']), side='right'))
+        return lo, max(lo, hi)
+
+    def read(self, start=None, end=None, mmap=False):
+        """
+        Loads the stored frame, optionally only the rows between start and end (inclusive).
+        The row range is found by binary search and each column is copied once, so the cost
+        follows the size of the window. With mmap=True the columns stay backed by the .npy files
+        (read-only: replace a column rather than writing into it).
+        """
+        lo, hi = self.locate(start, end)
+        return self.read_rows(lo, hi, mmap=mmap)
+
+    def read_rows(self, lo, hi, mmap=False):
+        """Loads rows lo:hi by position."""
+        meta = self.read_meta()
+        if meta is None:
+            raise FileNotFoundError(f"No column store at {self.path}")
+
+        take = (lambda a: a[lo:hi]) if mmap else (lambda a: np.array(a[lo:hi]))
+        index = take(self._index_array())
+        data = {}
+        for col in meta['columns']:
+            is_object = col['dtype'] == 'object'
+            values = np.load(os.path.join(self.path, col['file']),
+                             mmap_mode=None if is_object else 'r',
+                             allow_pickle=is_object)
+            data[col['name']] = take(values)
+
+        index = self._to_index(index, meta['tz']).rename(meta['index_name'])
+        # copy=False: with mmap the columns stay views on the .npy files instead of being read into RAM
+        return pd.DataFrame(data, index=index, columns=[c['name'] for c in meta['columns']], copy=False)
+
+    def write_chunks(self, chunks, source_path=None, block_rows=1_000_000):
+        """
+        Writes a frame that arrives as an iterable of chunks without holding it in memory.
+        Each chunk's columns are spilled to temporary .npy files and concatenated into the
+        final files afterwards. If the chunks were not in chronological order the rows are
+        reordered with a stable argsort of the timestamps, one column at a time.
+        Only numeric and datetime columns are supported.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, self.META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        names, index_name, tz = None, None, None
+        parts, dtypes = [], None
+        rows, last, ordered = 0, None, True
+        for k, chunk in enumerate(chunks):
+            if names is None:
+                names = list(chunk.columns)
+                index_name = chunk.index.name
+                tz = str(chunk.index.tz) if getattr(chunk.index, 'tz', None) is not None else None
+                dtypes = [[] for _ in names]
+            if list(chunk.columns) != names:
+                raise ValueError(f"Chunk {k} columns {list(chunk.columns)} differ from {names}")
+
+            index = pd.DatetimeIndex(chunk.index)
+            if tz is not None:
+                index = index.tz_convert('UTC').tz_localize(None)
+            index = index.values.astype('datetime64[ns]')
+            if len(index) == 0:
+                continue
+            if not (index[1:] >= index[:-1]).all() or (last is not None and index[0] < last):
+                ordered = False
+            last = index[-1]
+
+            np.save(os.path.join(self.path, f'tmp_{k}_index.npy'), index)
+            for i, col in enumerate(names):
+                values = chunk[col].to_numpy()
+                if values.dtype == object:
+                    raise ValueError(f"Column '{col}' is not numeric and cannot be streamed")
+                dtypes[i].append(values.dtype)
+                np.save(os.path.join(self.path, f'tmp_{k}_col_{i:03d}.npy'), values)
+            parts.append(k)
+            rows += len(index)
+
+        names = names or []
+        order = None
+        if not ordered:
+            order = np.argsort(self._concat_parts(parts, 'index', np.dtype('datetime64[ns]'), rows), kind='stable')
+        self._finalize_column(parts, 'index', np.dtype('datetime64[ns]'), rows, self.INDEX_FILE, order, block_rows)
+
+        columns = []
+        for i, col in enumerate(names):
+            file_name = f'col_{i:03d}.npy'
+            dtype = np.result_type(*dtypes[i]) if dtypes[i] else np.dtype('float64')
+            self._finalize_column(parts, f'col_{i:03d}', dtype, rows, file_name, order, block_rows)
+            columns.append({'name': col, 'file': file_name, 'dtype': str(dtype)})
+
+        meta = {
+            'version': self.FORMAT_VERSION,
+            'index_name': index_name,
+            'tz': tz,
+            'rows': rows,
+            'columns': columns,
+            'source': self.source_signature(source_path) if source_path else None,
+        }
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _concat_parts(self, parts, name, dtype, rows):
+        """Returns the spilled chunk files of one column concatenated in arrival order."""
+        out = np.empty(rows, dtype=dtype)
+        pos = 0
+        for k in parts:
+            values = np.load(os.path.join(self.path, f'tmp_{k}_{name}.npy'), mmap_mode='r')
+            out[pos:pos + len(values)] = values
+            pos += len(values)
+        return out
+
+    def _finalize_column(self, parts, name, dtype, rows, file_name, order, block_rows):
+        """Writes one column's final .npy from its spilled chunks, applying the sort order if given."""
+        path = os.path.join(self.path, file_name)
+        out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(rows,))
+        if order is None:
+            pos = 0
+            for k in parts:
+                values = np.load(os.path.join(self.path, f'tmp_{k}_{name}.npy'), mmap_mode='r')
+                out[pos:pos + len(values)] = values
+                pos += len(values)
+        else:
+            unsorted = self._concat_parts(parts, name, dtype, rows)
+            for b in range(0, rows, block_rows):
+                out[b:b + block_rows] = unsorted[order[b:b + block_rows]]
+            del unsorted
+        out.flush()
+        del out
+        for k in parts:
+            os.remove(os.path.join(self.path, f'tmp_{k}_{name}.npy'))
+
+class PriceStore:
+    """Symbol-partitioned price store: one ColumnStore folder per symbol plus a manifest index."""
+
+    MANIFEST_FILE = 'manifest.json'
+
+    def __init__(self, root=os.path.join("data", "store")):
+        self.root = root
+        self._manifest = None
+
+    def manifest(self):
+        """Returns {symbol: {'path', 'start', 'end', 'rows'}}, read from disk once per instance."""
+        if self._manifest is None:
+            manifest_path = os.path.join(self.root, self.MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                with open(manifest_path) as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {}
+        return self._manifest
+
+    def symbols(self):
+        return sorted(self.manifest())
+
+    def __contains__(self, symbol):
+        return symbol in self.manifest()
+
+    def symbol_store(self, symbol):
+        """Returns the ColumnStore holding a single symbol's partition."""
+        entry = self.manifest().get(symbol)
+        folder = entry['path'] if entry else symbol.replace(os.sep, '_')
+        return ColumnStore(os.path.join(self.root, folder))
+
+    def write(self, symbol, df):
+        """Writes (or replaces) one symbol's partition and updates the manifest."""
+        self.write_many({symbol: df})
+
+    def write_many(self, frames):
+        """Writes several symbol partitions and saves the manifest once at the end."""
+        manifest = self.manifest()
+        for symbol, df in frames.items():
+            folder = symbol.replace(os.sep, '_')
+            ColumnStore(os.path.join(self.root, folder)).write(df)
+            manifest[symbol] = {
+                'path': folder,
+                'start': str(df.index.min()) if len(df) else None,
+                'end': str(df.index.max()) if len(df) else None,
+                'rows': len(df),
+            }
+        self._save_manifest()
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        manifest_path = os.path.join(self.root, self.MANIFEST_FILE)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest(), f, indent=1, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+    def load(self, symbol, start=None, end=None, mmap=False):
+        """Loads one symbol's rows between start and end. Only that symbol's files are read."""
+        if symbol not in self:
+            raise KeyError(f"Symbol {symbol} not found in price store {self.root}")
+        return self.symbol_store(symbol).read(start=start, end=end, mmap=mmap)
+
+    def load_many(self, symbols=None, start=None, end=None, mmap=True):
+        """Loads several symbols (all by default) as a {symbol: DataFrame} dict."""
+        symbols = self.symbols() if symbols is None else symbols
+        missing = [s for s in symbols if s not in self]
+        if missing:
+            raise KeyError(f"Symbols not found in price store {self.root}: {missing}")
+        return {s: self.symbol_store(s).read(start=start, end=end, mmap=mmap) for s in symbols}
@@ -1,33 +1,47 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import quantstats as qs
+from ..downsample import Downsample
 
 class Backtester:
     """Performance analysis and visualization for RSI strategy."""
 
-    def plot_rsi_signals(self, data, rsi_lower=30, rsi_upper=70):
-        """Visualizes the strategy with position overlaid on RSI."""
+    def plot_rsi_signals(self, data, rsi_lower=30, rsi_upper=70, downsample=True):
+        """
+        Visualizes the strategy with position overlaid on RSI.
+        downsample: draw about as many points as the figure has pixels (position changes stay exact).
+        """
+        import matplotlib.pyplot as plt
         n = data.shape[0]
-        plt.figure(figsize=(15, 7))
-        y = data['RSI'].plot()
+        fig = plt.figure(figsize=(15, 7))
+        rsi, rsi_signal = data['RSI'], data['RSI_signal']
+        if downsample:
+            width = Downsample.pixels(fig)
+            rsi = Downsample.curve(rsi, width)
+            rsi_signal = Downsample.steps(rsi_signal, width)
+        y = rsi.plot()
         
         # Draw thresholds
         plt.axhline(y=rsi_lower, color='r', linestyle='--')
         plt.axhline(y=rsi_upper, color='g', linestyle='--')
         
         # Plot position
-        data['RSI_signal'].plot(ax=y, secondary_y='position', alpha=0.3, label='Position')
+        rsi_signal.plot(ax=y, secondary_y='position', alpha=0.3, label='Position')
         
         plt.title('RSI Strategy: RSI and Signal Positions')
         plt.show()
 
-    def plot_cumulative_returns(self, data):
-        """Plots cumulative returns of the strategy."""
+    def plot_cumulative_returns(self, data, downsample=True):
+        """
+        Plots cumulative returns of the strategy.
+        downsample: draw about as many points as the figure has pixels.
+        """
+        import matplotlib.pyplot as plt
         # Using simple exp(cumsum) for log returns
         cum_ret = data['strategy_returns'].cumsum().apply(np.exp)
         
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
+        if downsample:
+            cum_ret = Downsample.curve(cum_ret, Downsample.pixels(fig))
         cum_ret.plot()
         plt.title('Cumulative Strategy Returns (Exp)')
         plt.ylabel('Growth')
@@ -35,6 +49,7 @@ class Backtester:
 
     def generate_report(self, returns, benchmark=None):
         """Generates full quantstats report."""
+        import quantstats as qs
         # Ensure returns is a Series and has a DatetimeIndex for quantstats
         if not isinstance(returns.index, pd.DatetimeIndex):
             returns.index = pd.to_datetime(returns.index)
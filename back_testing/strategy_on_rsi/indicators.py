@@ -1,5 +1,8 @@
 import pandas as pd
 import numpy as np
+from ..compact import CompactMode
+from ..indicator_cache import default_cache
+from ..wilder import WilderEngine
 
 class IndicatorManager:
     """Handles technical indicator calculations, specifically RSI."""
@@ -16,22 +19,42 @@ class IndicatorManager:
         if close_col not in data.columns:
             raise KeyError(f"Close column not found. Available: {list(data.columns)}")
             
-        # Calculate price changes
-        delta = data[close_col].diff()
-        
-        # Separate gains and losses
-        gain = (delta.where(delta > 0, 0))
-        loss = (-delta.where(delta < 0, 0))
-        
-        # Calculate Exponential Moving Average (Wilder's version)
-        # alpha = 1 / period
-        avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+        def compute():
+            # Calculate price changes
+            delta = data[close_col].diff()
+            
+            # Separate gains and losses
+            gain = (delta.where(delta > 0, 0))
+            loss = (-delta.where(delta < 0, 0))
+            
+            # Calculate Exponential Moving Average (Wilder's version)
+            # alpha = 1 / period
+            avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+            avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+            
+            rs = avg_gain / avg_loss
+            return CompactMode.as_float(data, 100 - (100 / (1 + rs)))
         
-        rs = avg_gain / avg_loss
-        data['RSI'] = 100 - (100 / (1 + rs))
+        data['RSI'] = default_cache.compute('rsi', (period,), [df[close_col]], compute)
         
         # Drop NaN values generated by RSI calculation
         data.dropna(subset=['RSI'], inplace=True)
         
         return data
+
+    def calculate_rsi_bank(self, df, periods=(14,)):
+        """
+        RSI for every period in one pass over the price changes (see WilderEngine).
+        Returns a (periods x bars) array aligned with df; row i equals calculate_rsi's
+        RSI column for periods[i] before its NaN warm-up rows are dropped.
+        """
+        close_col = 'Close' if 'Close' in df.columns else 'close'
+        
+        if close_col not in df.columns:
+            raise KeyError(f"Close column not found. Available: {list(df.columns)}")
+        
+        periods = tuple(int(p) for p in periods)
+        close = df[close_col]
+        return default_cache.compute(
+            'rsi_bank', periods, [close],
+            lambda: WilderEngine.rsi(close.to_numpy(), periods).astype(CompactMode.float_dtype(df), copy=False))
@@ -3,23 +3,14 @@ from back_testing.strategy_on_rsi.indicators import IndicatorManager
 from back_testing.strategy_on_rsi.strategy import RSIStrategy
 from back_testing.strategy_on_rsi.backtester import Backtester
 import numpy as np
-import importlib
-import back_testing.data
 
 def run_backtest(symbol='SPY', start_date='2010-02-25', end_date='2020-02-25', 
                  rsi_period=14, rsi_lower=30, rsi_upper=70, 
-                 tp_level=0.05, sl_level=0.02):
-    """Orchestrates the RSI backtesting workflow."""
-    
-    # Force reload of modules to catch updates
-    import back_testing.data
-    import back_testing.strategy_on_rsi.indicators
-    import back_testing.strategy_on_rsi.strategy
-    import back_testing.strategy_on_rsi.backtester
-    importlib.reload(back_testing.data)
-    importlib.reload(back_testing.strategy_on_rsi.indicators)
-    importlib.reload(back_testing.strategy_on_rsi.strategy)
-    importlib.reload(back_testing.strategy_on_rsi.backtester)
+                 tp_level=0.05, sl_level=0.02, headless=False):
+    """
+    Orchestrates the RSI backtesting workflow.
+    headless: skip the charts and the quantstats report (for batch jobs and workers).
+    """
     
     # Initialize components
     loader = DataLoader()
@@ -57,6 +48,9 @@ def run_backtest(symbol='SPY', start_date='2010-02-25', end_date='2020-02-25',
     total_ret = np.exp(data_backtested['strategy_returns'].sum())
     print(f'Total return from this strategy: {np.round(total_ret, 4)}')
     
+    if headless:
+        return data_backtested
+    
     # Step 4: Visualizations
     backtester.plot_rsi_signals(data_backtested, rsi_lower, rsi_upper)
     backtester.plot_cumulative_returns(data_backtested)
@@ -64,6 +58,7 @@ def run_backtest(symbol='SPY', start_date='2010-02-25', end_date='2020-02-25',
     # Step 5: Quantstats Report
     # Using 'daily_log_returns' as benchmark
     backtester.generate_report(data_backtested['strategy_returns'], benchmark=data_backtested['daily_log_returns'])
+    return data_backtested
 
 if __name__ == "__main__":
     run_backtest()
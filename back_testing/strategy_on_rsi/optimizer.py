@@ -2,6 +2,21 @@ from .strategy import RSIStrategy
 from .indicators import IndicatorManager
 from ..data import DataLoader
 import numpy as np
+from ..indicator_cache import default_cache
+from ..sweep import SweepRunner
+from ..walk_forward import WalkForward
+from ..metrics import Metrics
+
+def _evaluate_chunk(data, combos):
+    """Sweep task: evaluates one chunk of the grid (runs in a worker process)."""
+    return Optimizer(data).evaluate(combos)
+
+def _growth_chunk(data, combos, edges=None):
+    """Walk-forward task: per-bar log growth (or its sums between edges) for one chunk."""
+    keys, growth = Optimizer(data).bar_growth(combos)
+    if edges is not None:
+        growth = WalkForward.window_sums(growth, edges)
+    return list(zip(keys, growth))
 
 class Optimizer:
     """Optimizes parameters for the RSI strategy."""
@@ -10,34 +25,87 @@ class Optimizer:
         self.data = data
         self.indicator_manager = IndicatorManager()
         self.strategy = RSIStrategy()
+        self.hits = 0
+        self.evaluated = 0
+        self.resumed = 0
 
-    def optimize(self, rsi_lower_range, tp_range, sl_range):
-        """Iterates through parameters to find maximum return."""
-        results = {}
+    def optimize(self, rsi_lower_range, tp_range, sl_range, rsi_period_range=(14,), rsi_upper_range=(70,),
+                 workers=1, chunk_size=None, search=None, store=None, checkpoint=None, metric=None):
+        """
+        Iterates through parameters to find maximum return.
+        RSI for every period in rsi_period_range comes from one pass (calculate_rsi_bank).
+        workers, chunk_size, search, store, checkpoint: see SweepRunner.optimize.
+        metric: rank on one of Metrics.NAMES instead of the total return.
+        """
+        combos = [(period, rl, ru, tp, sl) for period in rsi_period_range for rl in rsi_lower_range
+                  for ru in rsi_upper_range for tp in tp_range for sl in sl_range]
         
-        # Calculate RSI once for the default period
-        df_base = self.indicator_manager.calculate_rsi(self.data)
+        runner = SweepRunner(workers, chunk_size)
+        scope = store.scope('strategy_on_rsi', __file__, self.data) if store is not None else None
+        results = runner.optimize(_evaluate_chunk, self.data, combos, search, scope, checkpoint, metric)
+        self.hits, self.evaluated, self.resumed = runner.hits, runner.evaluated, runner.resumed
+        print(f"Indicator cache: {default_cache.stats()}")
+        
+        best, keys = runner.best(results, metric)
+        return (best, keys[0]) if keys else (None, None)
+
+    def walk_forward(self, rsi_lower_range, tp_range, sl_range, walk_forward, rsi_period_range=(14,),
+                     rsi_upper_range=(70,), workers=1, chunk_size=None):
+        """
+        Walk-forward optimization over the same grid as optimize (see WalkForward).
+        Returns the per-fold table and the stitched out-of-sample equity.
+        """
+        combos = [(period, rl, ru, tp, sl) for period in rsi_period_range for rl in rsi_lower_range
+                  for ru in rsi_upper_range for tp in tp_range for sl in sl_range]
+        return walk_forward.run(_growth_chunk, self.data, combos, SweepRunner(workers, chunk_size))
+
+    def evaluate(self, combos):
+        """
+        Returns [(key, total return, metrics)] for a list of (period, lower, upper, tp, sl) combinations.
+        metrics holds Metrics.NAMES computed on the daily log returns, plus the total log return.
+        """
+        periods_per_year = Metrics.periods_per_year(self.data.index)
+        results = []
+        for key, df in self._runs(combos):
+            log_return = df['strategy_returns'].sum()
+            metrics = Metrics.compute(df['strategy_returns'], 'log', periods_per_year,
+                                      positions=df['RSI_signal'].shift(1))
+            metrics['log_return'] = log_return
+            results.append((key, np.exp(log_return), metrics))
+        return results
+
+    def bar_growth(self, combos):
+        """Keys and (combos x bars) log growth (the strategy's daily log returns)."""
+        growth = np.zeros((len(combos), len(self.data)))
+        keys = []
+        for k, (key, df) in enumerate(self._runs(combos)):
+            keys.append(key)
+            growth[k] = WalkForward.aligned(self.data.index, df['strategy_returns'])
+        return keys, growth
+
+    def _runs(self, combos):
+        """Yields (key, strategy frame) for each (period, lower, upper, tp, sl) combination."""
+        if not combos:
+            return
         
-        for rl in rsi_lower_range:
-            for tp in tp_range:
-                for sl in sl_range:
-                    key = f"rsi_low_{rl}_tp_{tp}_sl_{sl}"
-                    
-                    df = self.strategy.generate_signals(
-                        df_base, 
-                        rsi_lower=rl, 
-                        tp_level=tp, 
-                        sl_level=sl
-                    )
-                    
-                    total_ret = np.exp(df['strategy_returns'].sum())
-                    results[key] = total_ret
-                    print(f"Checking: {key} -> Return: {np.round(total_ret, 4)}")
+        # Calculate RSI once for all periods
+        periods = list(dict.fromkeys(c[0] for c in combos))
+        rsi_bank = self.indicator_manager.calculate_rsi_bank(self.data, periods)
         
-        if results:
-            best_key = max(results, key=results.get)
-            print(f"Optimization Results:")
-            print(f"Best Parameters: {best_key}")
-            print(f"Best Return: {np.round(results[best_key], 4)}")
-            return results[best_key], best_key
-        return None, None
+        bases = {}
+        for period, rl, ru, tp, sl in combos:
+            if period not in bases:
+                df_base = self.data.copy()
+                df_base['RSI'] = rsi_bank[periods.index(period)]
+                df_base.dropna(subset=['RSI'], inplace=True)
+                bases = {period: df_base}
+            
+            key = f"rsi_{period}_low_{rl}_up_{ru}_tp_{tp}_sl_{sl}"
+            
+            yield key, self.strategy.generate_signals(
+                bases[period], 
+                rsi_lower=rl, 
+                rsi_upper=ru, 
+                tp_level=tp, 
+                sl_level=sl
+            )
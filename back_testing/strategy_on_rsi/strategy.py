@@ -1,5 +1,46 @@
 import pandas as pd
 import numpy as np
+from ..compact import CompactMode
+from ..jit import njit, kernel_args
+
+@njit(cache=True)
+def _rsi_kernel(close, high, low, rsi, rsi_lower, rsi_upper, tp_level, sl_level):
+    """RSI entry with TP/SL/RSI exits over raw arrays. Returns signal, trade, TP and SL prices."""
+    n = len(close)
+    trade_price = np.zeros(n)
+    rsi_signal = np.zeros(n)
+    take_profit_price = np.zeros(n)
+    stop_loss_price = np.zeros(n)
+
+    for i in range(1, n):
+        # Check if we have NO position in the asset
+        if rsi_signal[i-1] == 0:
+            trade_price[i] = close[i]
+            # Entry condition: Buy if RSI is below lower threshold
+            if rsi[i] <= rsi_lower:
+                rsi_signal[i] = 1.0
+                take_profit_price[i] = trade_price[i] * (1 + tp_level)
+                stop_loss_price[i] = trade_price[i] * (1 - sl_level)
+
+        # Check if we have a LONG position
+        elif rsi_signal[i-1] == 1:
+            # Condition: Breach STOP LOSS
+            if low[i] < stop_loss_price[i-1]:
+                trade_price[i] = stop_loss_price[i-1]
+            # Condition: Breach TAKE PROFIT
+            elif high[i] > take_profit_price[i-1]:
+                trade_price[i] = take_profit_price[i-1]
+            # Condition: RSI Exit target (e.g. > 70)
+            elif rsi[i] >= rsi_upper:
+                trade_price[i] = close[i]
+            # Still holding position
+            else:
+                rsi_signal[i] = 1.0
+                trade_price[i] = close[i]
+                take_profit_price[i] = take_profit_price[i-1]
+                stop_loss_price[i] = stop_loss_price[i-1]
+
+    return rsi_signal, trade_price, take_profit_price, stop_loss_price
 
 class RSIStrategy:
     """Strategy: Buy when RSI < 30. Exit when TP/SL hit or RSI > 70."""
@@ -20,58 +61,16 @@ class RSIStrategy:
             'close': 'Close' if 'Close' in data.columns else 'close'
         }
         
-        # Initializing four new columns for state management
-        data['trade_price'] = 0.0
-        data['RSI_signal'] = 0.0
-        data['take_profit_price'] = 0.0
-        data['stop_loss_price'] = 0.0
+        # Run the RSI/TP/SL state machine once over typed arrays
+        close, high, low, rsi = kernel_args(data[cols['close']], data[cols['high']], data[cols['low']], data['RSI'])
+        rsi_signal, trade_price, take_profit_price, stop_loss_price = _rsi_kernel(
+            close, high, low, rsi, float(rsi_lower), float(rsi_upper), float(tp_level), float(sl_level))
         
-        n = data.shape[0]
-
-        # Ported procedural logic for RSI strategy
-        for i in range(1, n): 
-            prev_signal = data['RSI_signal'].iloc[i-1]
-            
-            # Check if we have NO position in the asset
-            if prev_signal == 0:
-                # Entry condition: Buy if RSI is below lower threshold
-                if data['RSI'].iloc[i] <= rsi_lower:
-                    data.iloc[i, data.columns.get_loc('RSI_signal')] = 1.0  # Go long
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data[cols['close']].iloc[i]
-                    data.iloc[i, data.columns.get_loc('take_profit_price')] = data['trade_price'].iloc[i] * (1 + tp_level)
-                    data.iloc[i, data.columns.get_loc('stop_loss_price')] = data['trade_price'].iloc[i] * (1 - sl_level)
-                else:
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data[cols['close']].iloc[i]  
-            
-            # Check if we have a LONG position
-            elif prev_signal == 1:
-                # Condition: Breach STOP LOSS
-                if data[cols['low']].iloc[i] < data['stop_loss_price'].iloc[i-1]:
-                    data.iloc[i, data.columns.get_loc('RSI_signal')] = 0.0  # Exit (SL)
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data['stop_loss_price'].iloc[i-1]
-                    data.iloc[i, data.columns.get_loc('take_profit_price')] = 0.0
-                    data.iloc[i, data.columns.get_loc('stop_loss_price')] = 0.0
-
-                # Condition: Breach TAKE PROFIT
-                elif data[cols['high']].iloc[i] > data['take_profit_price'].iloc[i-1]:
-                    data.iloc[i, data.columns.get_loc('RSI_signal')] = 0.0  # Exit (TP)
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data['take_profit_price'].iloc[i-1]
-                    data.iloc[i, data.columns.get_loc('take_profit_price')] = 0.0
-                    data.iloc[i, data.columns.get_loc('stop_loss_price')] = 0.0
-
-                # Condition: RSI Exit target (e.g. > 70)
-                elif data['RSI'].iloc[i] >= rsi_upper:
-                    data.iloc[i, data.columns.get_loc('RSI_signal')] = 0.0  # Exit (RSI Target)
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data[cols['close']].iloc[i]
-                    data.iloc[i, data.columns.get_loc('take_profit_price')] = 0.0
-                    data.iloc[i, data.columns.get_loc('stop_loss_price')] = 0.0
-
-                # Still holding position
-                else:
-                    data.iloc[i, data.columns.get_loc('RSI_signal')] = data['RSI_signal'].iloc[i-1]
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data[cols['close']].iloc[i]
-                    data.iloc[i, data.columns.get_loc('take_profit_price')] = data['take_profit_price'].iloc[i-1]
-                    data.iloc[i, data.columns.get_loc('stop_loss_price')] = data['stop_loss_price'].iloc[i-1]
+        # Write the four state columns back in one go
+        data['trade_price'] = trade_price
+        data['RSI_signal'] = rsi_signal
+        data['take_profit_price'] = take_profit_price
+        data['stop_loss_price'] = stop_loss_price
         
         # Calculate daily log returns for the strategy
         # Using shift(1) on signal to avoid look-ahead bias
@@ -81,4 +80,9 @@ class RSIStrategy:
         # Alternative calculation using trade_price (as in procedural code's last line)
         data['trade_price_returns'] = (np.log(data['trade_price']/data['trade_price'].shift(1)) * data['RSI_signal'].shift(1))
         
+        # Compact mode: int8 state and float32 prices/returns
+        for col in ['trade_price', 'take_profit_price', 'stop_loss_price', 'strategy_returns', 'trade_price_returns']:
+            data[col] = CompactMode.as_float(data, data[col])
+        data['RSI_signal'] = CompactMode.as_state(data, data['RSI_signal'])
+        
         return data
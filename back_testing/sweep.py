@@ -0,0 +1,229 @@
+import os
+import sys
+import time
+import datetime
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from .shared_data import DataPlane
+from .result_store import ResultStore
+from .checkpoint import Checkpoint
+from .metrics import Metrics
+from .indicator_cache import IndicatorCache
+
+# Set in each worker process by _attach_worker
+_worker_plane = None
+_worker_data = None
+
+def _attach_worker(handle):
+    global _worker_plane, _worker_data
+    # The DataPlane stays referenced for the worker's lifetime, keeping the views valid;
+    # every chunk reads the same frame, so hashes of its (read-only) columns are reused
+    _worker_plane = DataPlane.attach(handle)
+    _worker_data = _worker_plane.frame('data')
+
+def _run_chunk(evaluate, chunk, kwargs):
+    with IndicatorCache.frozen():
+        return evaluate(_worker_data, chunk, **kwargs)
+
+class SweepProgress:
+    """Reports a sweep's throughput and estimated time to completion, at most every 'interval' seconds."""
+
+    def __init__(self, total, done=0, interval=10.0):
+        self.total = total
+        self.done = done
+        self.interval = interval
+        self._start = time.monotonic()
+        self._start_done = done
+        self._last = self._start
+
+    def update(self, n):
+        self.done += n
+        now = time.monotonic()
+        if now - self._last >= self.interval or self.done >= self.total:
+            self._last = now
+            print(self.line(now))
+
+    def line(self, now=None):
+        elapsed = (now or time.monotonic()) - self._start
+        rate = (self.done - self._start_done) / elapsed if elapsed > 0 else 0.0
+        eta = datetime.timedelta(seconds=round((self.total - self.done) / rate)) if rate > 0 else '?'
+        return (f"Progress: {self.done}/{self.total} combinations ({100 * self.done / max(self.total, 1):.1f}%), "
+                f"{rate:.1f} combinations/s, elapsed {datetime.timedelta(seconds=round(elapsed))}, ETA {eta}")
+
+class SweepRunner:
+    """
+    Evaluates a parameter grid in chunks on a process pool.
+    evaluate(data, chunk, **kwargs) must be a module-level function that returns the
+    results for one chunk of combinations. The price data is published once to shared
+    memory and every worker attaches to it when it starts, so tasks only carry the
+    chunk. Chunk results come back in grid order, so results merged from them (and
+    the best parameters picked from those) are the same as in a serial run.
+    A serial sweep is also split into PROGRESS_CHUNKS chunks, the points at which
+    progress is reported and results are checkpointed.
+    """
+
+    PROGRESS_CHUNKS = 20
+
+    def __init__(self, workers=1, chunk_size=None):
+        """
+        workers: number of processes (None uses every CPU; 1 runs in this process).
+        chunk_size: combinations per task (default: about 4 tasks per worker).
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else max(1, int(workers))
+        self.chunk_size = chunk_size
+        self.hits = 0
+        self.evaluated = 0
+        self.resumed = 0
+
+    def chunks(self, combos):
+        """Splits the grid into consecutive chunks."""
+        if self.chunk_size:
+            size = int(self.chunk_size)
+        elif self.workers > 1:
+            size = -(-len(combos) // (self.workers * 4))
+        else:
+            size = -(-len(combos) // self.PROGRESS_CHUNKS)
+        size = max(1, size)
+        return [combos[i:i + size] for i in range(0, len(combos), size)]
+
+    def imap(self, evaluate, data, combos, **kwargs):
+        """Yields evaluate's result for each chunk, in grid order."""
+        chunks = self.chunks(list(combos))
+        if self.workers <= 1 or len(chunks) <= 1:
+            # A chunk only reads data and the frames derived from it; the block ends before
+            # the caller resumes, as it may modify them between chunks
+            for chunk in chunks:
+                with IndicatorCache.frozen():
+                    part = evaluate(data, chunk, **kwargs)
+                yield part
+            return
+
+        workers = min(self.workers, len(chunks))
+        print(f"Sweeping {len(combos)} combinations in {len(chunks)} chunks on {workers} workers")
+        with DataPlane.publish({'data': data}) as plane:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                     initargs=(plane.handle,)) as pool:
+                yield from pool.map(_run_chunk, [evaluate] * len(chunks), chunks, [kwargs] * len(chunks))
+
+    def sweep(self, evaluate, data, combos, search=None, store=None, checkpoint=None, metric=None, **kwargs):
+        """
+        Yields [(combo, key, value, metrics)] lists, where evaluate returns [(key, value, metrics)]
+        per chunk: one list per chunk of the grid or, with a SearchStrategy, one list of the
+        combinations it evaluated on the full history.
+        store: a StoreScope (see ResultStore.scope). Stored combinations are not evaluated
+        again and new results are saved chunk by chunk; with stored results the merged list
+        is yielded once, in grid order. The counts are left in self.hits and self.evaluated.
+        checkpoint: a Checkpoint or its path. An interrupted sweep started again with the same
+        grid, data and code continues after the last checkpointed chunk (self.resumed counts
+        the combinations restored); the file is removed when the sweep completes.
+        metric: what the SearchStrategy ranks on (see SearchStrategy); a grid sweep ignores it.
+        Progress is reported as throughput and ETA (see SweepProgress).
+        """
+        combos = list(combos)
+        self.hits, self.evaluated, self.resumed = 0, 0, 0
+        if search is not None:
+            if checkpoint is not None:
+                raise ValueError("checkpoint applies to grid sweeps, not to a SearchStrategy")
+            results = search.run(evaluate, data, combos, self, store=store, metric=metric, **kwargs)
+            self.hits, self.evaluated = search.hits, len(search.history) - search.hits
+            yield results
+            return
+        
+        stored = store.lookup(combos) if store is not None else {}
+        missing = [c for c in combos if c not in stored]
+        self.hits = len(combos) - len(missing)
+        if store is not None:
+            print(f"Result store: {self.hits} of {len(combos)} combinations stored, evaluating {len(missing)}")
+        
+        # Finished chunks always form a prefix of the grid, so a resumed sweep skips that prefix
+        resumed = []
+        if checkpoint is not None:
+            checkpoint = Checkpoint(checkpoint) if isinstance(checkpoint, str) else checkpoint
+            resumed = checkpoint.open(self.identity(evaluate, data, missing, kwargs))
+            self.resumed = len(resumed)
+            if resumed:
+                print(f"Resuming from checkpoint {checkpoint.path}: {len(resumed)} of {len(missing)} combinations done")
+        todo = missing[len(resumed):]
+        
+        fresh = {item[0]: item[1:] for item in resumed} if stored else {}
+        if resumed and not stored:
+            yield resumed
+        progress = SweepProgress(len(missing), done=len(resumed))
+        try:
+            for chunk, part in zip(self.chunks(todo), self.imap(evaluate, data, todo, **kwargs)):
+                items = [(combo,) + tuple(result) for combo, result in zip(chunk, part)]
+                self.evaluated += len(items)
+                if store is not None:
+                    store.save(items)
+                if checkpoint is not None:
+                    checkpoint.add(items)
+                progress.update(len(items))
+                if stored:
+                    fresh.update((item[0], item[1:]) for item in items)
+                else:
+                    yield items
+        finally:
+            if checkpoint is not None:
+                checkpoint.flush()
+        if checkpoint is not None:
+            checkpoint.remove()
+        if stored:
+            yield [(combo,) + (stored[combo] if combo in stored else fresh[combo]) for combo in combos]
+
+    def optimize(self, evaluate, data, combos, search=None, store=None, checkpoint=None, metric=None, **kwargs):
+        """
+        Sweeps the grid (see sweep) and returns {key: objective} for every evaluated combination:
+        the evaluator's value, or metrics[metric] when ranking on one of Metrics.NAMES
+        (e.g. 'sharpe', 'calmar'); rank it with best.
+        The optimizers take the same arguments, except store, which is a ResultStore they
+        scope to their strategy, code and data:
+        workers/chunk_size: split the grid over a process pool.
+        search: a SearchStrategy (e.g. SuccessiveHalving, TPESearch) to evaluate only part of the grid.
+        store: combinations already stored are not evaluated again (self.hits counts them,
+        self.evaluated the new evaluations).
+        checkpoint: path of a checkpoint file, so an interrupted sweep resumes where it stopped
+        (self.resumed counts the restored combinations).
+        """
+        Metrics.check(metric)
+        results = {}
+        for part in self.sweep(evaluate, data, combos, search, store, checkpoint, metric, **kwargs):
+            for _, key, value, metrics in part:
+                results[key] = value if metric is None else metrics[metric]
+        return results
+
+    @staticmethod
+    def best(results, metric=None, label='Return'):
+        """
+        Prints and returns the best objective of {key: objective} and the keys reaching it, in
+        grid order (None, [] when empty). metric ranks with Metrics.score; label names the
+        evaluator's value when metric is None.
+        """
+        if not results:
+            return None, []
+        
+        best_key = max(results, key=lambda k: Metrics.score(metric, results[k]))
+        best = Metrics.score(metric, results[best_key])
+        keys = [k for k in results if Metrics.score(metric, results[k]) == best] or [best_key]
+        print(f"Optimization Results:")
+        print(f"Best Parameters: {best_key if len(keys) == 1 else keys}")
+        print(f"Best {metric or label}: {np.round(results[best_key], 4)}")
+        return results[best_key], keys
+
+    @staticmethod
+    def identity(evaluate, data, combos, kwargs):
+        """What a checkpoint must match to be resumed: evaluator, its code, the data, grid and arguments."""
+        module = sys.modules[evaluate.__module__]
+        return {
+            'evaluate': f"{evaluate.__module__}.{evaluate.__qualname__}",
+            'code_version': ResultStore.code_version(module.__file__),
+            'data': ResultStore.data_fingerprint(data),
+            'combos': [ResultStore.params_key(c) for c in combos],
+            'kwargs': repr(sorted(kwargs.items())),
+        }
+
+    def run(self, evaluate, data, combos, **kwargs):
+        """Evaluates the whole grid and returns the concatenated per-chunk result lists."""
+        results = []
+        for part in self.imap(evaluate, data, combos, **kwargs):
+            results.extend(part)
+        return results
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+class SyntheticMarket:
+    """
+    Seeded synthetic OHLCV bars, so benchmarks and experiments do not depend on a private CSV.
+    The close follows a geometric Brownian motion whose volatility switches between regimes
+    (a Markov chain drawing a new random regime with probability 'switch' per bar); opens gap from
+    the previous close, High/Low always enclose Open and Close, and volume rises with the
+    regime's volatility. The same seed always gives the same bars.
+    """
+
+    # Bars per year that scale drift and volatility ('min': 390-minute sessions, 252 a year);
+    # the index itself is evenly spaced, without session gaps
+    BARS_PER_YEAR = {'B': 252, 'D': 365, 'h': 252 * 7, 'min': 252 * 390}
+
+    def __init__(self, seed=0, drift=0.07, vols=(0.12, 0.25, 0.6), switch=0.005, freq='min',
+                 start='2000-01-03', price=100.0):
+        """
+        drift: annual drift; vols: annual volatility of each regime.
+        freq: bar spacing of the index (see BARS_PER_YEAR).
+        """
+        if freq not in self.BARS_PER_YEAR:
+            raise ValueError(f"freq must be one of {list(self.BARS_PER_YEAR)}, got {freq!r}")
+        self.seed = seed
+        self.drift = drift
+        self.vols = np.asarray(vols, dtype=np.float64)
+        self.switch = switch
+        self.freq = freq
+        self.start = start
+        self.price = price
+
+    def bars(self, n, seed=None):
+        """n bars as a DataFrame with Open, High, Low, Close and Volume on a 'timestamp' index."""
+        rng = np.random.default_rng(self.seed if seed is None else seed)
+        dt = 1.0 / self.BARS_PER_YEAR[self.freq]
+
+        # Step 1: Volatility regime of each bar (a new random regime after every switch)
+        switches = np.cumsum(rng.random(n) < self.switch)
+        regime = rng.integers(0, len(self.vols), switches[-1] + 1 if n else 1)[switches]
+        sigma = self.vols[regime]
+
+        # Step 2: GBM log returns and closes
+        step = sigma * np.sqrt(dt)
+        log_ret = (self.drift - 0.5 * sigma ** 2) * dt + step * rng.standard_normal(n)
+        close = self.price * np.exp(np.cumsum(log_ret))
+
+        # Step 3: Opens gap from the previous close; highs and lows extend beyond both
+        prev_close = np.concatenate(([self.price], close[:-1]))
+        open_ = prev_close * np.exp(0.2 * step * rng.standard_normal(n))
+        high = np.maximum(open_, close) * np.exp(0.5 * step * np.abs(rng.standard_normal(n)))
+        low = np.minimum(open_, close) * np.exp(-0.5 * step * np.abs(rng.standard_normal(n)))
+
+        # Step 4: Volume grows with the regime's volatility
+        volume = np.round(rng.lognormal(10.0, 0.5, n) * sigma / self.vols.min()).astype(np.int64)
+
+        index = pd.date_range(self.start, periods=n, freq=self.freq, name='timestamp')
+        return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                            index=index)
+
+    def universe(self, n_symbols, n_bars):
+        """{symbol: bars} for n_symbols independent symbols (SYN0000, SYN0001, ...)."""
+        seeds = np.random.SeedSequence(self.seed).spawn(n_symbols)
+        return {f'SYN{k:04d}': self.bars(n_bars, seed=seeds[k]) for k in range(n_symbols)}
+
+    @staticmethod
+    def to_csv(df, path):
+        """Writes bars in the layout of the CSVs DataLoader reads (a 'timestamp' column, lower-case names)."""
+        df.rename(columns=str.lower).reset_index().to_csv(path)
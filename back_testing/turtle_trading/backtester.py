@@ -1,13 +1,16 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import quantstats as qs
+from ..downsample import Downsample
 
 class Backtester:
     """Performance metrics and plotting for the Turtle Trading strategy."""
 
-    def plot_results(self, data, symbol):
-        """Plots cumulative returns and position state."""
+    def plot_results(self, data, symbol, downsample=True):
+        """
+        Plots cumulative returns and position state.
+        downsample: draw about as many points as the figure has pixels (position changes stay exact).
+        """
+        import matplotlib.pyplot as plt
         # Ensure we have a valid index for plotting
         if not isinstance(data.index, pd.DatetimeIndex):
             data.index = pd.to_datetime(data.index)
@@ -20,16 +23,22 @@ class Backtester:
         data['bh_cum_ret'] = (1 + data[close_col].pct_change()).cumprod()
         
         fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(15, 10))
+        strat_cum_ret, bh_cum_ret, position = data['strat_cum_ret'], data['bh_cum_ret'], data['position']
+        if downsample:
+            width = Downsample.pixels(fig)
+            strat_cum_ret = Downsample.curve(strat_cum_ret, width)
+            bh_cum_ret = Downsample.curve(bh_cum_ret, width)
+            position = Downsample.steps(position, width)
         
         # Plot 1: Returns
-        ax1.plot(data.index, data['strat_cum_ret'], label='Strategy returns')
-        ax1.plot(data.index, data['bh_cum_ret'], label='Buy and Hold Returns')
+        ax1.plot(strat_cum_ret.index, strat_cum_ret, label='Strategy returns')
+        ax1.plot(bh_cum_ret.index, bh_cum_ret, label='Buy and Hold Returns')
         ax1.set_ylabel('Cumulative Returns')
         ax1.set_title(f'Turtle Trading Results - {symbol}')
         ax1.legend()
         
         # Plot 2: Position
-        ax2.plot(data.index, data['position'], color='orange')
+        ax2.plot(position.index, position, color='orange')
         ax2.set_ylabel('Position (-1, 0, 1)')
         ax2.set_xlabel('Date')
         
@@ -38,6 +47,7 @@ class Backtester:
 
     def generate_report(self, returns, benchmark=None):
         """Generates performance report using quantstats."""
+        import quantstats as qs
         # Ensure index is datetime for quantstats
         if not isinstance(returns.index, pd.DatetimeIndex):
             returns.index = pd.to_datetime(returns.index)
@@ -1,5 +1,8 @@
 import pandas as pd
 import numpy as np
+from ..compact import CompactMode
+from ..indicator_cache import default_cache
+from ..wilder import WilderEngine
 
 class IndicatorManager:
     """Calculates indicators for the Turtle Trading System: ATR and N-Day Channels."""
@@ -16,30 +19,69 @@ class IndicatorManager:
         low_col = 'Low' if 'Low' in data.columns else 'low'
         close_col = 'Close' if 'Close' in data.columns else 'close'
 
-        # Compute True Range (TR)
-        prev_close = data[close_col].shift(1)
-        tr1 = data[high_col] - data[low_col]
-        tr2 = abs(data[high_col] - prev_close)
-        tr3 = abs(data[low_col] - prev_close)
+        def compute():
+            # Compute True Range (TR)
+            prev_close = data[close_col].shift(1)
+            tr1 = data[high_col] - data[low_col]
+            tr2 = abs(data[high_col] - prev_close)
+            tr3 = abs(data[low_col] - prev_close)
+            tr = CompactMode.as_float(data, pd.concat([tr1, tr2, tr3], axis=1).max(axis=1))
+            
+            # Calculate ATR using Wilder's Smoothing (alpha = 1/period)
+            atr = tr.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+            
+            # Lag the ATR by 1 to avoid look-ahead bias as in procedural code
+            return tr, CompactMode.as_float(data, atr.shift(1))
         
-        data['TR'] = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        data['TR'], data['ATR'] = default_cache.compute(
+            'atr', (period,), [df[high_col], df[low_col], df[close_col]], compute)
         
-        # Calculate ATR using Wilder's Smoothing (alpha = 1/period)
-        data['ATR'] = data['TR'].ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+        return data
+
+    def calculate_atr_bank(self, df, periods=(20,)):
+        """
+        ATR for every period in one pass over the true range (see WilderEngine).
+        Returns a (periods x bars) array aligned with df; row i equals calculate_atr's
+        ATR column for periods[i].
+        """
+        high_col = 'High' if 'High' in df.columns else 'high'
+        low_col = 'Low' if 'Low' in df.columns else 'low'
+        close_col = 'Close' if 'Close' in df.columns else 'close'
         
-        # Lag the ATR by 1 to avoid look-ahead bias as in procedural code
-        data['ATR'] = data['ATR'].shift(1)
+        periods = tuple(int(p) for p in periods)
+        dtype = CompactMode.float_dtype(df)
         
-        return data
+        def compute():
+            high, low, close = (df[col].to_numpy() for col in (high_col, low_col, close_col))
+            # TR is rounded to the frame's float dtype before smoothing, as in calculate_atr
+            tr = WilderEngine.true_range(high, low, close).astype(dtype, copy=False)
+            return WilderEngine.atr(high, low, close, periods, tr=tr).astype(dtype, copy=False)
+        
+        return default_cache.compute('atr_bank', periods, [df[high_col], df[low_col], df[close_col]], compute)
 
-    def calculate_channels(self, df, ndays_high=20, ndays_low=20):
-        """Calculates rolling N-Day high and low channels (lagged by 1)."""
+    def calculate_channels(self, df, ndays_high=20, ndays_low=20, channel_index=None):
+        """
+        Calculates rolling N-Day high and low channels (lagged by 1).
+        channel_index: optional ChannelIndex built over the same rows.
+        """
         data = df.copy()
         
         high_col = 'High' if 'High' in data.columns else 'high'
         low_col = 'Low' if 'Low' in data.columns else 'low'
         
-        data['ndays_high'] = data[high_col].rolling(ndays_high).max().shift(1)
-        data['ndays_low'] = data[low_col].rolling(ndays_low).min().shift(1)
+        use_index = channel_index is not None and channel_index.serves(data, ndays_high, ndays_low)
+        
+        def upper():
+            if use_index:
+                return CompactMode.as_float(data, pd.Series(channel_index.high.lagged(ndays_high), index=data.index))
+            return CompactMode.as_float(data, data[high_col].rolling(ndays_high).max().shift(1))
+        
+        def lower():
+            if use_index:
+                return CompactMode.as_float(data, pd.Series(channel_index.low.lagged(ndays_low), index=data.index))
+            return CompactMode.as_float(data, data[low_col].rolling(ndays_low).min().shift(1))
+        
+        data['ndays_high'] = default_cache.compute('ndays_high', (ndays_high,), [df[high_col]], upper)
+        data['ndays_low'] = default_cache.compute('ndays_low', (ndays_low,), [df[low_col]], lower)
         
         return data
@@ -3,15 +3,13 @@ from back_testing.turtle_trading.indicators import IndicatorManager
 from back_testing.turtle_trading.strategy import TurtleStrategy
 from back_testing.turtle_trading.backtester import Backtester
 import numpy as np
-import importlib
-import back_testing.data
 
 def run_backtest(symbol='MSFT', start_date='2010-01-01', end_date='2022-12-31', 
-                 ndays_high=3, ndays_low=3, n_atr=20, sl_mult=1, tp_mult=2):
-    """Orchestrates the Turtle Trading System workflow."""
-    
-    # Reload modules to catch any iterative fixes in Jupyter
-    importlib.reload(back_testing.data)
+                 ndays_high=3, ndays_low=3, n_atr=20, sl_mult=1, tp_mult=2, headless=False):
+    """
+    Orchestrates the Turtle Trading System workflow.
+    headless: skip the charts and the quantstats report (for batch jobs and workers).
+    """
     
     # Initialize components
     loader = DataLoader()
@@ -40,6 +38,9 @@ def run_backtest(symbol='MSFT', start_date='2010-01-01', end_date='2022-12-31',
     # Step 2: Generate Signals and Calculate Returns
     data_backtested = strategy.generate_signals(data, sl_mult=sl_mult, tp_mult=tp_mult)
     
+    if headless:
+        return data_backtested
+    
     # Step 3: Visualizations
     backtester.plot_results(data_backtested, symbol)
     
@@ -49,6 +50,7 @@ def run_backtest(symbol='MSFT', start_date='2010-01-01', end_date='2022-12-31',
     benchmark = data_backtested[close_col].pct_change()
     
     backtester.generate_report(data_backtested['trade_ret'], benchmark=benchmark)
+    return data_backtested
 
 if __name__ == "__main__":
     run_backtest()
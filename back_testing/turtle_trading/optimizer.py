@@ -2,6 +2,23 @@ from .strategy import TurtleStrategy
 from .indicators import IndicatorManager
 from ..data import DataLoader
 import numpy as np
+import pandas as pd
+from ..indicator_cache import default_cache
+from ..sweep import SweepRunner
+from ..walk_forward import WalkForward
+from ..metrics import Metrics
+from ..channels import ChannelIndex
+
+def _evaluate_chunk(data, combos):
+    """Sweep task: evaluates one chunk of the grid (runs in a worker process)."""
+    return Optimizer(data).evaluate(combos)
+
+def _growth_chunk(data, combos, edges=None):
+    """Walk-forward task: per-bar log growth (or its sums between edges) for one chunk."""
+    keys, growth = Optimizer(data).bar_growth(combos)
+    if edges is not None:
+        growth = WalkForward.window_sums(growth, edges)
+    return list(zip(keys, growth))
 
 class Optimizer:
     """Optimizes parameters for the Turtle Trading System."""
@@ -10,31 +27,85 @@ class Optimizer:
         self.data = data
         self.indicator_manager = IndicatorManager()
         self.strategy = TurtleStrategy()
+        self.hits = 0
+        self.evaluated = 0
+        self.resumed = 0
 
-    def optimize(self, ndays_range, sl_range, tp_range):
-        """Iterates through parameter combinations to find best cumulative return."""
-        results = {}
+    def optimize(self, ndays_range, sl_range, tp_range, workers=1, chunk_size=None, search=None, store=None,
+                 checkpoint=None, metric=None):
+        """
+        Iterates through parameter combinations to find best cumulative return.
+        workers, chunk_size, search, store, checkpoint: see SweepRunner.optimize.
+        metric: rank on one of Metrics.NAMES instead of the cumulative return.
+        """
+        combos = [(n, sl, tp) for n in ndays_range for sl in sl_range for tp in tp_range]
         
-        for n in ndays_range:
-            # Re-calculate indicators for each channel length
-            df_ind = self.indicator_manager.calculate_atr(self.data)
-            df_ind = self.indicator_manager.calculate_channels(df_ind, ndays_high=n, ndays_low=n)
-            df_ind.dropna(subset=['ATR', 'ndays_high', 'ndays_low'], inplace=True)
-            
-            for sl in sl_range:
-                for tp in tp_range:
-                    key = f"n{n}_sl{sl}_tp{tp}"
-                    
-                    df = self.strategy.generate_signals(df_ind, sl_mult=sl, tp_mult=tp)
-                    total_ret = (1 + df['trade_ret']).prod()
-                    
-                    results[key] = total_ret
-                    print(f"Checking: {key} -> Cum Return: {np.round(total_ret, 4)}")
+        runner = SweepRunner(workers, chunk_size)
+        scope = store.scope('turtle_trading', __file__, self.data) if store is not None else None
+        results = runner.optimize(_evaluate_chunk, self.data, combos, search, scope, checkpoint, metric)
+        self.hits, self.evaluated, self.resumed = runner.hits, runner.evaluated, runner.resumed
+        print(f"Indicator cache: {default_cache.stats()}")
         
-        if results:
-            best_key = max(results, key=results.get)
-            print(f"Optimization Results:")
-            print(f"Best Parameters: {best_key}")
-            print(f"Best Return: {np.round(results[best_key], 4)}")
-            return results[best_key], best_key
-        return None, None
+        best, keys = runner.best(results, metric)
+        return (best, keys[0]) if keys else (None, None)
+
+    def walk_forward(self, ndays_range, sl_range, tp_range, walk_forward, workers=1, chunk_size=None):
+        """
+        Walk-forward optimization over the same grid as optimize (see WalkForward).
+        Returns the per-fold table and the stitched out-of-sample equity.
+        """
+        combos = [(n, sl, tp) for n in ndays_range for sl in sl_range for tp in tp_range]
+        return walk_forward.run(_growth_chunk, self.data, combos, SweepRunner(workers, chunk_size))
+
+    def evaluate(self, combos):
+        """
+        Returns [(key, cumulative return, metrics)] for a list of (ndays, sl, tp) combinations.
+        metrics holds Metrics.NAMES computed on the per-bar marked-to-market growth, plus the trade count.
+        """
+        periods_per_year = Metrics.periods_per_year(self.data.index)
+        results = []
+        for key, df in self._runs(combos):
+            cum_return = (1 + df['trade_ret']).prod()
+            metrics = Metrics.compute(self._marked_growth(df), 'log', periods_per_year, positions=df['position'])
+            metrics['trades'] = (df['trade_ret'] != 0).sum()
+            results.append((key, cum_return, metrics))
+        return results
+
+    def bar_growth(self, combos):
+        """Keys and (combos x bars) log growth, open positions marked to market on every bar."""
+        growth = np.zeros((len(combos), len(self.data)))
+        keys = []
+        for k, (key, df) in enumerate(self._runs(combos)):
+            keys.append(key)
+            growth[k] = WalkForward.aligned(self.data.index, self._marked_growth(df))
+        return keys, growth
+
+    @staticmethod
+    def _marked_growth(df):
+        """Per-bar log growth of a strategy frame (see Metrics.marked_growth)."""
+        close_col = 'Close' if 'Close' in df.columns else 'close'
+        return pd.Series(Metrics.marked_growth(df['position'], df['trade_price'], df[close_col]), index=df.index)
+
+    def _runs(self, combos):
+        """Yields (key, strategy frame) for each (ndays, sl, tp) combination."""
+        if not combos:
+            return
+        
+        # Range-max/min tables shared by every channel length
+        channel_index = ChannelIndex(self.data, max_window=max(c[0] for c in combos))
+        
+        # ATR does not depend on the channel length
+        df_atr = self.indicator_manager.calculate_atr(self.data)
+        
+        channels = {}
+        for n, sl, tp in combos:
+            if n not in channels:
+                # Re-calculate channels for each channel length
+                df_ind = self.indicator_manager.calculate_channels(df_atr, ndays_high=n, ndays_low=n,
+                                                                   channel_index=channel_index)
+                df_ind.dropna(subset=['ATR', 'ndays_high', 'ndays_low'], inplace=True)
+                channels = {n: df_ind}
+            
+            key = f"n{n}_sl{sl}_tp{tp}"
+            
+            yield key, self.strategy.generate_signals(channels[n], sl_mult=sl, tp_mult=tp)
@@ -1,12 +1,91 @@
 import pandas as pd
 import numpy as np
+from ..compact import CompactMode
+from ..jit import njit, kernel_args
+
+# Signal labels, stored as int8 codes inside the kernel and mapped to text on output
+SIGNAL_LABELS = ("", "Entry long", "Entry short", "SL long", "TP long", "SL short", "TP short")
+NONE, ENTRY_LONG, ENTRY_SHORT, SL_LONG, TP_LONG, SL_SHORT, TP_SHORT = range(len(SIGNAL_LABELS))
+
+@njit(cache=True)
+def _turtle_kernel(high, low, close, ndays_high, ndays_low, atr, sl_mult, tp_mult):
+    """
+    Event loop over raw arrays. Returns position, trade price, SL/TP, reported ATR,
+    the signal codes and, on exit bars, the exit/entry price ratio.
+    """
+    n = len(close)
+    position = np.zeros(n)
+    trade_price = np.zeros(n)
+    exit_ratio = np.zeros(n)
+    sl_price = np.zeros(n)
+    tp_price = np.zeros(n)
+    rep_atr = np.zeros(n)
+    signal = np.zeros(n, dtype=np.int8)
+
+    for i in range(1, n):
+        prev_pos = position[i-1]
+
+        # CASE: NO POSITION
+        if prev_pos == 0.0:
+            # Entry long: Price exceeds N-day high
+            if high[i] > ndays_high[i]:
+                position[i] = 1.0
+                trade_price[i] = ndays_high[i]
+                signal[i] = ENTRY_LONG
+                rep_atr[i] = atr[i]
+                sl_price[i] = trade_price[i] - (rep_atr[i] * sl_mult)
+                tp_price[i] = trade_price[i] + (rep_atr[i] * tp_mult)
+            # Entry short: Price falls below N-day low
+            elif low[i] < ndays_low[i]:
+                position[i] = -1.0
+                trade_price[i] = ndays_low[i]
+                signal[i] = ENTRY_SHORT
+                rep_atr[i] = atr[i]
+                sl_price[i] = trade_price[i] + (rep_atr[i] * sl_mult)
+                tp_price[i] = trade_price[i] - (rep_atr[i] * tp_mult)
+
+        # CASE: LONG POSITION
+        elif prev_pos == 1.0:
+            if close[i] <= sl_price[i-1]:
+                trade_price[i] = sl_price[i-1]
+                exit_ratio[i] = trade_price[i] / trade_price[i-1]
+                signal[i] = SL_LONG
+            elif close[i] >= tp_price[i-1]:
+                trade_price[i] = tp_price[i-1]
+                exit_ratio[i] = trade_price[i] / trade_price[i-1]
+                signal[i] = TP_LONG
+            else:
+                position[i] = prev_pos
+                trade_price[i] = trade_price[i-1]
+                sl_price[i] = sl_price[i-1]
+                tp_price[i] = tp_price[i-1]
+                signal[i] = signal[i-1]
+
+        # CASE: SHORT POSITION
+        elif prev_pos == -1.0:
+            if close[i] >= sl_price[i-1]:
+                trade_price[i] = sl_price[i-1]
+                exit_ratio[i] = trade_price[i] / trade_price[i-1]
+                signal[i] = SL_SHORT
+            elif close[i] <= tp_price[i-1]:
+                trade_price[i] = tp_price[i-1]
+                exit_ratio[i] = trade_price[i] / trade_price[i-1]
+                signal[i] = TP_SHORT
+            else:
+                position[i] = prev_pos
+                trade_price[i] = trade_price[i-1]
+                sl_price[i] = sl_price[i-1]
+                tp_price[i] = tp_price[i-1]
+                signal[i] = signal[i-1]
+
+    return position, trade_price, exit_ratio, sl_price, tp_price, rep_atr, signal
 
 class TurtleStrategy:
     """Strategy logic based on N-day breakouts and ATR-based exits."""
 
     def generate_signals(self, df, sl_mult=1, tp_mult=2):
         """
-        Runs the Turtle Trading strategy loop.
+        Runs the Turtle Trading strategy loop (compiled kernel over NumPy arrays).
         sl_mult: Number of ATRs for Stop Loss.
         tp_mult: Number of ATRs for Take Profit.
         """
@@ -19,99 +98,35 @@ class TurtleStrategy:
             'close': 'Close' if 'Close' in data.columns else 'close'
         }
 
-        # Initializing columns for state management
-        data['position'] = 0.0
-        data['trade_price'] = 0.0
-        data['trade_ret'] = 0.0
-        data['signal'] = ""
-        data['SL_price'] = 0.0
-        data['TP_price'] = 0.0
-        data['rep_ATR'] = 0.0
-
-        n = len(data)
-
-        # Iterative logic for event-driven simulation
-        for i in range(1, n):
-            prev_pos = data.iloc[i-1]['position']
-            curr_high = data.iloc[i][cols['high']]
-            curr_low = data.iloc[i][cols['low']]
-            curr_close = data.iloc[i][cols['close']]
-            
-            # CASE: NO POSITION
-            if prev_pos == 0.0:
-                # Entry long: Price exceeds N-day high
-                if curr_high > data.iloc[i]['ndays_high']:
-                    data.iloc[i, data.columns.get_loc('position')] = 1.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data.iloc[i]['ndays_high']
-                    data.iloc[i, data.columns.get_loc('signal')] = "Entry long"
-                    data.iloc[i, data.columns.get_loc('rep_ATR')] = data.iloc[i]['ATR']
-                    # Calculate targets
-                    price = data.iloc[i]['trade_price']
-                    atr = data.iloc[i]['rep_ATR']
-                    data.iloc[i, data.columns.get_loc('SL_price')] = price - (atr * sl_mult)
-                    data.iloc[i, data.columns.get_loc('TP_price')] = price + (atr * tp_mult)
-
-                # Entry short: Price falls below N-day low
-                elif curr_low < data.iloc[i]['ndays_low']:
-                    data.iloc[i, data.columns.get_loc('position')] = -1.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data.iloc[i]['ndays_low']
-                    data.iloc[i, data.columns.get_loc('signal')] = "Entry short"
-                    data.iloc[i, data.columns.get_loc('rep_ATR')] = data.iloc[i]['ATR']
-                    # Calculate targets
-                    price = data.iloc[i]['trade_price']
-                    atr = data.iloc[i]['rep_ATR']
-                    data.iloc[i, data.columns.get_loc('SL_price')] = price + (atr * sl_mult)
-                    data.iloc[i, data.columns.get_loc('TP_price')] = price - (atr * tp_mult)
-
-            # CASE: LONG POSITION
-            elif prev_pos == 1.0:
-                sl_price = data.iloc[i-1]['SL_price']
-                tp_price = data.iloc[i-1]['TP_price']
-                
-                # Check Stop Loss
-                if curr_close <= sl_price:
-                    data.iloc[i, data.columns.get_loc('position')] = 0.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = sl_price
-                    data.iloc[i, data.columns.get_loc('trade_ret')] = (data.iloc[i]['trade_price'] / data.iloc[i-1]['trade_price']) - 1
-                    data.iloc[i, data.columns.get_loc('signal')] = "SL long"
-                # Check Take Profit
-                elif curr_close >= tp_price:
-                    data.iloc[i, data.columns.get_loc('position')] = 0.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = tp_price
-                    data.iloc[i, data.columns.get_loc('trade_ret')] = (data.iloc[i]['trade_price'] / data.iloc[i-1]['trade_price']) - 1
-                    data.iloc[i, data.columns.get_loc('signal')] = "TP long"
-                # Carry Position
-                else:
-                    data.iloc[i, data.columns.get_loc('position')] = prev_pos
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data.iloc[i-1]['trade_price']
-                    data.iloc[i, data.columns.get_loc('SL_price')] = sl_price
-                    data.iloc[i, data.columns.get_loc('TP_price')] = tp_price
-                    data.iloc[i, data.columns.get_loc('signal')] = data.iloc[i-1]['signal']
-
-            # CASE: SHORT POSITION
-            elif prev_pos == -1.0:
-                sl_price = data.iloc[i-1]['SL_price']
-                tp_price = data.iloc[i-1]['TP_price']
-                
-                # Check Stop Loss
-                if curr_close >= sl_price:
-                    data.iloc[i, data.columns.get_loc('position')] = 0.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = sl_price
-                    # Return for short: (Entry Price / Exit Price) - 1 or exp approach from procedural
-                    data.iloc[i, data.columns.get_loc('trade_ret')] = np.exp(np.log(data.iloc[i]['trade_price'] / data.iloc[i-1]['trade_price']) * (-1)) - 1
-                    data.iloc[i, data.columns.get_loc('signal')] = "SL short"
-                # Check Take Profit
-                elif curr_close <= tp_price:
-                    data.iloc[i, data.columns.get_loc('position')] = 0.0
-                    data.iloc[i, data.columns.get_loc('trade_price')] = tp_price
-                    data.iloc[i, data.columns.get_loc('trade_ret')] = np.exp(np.log(data.iloc[i]['trade_price'] / data.iloc[i-1]['trade_price']) * (-1)) - 1
-                    data.iloc[i, data.columns.get_loc('signal')] = "TP short"
-                # Carry Position
-                else:
-                    data.iloc[i, data.columns.get_loc('position')] = prev_pos
-                    data.iloc[i, data.columns.get_loc('trade_price')] = data.iloc[i-1]['trade_price']
-                    data.iloc[i, data.columns.get_loc('SL_price')] = sl_price
-                    data.iloc[i, data.columns.get_loc('TP_price')] = tp_price
-                    data.iloc[i, data.columns.get_loc('signal')] = data.iloc[i-1]['signal']
+        # Run the event loop once over typed arrays
+        high, low, close, n_high, n_low, atr = kernel_args(
+            data[cols['high']], data[cols['low']], data[cols['close']],
+            data['ndays_high'], data['ndays_low'], data['ATR'])
+        position, trade_price, exit_ratio, sl_price, tp_price, rep_atr, signal = _turtle_kernel(
+            high, low, close, n_high, n_low, atr, float(sl_mult), float(tp_mult))
+        signal = np.asarray(signal, dtype=np.int8)
+        
+        # Trade return on exit bars: long exits earn the price ratio, shorts its inverse
+        trade_ret = np.zeros(len(data))
+        is_long_exit = (signal == SL_LONG) | (signal == TP_LONG)
+        is_short_exit = (signal == SL_SHORT) | (signal == TP_SHORT)
+        trade_ret[is_long_exit] = exit_ratio[is_long_exit] - 1
+        trade_ret[is_short_exit] = np.exp(np.log(exit_ratio[is_short_exit]) * (-1)) - 1
+        
+        # Write the state back once; signal codes become labels only here
+        data['position'] = position
+        data['trade_price'] = trade_price
+        data['trade_ret'] = trade_ret
+        if CompactMode.is_active(data):
+            data['signal'] = pd.Categorical.from_codes(signal, categories=SIGNAL_LABELS)
+        else:
+            data['signal'] = np.array(SIGNAL_LABELS, dtype=object)[signal]
+        data['SL_price'] = sl_price
+        data['TP_price'] = tp_price
+        data['rep_ATR'] = rep_atr
         
+        # Compact mode: int8 position and float32 prices/returns
+        for col in ['trade_price', 'trade_ret', 'SL_price', 'TP_price', 'rep_ATR']:
+            data[col] = CompactMode.as_float(data, data[col])
+        data['position'] = CompactMode.as_state(data, data['position'])
         return data
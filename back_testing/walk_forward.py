@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from .sweep import SweepRunner
+
+class WalkForward:
+    """
+    Walk-forward optimization: pick the best combination on a train window, apply it to
+    the following out-of-sample (test) window, move both forward by 'step' bars, repeat,
+    and stitch the test windows into one out-of-sample equity curve.
+    Train windows are 'train' bars long (rolling) or start at the first bar (anchored).
+
+    Every combination is run once over the full history, so indicators are computed once
+    and warm at every window start. Each optimizer books each bar's log growth (open
+    positions marked to market, so no window is credited with moves made before it); the
+    engine reduces it to sums between the window edges, after which any number of folds
+    costs a few additions per combination. A window's score is the growth its bars contributed to that
+    continuous run, so positions opened before the window are carried into it.
+    """
+
+    # Bound on the (combos x bars) growth arrays held per chunk
+    MAX_CHUNK_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, train, test, step=None, anchored=False):
+        if train < 1 or test < 1:
+            raise ValueError(f"train and test must be positive bar counts, got {train} and {test}")
+        self.train = int(train)
+        self.test = int(test)
+        self.step = int(step or test)
+        self.anchored = anchored
+
+    def folds(self, n_bars):
+        """[(train_start, train_end, test_start, test_end)] row positions (end exclusive)."""
+        folds = []
+        test_start = self.train
+        while test_start < n_bars:
+            train_start = 0 if self.anchored else test_start - self.train
+            folds.append((train_start, test_start, test_start, min(test_start + self.test, n_bars)))
+            test_start += self.step
+        return folds
+
+    @staticmethod
+    def aligned(index, values):
+        """A per-bar growth Series placed on the rows of 'index' (0 for missing rows and NaN)."""
+        out = np.zeros(len(index))
+        out[index.get_indexer(values.index)] = np.nan_to_num(values.to_numpy(dtype=np.float64), nan=0.0,
+                                                             posinf=np.inf, neginf=-np.inf)
+        return out
+
+    @staticmethod
+    def window_sums(growth, edges):
+        """Sums of each row of a (combos x bars) growth array between consecutive edges."""
+        growth = np.asarray(growth, dtype=np.float64)
+        # Each segment is summed on its own bars only, so equal bars give equal sums
+        return np.add.reduceat(growth[:, :edges[-1]], edges[:-1], axis=1)
+
+    def run(self, evaluate, data, combos, runner=None, **kwargs):
+        """
+        evaluate(data, combos, edges=None, **kwargs): an optimizer's growth task returning
+        [(key, sums between consecutive edges)], or [(key, per-bar growth)] without edges.
+        Returns (fold table, stitched out-of-sample equity).
+        """
+        combos = list(combos)
+        folds = self.folds(len(data))
+        if not folds or not combos:
+            print(f"Walk-forward: no folds ({len(data)} bars, train {self.train}, test {self.test})")
+            return pd.DataFrame(), pd.Series(dtype=float)
+
+        runner = runner or SweepRunner()
+        if runner.chunk_size is None:
+            rows = max(1, self.MAX_CHUNK_BYTES // (8 * len(data)))
+            runner = SweepRunner(runner.workers, chunk_size=min(rows, len(runner.chunks(combos)[0])))
+
+        # Log growth of every combination between the window edges, from one run over the history
+        edges = sorted({pos for fold in folds for pos in fold})
+        results = runner.run(evaluate, data, combos, edges=edges, **kwargs)
+        keys = [key for key, _ in results]
+        sums = np.stack([s for _, s in results])
+        at = {pos: j for j, pos in enumerate(edges)}
+
+        rows = []
+        for k, (train_start, train_end, test_start, test_end) in enumerate(folds):
+            train_growth = sums[:, at[train_start]:at[train_end]].sum(axis=1)
+            # NaN ranks last; ties go to the first combination in grid order
+            best = int(np.argmax(np.where(np.isnan(train_growth), -np.inf, train_growth)))
+            test_growth = sums[best, at[test_start]:at[test_end]].sum()
+            rows.append({
+                'fold': k,
+                'train_start': data.index[train_start],
+                'train_end': data.index[train_end - 1],
+                'test_start': data.index[test_start],
+                'test_end': data.index[test_end - 1],
+                'best_key': keys[best],
+                'best_combo': combos[best],
+                'train_return': np.exp(train_growth[best]),
+                'test_return': np.exp(test_growth),
+            })
+            print(f"Fold {k}: train {rows[-1]['train_start']} to {rows[-1]['train_end']} -> {keys[best]} "
+                  f"(train {np.round(rows[-1]['train_return'], 4)}, out-of-sample {np.round(rows[-1]['test_return'], 4)})")
+        table = pd.DataFrame(rows)
+
+        # Per-bar growth of the chosen combinations only, for the stitched curve
+        chosen = list(dict.fromkeys(table['best_combo']))
+        bars = dict(zip(chosen, (growth for _, growth in runner.run(evaluate, data, chosen, **kwargs))))
+        pieces = []
+        for k, (_, _, test_start, test_end) in enumerate(folds):
+            # Overlapping test windows (step < test) only count until the next one starts
+            stop = min(test_end, folds[k + 1][2]) if k + 1 < len(folds) else test_end
+            pieces.append(pd.Series(bars[table['best_combo'][k]][test_start:stop], index=data.index[test_start:stop]))
+        equity = np.exp(pd.concat(pieces).cumsum())
+
+        print(f"Walk-forward: {len(folds)} folds, {len(combos)} combinations, "
+              f"out-of-sample return {np.round(equity.iloc[-1], 4)}")
+        return table, equity
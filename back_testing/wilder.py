@@ -0,0 +1,147 @@
+import numpy as np
+from .jit import njit, HAVE_NUMBA
+
+@njit(cache=True)
+def _wilder_kernel(x, alphas, min_periods):
+    """
+    One pass over x updating a Wilder average per period. Follows pandas'
+    ewm(alpha=1/period, min_periods=period, adjust=False).mean() step for step,
+    including its handling of gaps (NaN) and of alpha == 0.5.
+    """
+    n = len(x)
+    n_periods = len(alphas)
+    out = np.full((n_periods, n), np.nan)
+    weighted = np.full(n_periods, np.nan)
+    old_wt = np.ones(n_periods)
+    new_wt = alphas.copy()
+    nobs = 0
+    for i in range(n):
+        cur = x[i]
+        is_observation = cur == cur
+        if is_observation:
+            nobs += 1
+        for p in range(n_periods):
+            w = weighted[p]
+            if w == w:
+                old_wt[p] *= 1.0 - alphas[p]
+                if alphas[p] == 0.5:
+                    new_wt[p] = 1.0 - old_wt[p]
+                if is_observation:
+                    # avoid numerical errors on constant series (as pandas does)
+                    if w != cur:
+                        w = old_wt[p] * w + new_wt[p] * cur
+                        w /= (old_wt[p] + new_wt[p])
+                    old_wt[p] = 1.0
+                    weighted[p] = w
+            elif is_observation:
+                weighted[p] = cur
+            if nobs >= min_periods[p]:
+                out[p, i] = weighted[p]
+    return out
+
+class WilderEngine:
+    """Wilder-smoothed RSI and ATR for many periods from a single pass over the input."""
+
+    @staticmethod
+    def smooth(values, periods):
+        """
+        Wilder smoothing (alpha = 1/period, min_periods = period) of one series for every
+        period at once. Returns a (periods x bars) float64 array.
+        """
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        periods = np.asarray(periods, dtype=np.float64)
+        if len(periods) and periods.min() < 1:
+            raise ValueError(f"Periods must be >= 1, got {periods.min()}")
+        # pandas goes through the center of mass: alpha -> com -> alpha
+        com = (1 - 1 / periods) / (1 / periods)
+        alphas = 1.0 / (1.0 + com)
+        if HAVE_NUMBA:
+            return _wilder_kernel(values, alphas, periods)
+        return WilderEngine._smooth_numpy(values, alphas, periods)
+
+    @staticmethod
+    def _smooth_numpy(values, alphas, min_periods):
+        """
+        Without numba: the kernel's single pass over the bars, with each bar updating the
+        state of every period at once as NumPy vectors.
+        """
+        n_periods = len(alphas)
+        out = np.empty((n_periods, len(values)))
+        weighted = np.full(n_periods, np.nan)
+        old_wt = np.ones(n_periods)
+        new_wt = alphas.copy()
+        decay = 1.0 - alphas
+        half = alphas == 0.5
+        observed = values == values
+        # Between observations, with every period started, the weights are back at 1 and
+        # each bar reduces to one blend per period
+        steady_new = np.where(half, 1.0 - decay, alphas)
+        steady_total = decay + steady_new
+        steady = False
+        with np.errstate(invalid='ignore'):
+            for i in range(len(values)):
+                cur = values[i]
+                if steady and observed[i]:
+                    weighted = np.where(weighted != cur, (decay * weighted + steady_new * cur) / steady_total, weighted)
+                    if cur - cur != 0:
+                        # infinite input: blends may turn NaN and restart
+                        steady = not np.isnan(weighted).any()
+                    out[:, i] = weighted
+                    continue
+                
+                started = weighted == weighted
+                old_wt = np.where(started, old_wt * decay, old_wt)
+                new_wt = np.where(started & half, 1.0 - old_wt, new_wt)
+                if observed[i]:
+                    # avoid numerical errors on constant series (as pandas does)
+                    blended = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                    weighted = np.where(started, np.where(weighted != cur, blended, weighted), cur)
+                    old_wt = np.where(started, 1.0, old_wt)
+                steady = observed[i] and not np.isnan(weighted).any()
+                out[:, i] = weighted
+        
+        # Each period is defined once min_periods observations have been seen
+        out[np.cumsum(observed)[None, :] < min_periods[:, None]] = np.nan
+        return out
+
+    @staticmethod
+    def _as_float(values):
+        """Keeps float32 inputs (compact mode) so differences are taken at the input precision."""
+        values = np.asarray(values)
+        return values if values.dtype.kind == 'f' else values.astype(np.float64)
+
+    @staticmethod
+    def rsi(close, periods):
+        """RSI for every period as a (periods x bars) array, matching IndicatorManager.calculate_rsi."""
+        close = WilderEngine._as_float(close)
+        delta = np.empty_like(close)
+        delta[:1] = np.nan
+        delta[1:] = close[1:] - close[:-1]
+
+        # Same gain/loss construction as the pandas version (including its -0.0 losses)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = -np.where(delta < 0, delta, 0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = WilderEngine.smooth(gain, periods) / WilderEngine.smooth(loss, periods)
+            return 100 - (100 / (1 + rs))
+
+    @staticmethod
+    def true_range(high, low, close):
+        """True range, skipping NaN terms like pandas' row-wise max."""
+        high, low, close = (WilderEngine._as_float(a) for a in (high, low, close))
+        prev_close = np.concatenate((np.full(1, np.nan, dtype=close.dtype), close[:-1]))
+        with np.errstate(invalid='ignore'):
+            return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+    @staticmethod
+    def atr(high, low, close, periods, tr=None):
+        """
+        ATR for every period (lagged by 1 bar), matching turtle IndicatorManager.calculate_atr.
+        tr: precomputed true range, to skip recomputing it.
+        """
+        tr = WilderEngine.true_range(high, low, close) if tr is None else tr
+        smoothed = WilderEngine.smooth(tr, periods)
+        out = np.full_like(smoothed, np.nan)
+        out[:, 1:] = smoothed[:, :-1]
+        return out
@@ -1,8 +1,5 @@
 # This file is for stock price predection
 
-# For downloading data
-import yfinance as yf
-
 # For manipulating data
 import pandas as pd
 import numpy as np
@@ -10,24 +7,12 @@ import numpy as np
 # For mathematical operations
 import math
 
-# For visualization
-import matplotlib.pyplot as plt
-from matplotlib.pylab import rcParams
-
-# For data normalisation
-from sklearn.preprocessing import MinMaxScaler
-
-# For building the model
-from keras.layers import LSTM, Dropout, Dense
-from keras.models import Sequential
+# Plotting, normalisation and the model libraries are imported where they are first
+# used below: Keras/TensorFlow alone takes seconds to import.
 
 #import os
 #os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
 
-# # Settings the figsize parameter for the plots in this notebook to standardize the size of plots
-#%matplotlib inline
-rcParams['figure.figsize'] = 20, 10
-
 ticker = 'MSFT'
 df = pd.read_csv("data/historical_data13081.csv", index_col=1, parse_dates=True)
 df.drop(columns=['Unnamed: 0'], inplace=True)
@@ -35,6 +20,14 @@ df.drop(columns=['Unnamed: 0'], inplace=True)
 # Check the dataset
 print(df.head())
 
+# For visualization
+import matplotlib.pyplot as plt
+from matplotlib.pylab import rcParams
+
+# # Settings the figsize parameter for the plots in this notebook to standardize the size of plots
+#%matplotlib inline
+rcParams['figure.figsize'] = 20, 10
+
 # Plot the close price 
 df['close'].plot()
 plt.ylabel('Close price')
@@ -58,6 +51,9 @@ print(prices)
 train_len = math.ceil(len(prices) * 0.8)
 print(train_len)
 
+# For data normalisation
+from sklearn.preprocessing import MinMaxScaler
+
 # Normalize the data to values between 0 and 1
 scaler = MinMaxScaler(feature_range=(0, 1))
 scaler.fit(prices.reshape(-1, 1)[:train_len, :])
@@ -100,6 +96,10 @@ x_test = np.array(x_test)
 x_test = np.reshape(x_test, (x_test.shape[0], x_test.shape[1], 1))
 
 
+# For building the model
+from keras.layers import LSTM, Dropout, Dense
+from keras.models import Sequential
+
 # Define the features and the labels
 #  Define a Sequential model which consists of a linear stack of layers.
 model = Sequential()